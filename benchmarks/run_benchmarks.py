@@ -0,0 +1,243 @@
+import os
+import sys
+
+# Pipeline modules import each other by name, so put src/ on the path
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; must be selected before pyplot is imported
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+import numpy as np
+import pandas as pd
+import fetch_data
+import preprocess_data
+from data_sources import LocalFileSource
+from storage import save_table
+from preprocess_data import filter_player_info, merge_data, preprocess_and_save
+from metric_registry import qualifications, percentile_stats, derive_metrics
+from metrics_utils import (
+    calculate_percentile_from_qualifying, calculate_percentiles_from_qualifying, calculate_percentile_bands_from_qualifying
+)
+from lollipop_chart import generate_lollipop_chart, generate_dashboard
+from player_index import PlayerIndex
+from player_store import PlayerStore
+from scoring import score_leagues, league_percentiles
+from synthetic_data import generate_dataset, generate_scoring_configs
+
+DEFAULT_SCALES = [1, 10, 100, 1000]
+DEFAULT_OUTPUT = 'benchmark_results.json'
+
+def measure(fn, repeat):
+    """
+    Time a function and record its peak traced memory.
+
+    The timed runs are separate from the traced run, so tracemalloc overhead
+    never inflates the wall times.
+
+    Args:
+        fn (callable): Function to measure, called with no arguments.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        dict: Best and all wall times in seconds, and peak memory in bytes.
+    """
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        wall_times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'wall_seconds': min(wall_times), 'wall_seconds_all': wall_times, 'peak_memory_bytes': peak}
+
+def benchmark_scale(scale, repeat, max_profiles, max_charts, seed):
+    """
+    Benchmark every pipeline stage on synthetic data at one scale.
+
+    Args:
+        scale (float): Data size relative to the real tables.
+        repeat (int): Number of timed runs per stage.
+        max_profiles (int): Number of profiles to build in the profile stage.
+        max_charts (int): Number of charts to render in the render stage.
+        seed (int): Random seed for the synthetic data.
+
+    Returns:
+        list: One result dict per stage.
+    """
+    seasonal_data, player_info = generate_dataset(scale, seed)
+    filtered_player_info = filter_player_info(player_info)
+    merged_data = merge_data(seasonal_data, filtered_player_info)
+    qb_data = derive_metrics(merged_data[merged_data['position'] == 'QB'], 'QB').reset_index(drop=True)
+    qb_criteria = qualifications['QB']
+
+    results = []
+    def record(stage, rows, fn, runs=repeat):
+        logging.warning(f"[{scale}x] {stage}...")
+        results.append({'stage': stage, 'scale': scale, 'rows': rows, **measure(fn, runs)})
+
+    record('filter_player_info', len(player_info), lambda: filter_player_info(player_info))
+    record('merge_data', len(seasonal_data), lambda: merge_data(seasonal_data, filtered_player_info))
+    record('calculate_percentile_from_qualifying', len(qb_data), lambda: calculate_percentile_from_qualifying(
+        qb_data, 'fantasy_points_ppr', qb_criteria['stat'], qb_criteria['min_attempts']
+    ))
+    record('calculate_percentiles_from_qualifying', len(qb_data), lambda: calculate_percentiles_from_qualifying(
+        qb_data, percentile_stats['QB'], qb_criteria['stat'], qb_criteria['min_attempts']
+    ))
+    record('calculate_percentile_bands_from_qualifying', len(qb_data), lambda: calculate_percentile_bands_from_qualifying(
+        qb_data, percentile_stats['QB'], qb_criteria['stat'], qb_criteria['min_attempts'], seed=seed
+    ))
+
+    # Scoring many leagues should cost about as much as scoring one
+    for league_count in (1, 500):
+        configs = generate_scoring_configs(league_count, seed)
+        record(f'score_leagues_{league_count}', len(qb_data), lambda: league_percentiles(
+            qb_data, configs, 'QB', score_leagues(qb_data, configs, 'QB')
+        ))
+
+    with tempfile.TemporaryDirectory() as source_dir:
+        # Serve the synthetic seasons from local tables, as the network source would chunk them
+        for season, season_data in seasonal_data.groupby('season'):
+            save_table(season_data, os.path.join(source_dir, f'seasonal_data_{season}'))
+        save_table(player_info, os.path.join(source_dir, 'player_ids'))
+        source = LocalFileSource(source_dir)
+        # Point the fetch layer at the temporary directory only while it exists
+        raw_dir = os.path.join(source_dir, 'raw') + os.sep
+        with mock.patch.multiple(fetch_data, CACHE_DIR=os.path.join(source_dir, 'cache') + os.sep,
+                                 SEASONAL_DATA_DIR=raw_dir, PLAYER_INFO_DIR=raw_dir):
+            record('fetch_all_local', len(seasonal_data) + len(player_info), lambda: fetch_data.fetch_all(
+                seasonal_data['season'].unique().tolist(), force_refresh=True, source=source
+            ))
+
+    with tempfile.TemporaryDirectory() as output_dir, \
+            mock.patch.object(preprocess_data, 'PROCESSED_DATA_DIR', os.path.join(output_dir, 'processed') + os.sep):
+        record('preprocess_and_save', len(seasonal_data), lambda: preprocess_and_save(seasonal_data, player_info))
+
+        # Profiles and charts for the latest season, as the app builds them
+        season = preprocess_data.processed_seasons()[-1]
+        stats_by_position = {position: preprocess_data.load_processed(position, [season]) for position in qualifications}
+        player_ids = [
+            player_id for position, stats in stats_by_position.items()
+            for player_id in stats['player_id'].head(max_profiles // len(stats_by_position))
+        ]
+
+        def build_profiles():
+            player_index = PlayerIndex(filtered_player_info, stats_by_position)
+            return [player_index.profile(player_id, season).get_lollipop_data() for player_id in player_ids]
+
+        record('profile_construction', len(player_ids), build_profiles)
+
+        # The same tables in the SQLite store: a full save, a filtered scan and point lookups
+        store = PlayerStore(os.path.join(output_dir, 'players.db'))
+        record('player_store_save', sum(len(stats) for stats in stats_by_position.values()), lambda: [
+            store.save(stats, position, season) for position, stats in stats_by_position.items()
+        ])
+        record('player_store_query', len(stats_by_position['WR']), lambda: store.query(
+            'WR', since=season, min_values={'targets': qualifications['WR']['min_attempts']}
+        ))
+        record('player_store_lookup', len(player_ids), lambda: [store.player(player_id, [season]) for player_id in player_ids])
+        store.close()
+
+        chart_data = build_profiles()[:max_charts]
+        def render_charts():
+            for i, (categories, values, title, subtitle) in enumerate(chart_data):
+                values = {category: np.nan_to_num(category_values) for category, category_values in values.items()}
+                generate_lollipop_chart(categories, values, title, subtitle, output_path=os.path.join(output_dir, f'{i}.png'))
+
+        record('chart_rendering', len(chart_data), render_charts)
+
+        # The same charts as cards of one dashboard figure
+        record('dashboard_rendering', len(chart_data), lambda: generate_dashboard(
+            chart_data, output_path=os.path.join(output_dir, 'dashboard.png'), columns=6
+        ))
+
+    return results
+
+def git_revision():
+    """
+    Get the current git revision, if the benchmarks run from a checkout.
+
+    Returns:
+        str or None: The commit hash.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=SRC_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path):
+    """
+    Print each stage's wall time and peak memory relative to a baseline run.
+
+    Args:
+        results (list): Results from this run.
+        baseline_path (str): JSON output of an earlier run.
+    """
+    with open(baseline_path) as f:
+        baseline = {(row['stage'], row['scale']): row for row in json.load(f)['results']}
+
+    print(f"{'stage':<40}{'scale':>7}{'time x':>10}{'memory x':>10}")
+    for row in results:
+        base = baseline.get((row['stage'], row['scale']))
+        if base is None:
+            continue
+        time_ratio = row['wall_seconds'] / base['wall_seconds'] if base['wall_seconds'] else float('nan')
+        memory_ratio = row['peak_memory_bytes'] / base['peak_memory_bytes'] if base['peak_memory_bytes'] else float('nan')
+        print(f"{row['stage']:<40}{row['scale']:>7}{time_ratio:>10.2f}{memory_ratio:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic data, fully offline.")
+    parser.add_argument('--scales', type=float, nargs='+', default=DEFAULT_SCALES, help="data sizes relative to the real tables")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage")
+    parser.add_argument('--max-profiles', type=int, default=200, help="profiles built in the profile stage")
+    parser.add_argument('--max-charts', type=int, default=20, help="charts rendered in the render stage")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the synthetic data")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="JSON file to write results to")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    # Pipeline stages log every step at INFO; keep the benchmark output readable
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = []
+    for scale in args.scales:
+        scale = int(scale) if float(scale).is_integer() else scale
+        results.extend(benchmark_scale(scale, args.repeat, args.max_profiles, args.max_charts, args.seed))
+
+    report = {
+        'revision': git_revision(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'settings': vars(args),
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+import numpy as np
+import pandas as pd
+
+# Row counts of the real 2024 tables, used as the 1x scale
+BASE_SEASONAL_ROWS = 607
+BASE_PLAYER_INFO_ROWS = 11783
+MAX_SEASONS = 25  # Larger scales are spread over up to this many seasons, like a historical backfill
+LATEST_SEASON = 2024
+
+# Real schema of the `nfl.import_seasonal_data` table, in column order
+SEASONAL_COLUMNS = [
+    'player_id', 'season', 'season_type', 'completions', 'attempts', 'passing_yards', 'passing_tds',
+    'interceptions', 'sacks', 'sack_yards', 'sack_fumbles', 'sack_fumbles_lost', 'passing_air_yards',
+    'passing_yards_after_catch', 'passing_first_downs', 'passing_epa', 'passing_2pt_conversions', 'pacr',
+    'dakota', 'carries', 'rushing_yards', 'rushing_tds', 'rushing_fumbles', 'rushing_fumbles_lost',
+    'rushing_first_downs', 'rushing_epa', 'rushing_2pt_conversions', 'receptions', 'targets',
+    'receiving_yards', 'receiving_tds', 'receiving_fumbles', 'receiving_fumbles_lost', 'receiving_air_yards',
+    'receiving_yards_after_catch', 'receiving_first_downs', 'receiving_epa', 'receiving_2pt_conversions',
+    'racr', 'target_share', 'air_yards_share', 'wopr_x', 'special_teams_tds', 'fantasy_points',
+    'fantasy_points_ppr', 'games', 'tgt_sh', 'ay_sh', 'yac_sh', 'wopr_y', 'ry_sh', 'rtd_sh', 'rfd_sh',
+    'rtdfd_sh', 'dom', 'w8dom', 'yptmpa', 'ppr_sh'
+]
+SEASONAL_INT_COLUMNS = [
+    'season', 'completions', 'attempts', 'passing_tds', 'sack_fumbles', 'sack_fumbles_lost',
+    'passing_2pt_conversions', 'carries', 'rushing_tds', 'rushing_2pt_conversions', 'receptions', 'targets',
+    'receiving_tds', 'receiving_2pt_conversions', 'games'
+]
+
+# Real schema of the `nfl.import_ids` table, in column order
+PLAYER_INFO_COLUMNS = [
+    'draft_year', 'birthdate', 'draft_pick', 'stats_global_id', 'height', 'name', 'cbs_id', 'stats_id',
+    'cfbref_id', 'ktc_id', 'team', 'sleeper_id', 'db_season', 'merge_name', 'pfr_id', 'swish_id', 'draft_ovr',
+    'nfl_id', 'twitter_username', 'fleaflicker_id', 'fantasy_data_id', 'sportradar_id', 'draft_round',
+    'mfl_id', 'age', 'college', 'fantasypros_id', 'espn_id', 'gsis_id', 'rotowire_id', 'weight',
+    'rotoworld_id', 'position', 'yahoo_id', 'pff_id'
+]
+
+# Share of each position in the real player info table
+POSITION_MIX = {
+    'WR': 1965, 'LB': 1739, 'RB': 1538, 'CB': 1231, 'S': 1048, 'DT': 938, 'TE': 922,
+    'DE': 916, 'QB': 648, 'PK': 269, 'PN': 211, 'DB': 146, 'OL': 212
+}
+SKILL_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+
+# Share of each position among seasonal rows, and the mean of its volume stat
+SEASONAL_POSITION_MIX = {'QB': 79, 'RB': 138, 'WR': 221, 'TE': 111, 'FB': 58}
+VOLUME_MEANS = {
+    'QB': {'attempts': 220, 'carries': 25, 'targets': 0.5},
+    'RB': {'attempts': 0.2, 'carries': 75, 'targets': 25},
+    'WR': {'attempts': 0.1, 'carries': 3, 'targets': 50},
+    'TE': {'attempts': 0.1, 'carries': 0.5, 'targets': 32},
+    'FB': {'attempts': 0.1, 'carries': 4, 'targets': 6}
+}
+
+TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GBP', 'HOU', 'IND', 'JAC',
+    'KCC', 'LAC', 'LAR', 'LVR', 'MIA', 'MIN', 'NEP', 'NOS', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SFO', 'TBB',
+    'TEN', 'WAS', 'FA'
+]
+
+def _string_pool(prefix, size):
+    return np.char.add(prefix, np.arange(size).astype(str)).astype(object)
+
+def _volume(rng, mean, n):
+    # Skewed like real usage: a few starters carry most of the volume
+    return rng.gamma(shape=0.9, scale=mean / 0.9, size=n).round().astype(np.int64)
+
+def _noise(rng, n, sigma=0.15):
+    return rng.lognormal(mean=0.0, sigma=sigma, size=n)
+
+def generate_player_info(scale=1, seed=0):
+    """
+    Generate a player info table with the schema of `nfl.import_ids`.
+
+    Args:
+        scale (float): Size relative to the real table (1 = ~11.8k rows).
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Synthetic player info.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(BASE_PLAYER_INFO_ROWS * scale)
+
+    positions = np.array(list(POSITION_MIX))
+    weights = np.array(list(POSITION_MIX.values()), dtype=float)
+    position = rng.choice(positions, size=n, p=weights / weights.sum())
+
+    # Every skill player has a gsis_id; most other rows do not, as in the real table
+    gsis_id = np.char.add('00-', np.char.zfill(np.arange(n).astype(str), 7)).astype(object)
+    has_gsis_id = np.isin(position, SKILL_POSITIONS) | (rng.random(n) < 0.2)
+    gsis_id[~has_gsis_id] = None
+
+    names = np.char.add('Player ', np.arange(n).astype(str)).astype(object)
+    data = {
+        'draft_year': rng.integers(2000, LATEST_SEASON + 1, size=n).astype(float),
+        'birthdate': rng.choice(_string_pool('1995-01-', 28), size=n),
+        'draft_pick': rng.integers(1, 33, size=n).astype(float),
+        'stats_global_id': rng.integers(0, 1_000_000, size=n).astype(float),
+        'height': rng.normal(74, 2.5, size=n).round(),
+        'name': names,
+        'cbs_id': rng.integers(0, 30_000_000, size=n).astype(float),
+        'stats_id': rng.integers(0, 50_000, size=n).astype(float),
+        'cfbref_id': rng.choice(_string_pool('player-', 1000), size=n),
+        'ktc_id': rng.integers(0, 2000, size=n).astype(float),
+        'team': rng.choice(TEAMS, size=n).astype(object),
+        'sleeper_id': rng.integers(0, 12_000, size=n).astype(float),
+        'db_season': np.full(n, LATEST_SEASON, dtype=np.int64),
+        'merge_name': np.char.lower(names.astype(str)).astype(object),
+        'pfr_id': rng.choice(_string_pool('PlayXx', 1000), size=n),
+        'swish_id': rng.integers(0, 1_300_000, size=n).astype(float),
+        'draft_ovr': rng.integers(1, 260, size=n).astype(float),
+        'nfl_id': np.full(n, None, dtype=object),
+        'twitter_username': np.full(n, None, dtype=object),
+        'fleaflicker_id': np.full(n, np.nan),
+        'fantasy_data_id': np.full(n, np.nan),
+        'sportradar_id': rng.choice(_string_pool('sr-', 1000), size=n),
+        'draft_round': rng.integers(1, 8, size=n).astype(float),
+        'mfl_id': np.arange(n, dtype=np.int64),
+        'age': rng.uniform(21, 38, size=n).round(1),
+        'college': rng.choice(_string_pool('College ', 150), size=n),
+        'fantasypros_id': rng.integers(0, 30_000, size=n).astype(float),
+        'espn_id': rng.integers(0, 5_000_000, size=n).astype(float),
+        'gsis_id': gsis_id,
+        'rotowire_id': rng.integers(0, 20_000, size=n).astype(float),
+        'weight': rng.normal(225, 30, size=n).round(),
+        'rotoworld_id': np.full(n, np.nan),
+        'position': position.astype(object),
+        'yahoo_id': rng.integers(0, 50_000, size=n).astype(float),
+        'pff_id': np.full(n, np.nan)
+    }
+    return pd.DataFrame(data, columns=PLAYER_INFO_COLUMNS)
+
+def generate_seasonal_data(player_info, scale=1, seed=0):
+    """
+    Generate a seasonal stats table with the schema of `nfl.import_seasonal_data`.
+
+    Rows belong to skill players from `player_info` and are spread over up to
+    25 seasons as the scale grows, so multi-season code paths are exercised.
+
+    Args:
+        player_info (pd.DataFrame): Player info from `generate_player_info`.
+        scale (float): Size relative to the real 2024 table (1 = ~600 rows).
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Synthetic seasonal data.
+    """
+    rng = np.random.default_rng(seed + 1)
+    n = int(BASE_SEASONAL_ROWS * scale)
+    n_seasons = int(min(max(scale, 1), MAX_SEASONS))
+
+    # Pick players by position in the real seasonal mix, allowing repeats across seasons
+    positions = np.array(list(SEASONAL_POSITION_MIX))
+    weights = np.array(list(SEASONAL_POSITION_MIX.values()), dtype=float)
+    drawn_position = rng.choice(positions, size=n, p=weights / weights.sum())
+    row_position = np.where(drawn_position == 'FB', 'RB', drawn_position)  # Fullbacks are listed as RBs
+
+    player_id = np.empty(n, dtype=object)
+    for position in SKILL_POSITIONS:
+        rows = np.flatnonzero(row_position == position)
+        candidates = player_info.loc[player_info['position'] == position, 'gsis_id'].dropna().to_numpy()
+        player_id[rows] = rng.choice(candidates, size=rows.size, replace=rows.size > candidates.size * n_seasons)
+
+    season = rng.integers(LATEST_SEASON - n_seasons + 1, LATEST_SEASON + 1, size=n)
+
+    # Volume stats drive everything else
+    means = {
+        stat: pd.Series(drawn_position).map({p: VOLUME_MEANS[p][stat] for p in VOLUME_MEANS}).to_numpy()
+        for stat in ['attempts', 'carries', 'targets']
+    }
+    attempts = _volume(rng, means['attempts'], n)
+    carries = _volume(rng, means['carries'], n)
+    targets = _volume(rng, means['targets'], n)
+
+    completions = rng.binomial(attempts, 0.64)
+    passing_yards = (completions * 11.0 * _noise(rng, n)).round()
+    passing_tds = rng.poisson(attempts * 0.045)
+    interceptions = rng.poisson(attempts * 0.023).astype(float)
+    sacks = rng.poisson(attempts * 0.07).astype(float)
+    sack_fumbles = rng.poisson(sacks * 0.1)
+    passing_air_yards = (attempts * 7.5 * _noise(rng, n)).round()
+
+    rushing_yards = (carries * 4.3 * _noise(rng, n, 0.3)).round()
+    rushing_tds = rng.poisson(carries * 0.03)
+    rushing_fumbles = rng.poisson(carries * 0.01).astype(float)
+
+    receptions = rng.binomial(targets, 0.66)
+    receiving_yards = (receptions * 11.0 * _noise(rng, n)).round()
+    receiving_tds = rng.poisson(targets * 0.06)
+    receiving_fumbles = rng.poisson(targets * 0.008).astype(float)
+    receiving_air_yards = (targets * 8.0 * _noise(rng, n, 0.3)).round()
+
+    games = rng.integers(1, 18, size=n)
+    target_share = targets / (games * 33.0)
+    air_yards_share = receiving_air_yards / np.maximum(games * 250.0, 1)
+    passing_2pt = rng.poisson(attempts * 0.001)
+    rushing_2pt = rng.poisson(carries * 0.002)
+    receiving_2pt = rng.poisson(targets * 0.002)
+    special_teams_tds = rng.poisson(0.02, size=n).astype(float)
+    lost = lambda fumbles: rng.binomial(fumbles.astype(np.int64), 0.5).astype(float)
+    rushing_fumbles_lost = lost(rushing_fumbles)
+    receiving_fumbles_lost = lost(receiving_fumbles)
+    sack_fumbles_lost = rng.binomial(sack_fumbles, 0.5)
+
+    fantasy_points = (
+        passing_yards * 0.04 + passing_tds * 4 - interceptions * 2
+        + (rushing_yards + receiving_yards) * 0.1 + (rushing_tds + receiving_tds + special_teams_tds) * 6
+        + (passing_2pt + rushing_2pt + receiving_2pt) * 2
+        - (rushing_fumbles_lost + receiving_fumbles_lost + sack_fumbles_lost) * 2
+    ).round(2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = np.clip(target_share * _noise(rng, n, 0.2), 0, 1)
+        data = {
+            'player_id': player_id,
+            'season': season,
+            'season_type': np.full(n, 'REG', dtype=object),
+            'completions': completions,
+            'attempts': attempts,
+            'passing_yards': passing_yards,
+            'passing_tds': passing_tds,
+            'interceptions': interceptions,
+            'sacks': sacks,
+            'sack_yards': (sacks * 6.5).round(),
+            'sack_fumbles': sack_fumbles,
+            'sack_fumbles_lost': sack_fumbles_lost,
+            'passing_air_yards': passing_air_yards,
+            'passing_yards_after_catch': (passing_yards * 0.5).round(),
+            'passing_first_downs': (completions * 0.52).round(),
+            'passing_epa': rng.normal(attempts * 0.02, np.sqrt(attempts + 1)),
+            'passing_2pt_conversions': passing_2pt,
+            'pacr': np.nan_to_num(passing_yards / passing_air_yards),
+            'dakota': rng.normal(0.05, 0.1, size=n),
+            'carries': carries,
+            'rushing_yards': rushing_yards,
+            'rushing_tds': rushing_tds,
+            'rushing_fumbles': rushing_fumbles,
+            'rushing_fumbles_lost': rushing_fumbles_lost,
+            'rushing_first_downs': (carries * 0.25).round(),
+            'rushing_epa': rng.normal(-carries * 0.02, np.sqrt(carries + 1)),
+            'rushing_2pt_conversions': rushing_2pt,
+            'receptions': receptions,
+            'targets': targets,
+            'receiving_yards': receiving_yards,
+            'receiving_tds': receiving_tds,
+            'receiving_fumbles': receiving_fumbles,
+            'receiving_fumbles_lost': receiving_fumbles_lost,
+            'receiving_air_yards': receiving_air_yards,
+            'receiving_yards_after_catch': (receiving_yards * 0.45).round(),
+            'receiving_first_downs': (receptions * 0.55).round(),
+            'receiving_epa': rng.normal(targets * 0.1, np.sqrt(targets + 1)),
+            'receiving_2pt_conversions': receiving_2pt,
+            'racr': np.nan_to_num(receiving_yards / receiving_air_yards),
+            'target_share': target_share * games,
+            'air_yards_share': air_yards_share * games,
+            'wopr_x': (1.5 * target_share + 0.7 * air_yards_share) * games,
+            'special_teams_tds': special_teams_tds,
+            'fantasy_points': fantasy_points,
+            'fantasy_points_ppr': fantasy_points + receptions,
+            'games': games,
+            'tgt_sh': shares,
+            'ay_sh': np.clip(air_yards_share, 0, 1),
+            'yac_sh': shares * _noise(rng, n),
+            'wopr_y': np.clip(1.5 * shares + 0.7 * np.clip(air_yards_share, 0, 1), 0, 1.5),
+            'ry_sh': shares * _noise(rng, n),
+            'rtd_sh': shares * _noise(rng, n, 0.5),
+            'rfd_sh': shares * _noise(rng, n),
+            'rtdfd_sh': shares * _noise(rng, n),
+            'dom': shares * _noise(rng, n),
+            'w8dom': shares * _noise(rng, n),
+            'yptmpa': receiving_yards / (games * 33.0),
+            'ppr_sh': shares * _noise(rng, n)
+        }
+    seasonal_data = pd.DataFrame(data, columns=SEASONAL_COLUMNS)
+    seasonal_data[SEASONAL_INT_COLUMNS] = seasonal_data[SEASONAL_INT_COLUMNS].astype(np.int64)
+
+    # A player has at most one row per season, as in the real table
+    return seasonal_data.drop_duplicates(['player_id', 'season'], ignore_index=True)
+
+def generate_dataset(scale=1, seed=0):
+    """
+    Generate matching seasonal data and player info at a given scale.
+
+    Args:
+        scale (float): Size relative to the real tables.
+        seed (int): Random seed.
+
+    Returns:
+        tuple: (seasonal_data, player_info)
+    """
+    player_info = generate_player_info(scale, seed)
+    return generate_seasonal_data(player_info, scale, seed), player_info
+
+def generate_scoring_configs(count, seed=0):
+    """
+    Generate league scoring configurations that vary the common scoring settings.
+
+    Args:
+        count (int): Number of leagues.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Configurations keyed by league name, in the format of `scoring.SCORING_PRESETS`.
+    """
+    rng = np.random.default_rng(seed)
+    configs = {}
+    for i in range(count):
+        configs[f'league_{i:04d}'] = {
+            'passing_yards': rng.choice([0.04, 0.05]), 'passing_tds': rng.choice([4, 6]), 'interceptions': rng.choice([-1, -2]),
+            'passing_2pt_conversions': 2, 'sack_fumbles_lost': -2,
+            'rushing_yards': 0.1, 'rushing_tds': 6, 'rushing_2pt_conversions': 2, 'rushing_fumbles_lost': -2,
+            'receptions': rng.choice([0, 0.5, 1]), 'receiving_yards': 0.1, 'receiving_tds': 6,
+            'receiving_2pt_conversions': 2, 'receiving_fumbles_lost': -2, 'special_teams_tds': 6,
+            'position_bonuses': {'TE': {'receptions': rng.choice([0, 0.5, 1])}}
+        }
+    return configs
@@ -0,0 +1,148 @@
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; must be selected before pyplot is imported
+
+import argparse
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from fetch_data import PLAYER_INFO_DIR, load_raw_data
+from preprocess_data import (
+    PLAYER_INFO_COLUMNS, qualifications, load_processed, load_processed_snapshot, processed_seasons, profile_columns
+)
+from lollipop_chart import generate_lollipop_chart
+from profiles import PROFILE_CLASSES
+from player_index import PlayerIndex
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Default directory for rendered charts
+OUTPUT_DIR = './output/charts/'
+
+# Player index loaded once per worker process by `init_worker`
+_player_index = None
+
+def init_worker(season):
+    """
+    Build the player index from player info and the season's processed stats in a worker process.
+
+    Stats come from the memory-mapped snapshots, so every worker shares the same
+    pages instead of parsing and holding its own copy.
+
+    Args:
+        season (int): The season being rendered.
+    """
+    global _player_index
+    logging.getLogger().setLevel(logging.WARNING)  # Keep per-chart logging out of batch output
+    _player_index = PlayerIndex(
+        load_raw_data(f'{PLAYER_INFO_DIR}player_info', columns=PLAYER_INFO_COLUMNS),
+        {position: load_processed_snapshot(position, season, columns=profile_columns(position)) for position in PROFILE_CLASSES}
+    )
+
+def render_player(player_id, position, season, output_dir, file_format):
+    """
+    Render one player's lollipop chart to a file inside a worker process.
+
+    Args:
+        player_id (str): The player's gsis_id.
+        position (str): The player's position.
+        season (int): The season to render.
+        output_dir (str): Directory to save the chart in.
+        file_format (str): Image format, e.g. 'png' or 'svg'.
+
+    Returns:
+        str or None: Path of the saved chart, or None if the profile could not be built.
+    """
+    try:
+        profile = PROFILE_CLASSES[position].from_index(_player_index, player_id, season)
+        categories, values, title, subtitle = profile.get_lollipop_data()
+    except (IndexError, KeyError, ValueError) as e:
+        logging.error(f"Skipping {player_id}: {e}")
+        return None
+
+    output_path = os.path.join(output_dir, f"{player_id}_{season}.{file_format}")
+    generate_lollipop_chart(categories, values, title, subtitle, output_path=output_path)
+    return output_path
+
+def select_players(season, player_ids=None, positions=None):
+    """
+    Choose which players to render.
+
+    Args:
+        season (int): The season to render.
+        player_ids (list): Specific gsis_ids to render. If None, every qualifying player is chosen.
+        positions (list): Positions to include. Default is None (all positions).
+
+    Returns:
+        list: (player_id, position) pairs to render.
+    """
+    selected = []
+    for position in positions or PROFILE_CLASSES:
+        stats = load_processed(position, [season], columns=['player_id', qualifications[position]['stat']])
+        if stats.empty:
+            continue
+
+        if player_ids is None:
+            criteria = qualifications[position]
+            stats = stats[stats[criteria['stat']] >= criteria['min_attempts']]
+        else:
+            stats = stats[stats['player_id'].isin(player_ids)]
+
+        selected.extend((player_id, position) for player_id in stats['player_id'].dropna().unique())
+    return selected
+
+def render_profiles(player_ids=None, positions=None, output_dir=OUTPUT_DIR, file_format='png', workers=None, season=None):
+    """
+    Render lollipop charts for many players in parallel across a process pool.
+
+    Args:
+        player_ids (list): Specific gsis_ids to render. If None, every qualifying player is rendered.
+        positions (list): Positions to include. Default is None (all positions).
+        output_dir (str): Directory to save the charts in. Default is './output/charts/'.
+        file_format (str): Image format, e.g. 'png' or 'svg'. Default is 'png'.
+        workers (int): Number of worker processes. Default is None (one per CPU).
+        season (int): The season to render. Default is None (the latest processed season).
+
+    Returns:
+        list: Paths of the saved charts.
+    """
+    if season is None:
+        seasons = processed_seasons()
+        if not seasons:
+            logging.error("No processed seasons to render.")
+            return []
+        season = seasons[-1]
+
+    os.makedirs(output_dir, exist_ok=True)
+    players = select_players(season, player_ids, positions)
+    if not players:
+        logging.warning("No players selected for rendering.")
+        return []
+
+    logging.info(f"Rendering {len(players)} charts to {output_dir}...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(season,)) as executor:
+        results = executor.map(
+            render_player,
+            [player_id for player_id, _ in players],
+            [position for _, position in players],
+            [season] * len(players),
+            [output_dir] * len(players),
+            [file_format] * len(players),
+            chunksize=max(1, len(players) // (4 * (workers or os.cpu_count() or 1)))
+        )
+        output_paths = [path for path in results if path is not None]
+
+    logging.info(f"Rendered {len(output_paths)} of {len(players)} charts.")
+    return output_paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render lollipop charts for many players without a display.")
+    parser.add_argument('player_ids', nargs='*', help="gsis_ids to render (default: every qualifying player)")
+    parser.add_argument('--positions', nargs='+', choices=list(PROFILE_CLASSES), help="positions to include")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR, help="directory to save charts in")
+    parser.add_argument('--format', dest='file_format', default='png', choices=['png', 'svg'], help="image format")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--season', type=int, default=None, help="season to render (default: latest processed)")
+    args = parser.parse_args()
+
+    render_profiles(args.player_ids or None, args.positions, args.output_dir, args.file_format, args.workers, args.season)
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import logging
+from preprocess_data import load_processed, profile_columns
+from metric_registry import score_table, group_by_category
+from instrumentation import span
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Index rows compared per block, bounding the distance matrix to queries x BLOCK_ROWS
+BLOCK_ROWS = 8192
+
+class CompsIndex:
+    """
+    Nearest-neighbour index over the score vectors of every player-season at one position.
+
+    Vectors are the displayed percentile scores (inverted where lower is better),
+    so players are compared exactly as their charts show them, each against their
+    own season. A search scans the vectors in fixed-size blocks with one matrix
+    product per block and keeps a running top-k with argpartition.
+    """
+    def __init__(self, position, stats):
+        """
+        Args:
+            position (str): The position (e.g., 'QB').
+            stats (pd.DataFrame): Processed stats with 'player_id', 'season' and percentile columns.
+        """
+        self.position = position
+        self.player_ids = stats['player_id'].astype(object).to_numpy()
+        self.seasons = stats['season'].to_numpy()
+        self.scores = score_table(stats, position)
+
+        # Missing scores are drawn as 0 on the charts, so they are compared as 0 too
+        self.vectors = np.nan_to_num(self.scores, nan=0.0)
+        self.norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+
+        codes, uniques = pd.factorize(self.player_ids)
+        self._player_codes = codes
+        self._code_of = {player_id: code for code, player_id in enumerate(uniques)}
+        self._rows = {}
+        self._latest_rows = {}
+        for row, (player_id, season) in enumerate(zip(self.player_ids, self.seasons)):
+            self._rows.setdefault((player_id, season), row)
+            latest = self._latest_rows.get(player_id)
+            if latest is None or season > self.seasons[latest]:
+                self._latest_rows[player_id] = row
+        logging.info(f"Indexed {len(self.vectors)} {position} player-seasons for comps.")
+
+    @classmethod
+    def load(cls, position, seasons=None):
+        """
+        Build the index from processed data.
+
+        Args:
+            position (str): The position (e.g., 'QB').
+            seasons (list): Seasons to include. Default is None (every processed season).
+
+        Returns:
+            CompsIndex: The index.
+        """
+        with span('comps.build') as stage:
+            stats = load_processed(position, seasons, columns=profile_columns(position))
+            if stats.empty:
+                raise ValueError(f"No processed {position} data to index.")
+            index = cls(position, stats)
+            stage.rows_out = len(index.vectors)
+        return index
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def row(self, player_id, season=None):
+        """
+        Get the index row of a player-season.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            season (int): The season. Default is None (the player's latest indexed season).
+
+        Returns:
+            int: The row.
+        """
+        row = self._latest_rows.get(player_id) if season is None else self._rows.get((player_id, season))
+        if row is None:
+            raise KeyError(f"No {self.position} stats for player ID: {player_id}" + (f" in {season}" if season else ""))
+        return row
+
+    def values(self, row):
+        """
+        Get a row's scores grouped by category, as the charts take them.
+
+        Args:
+            row (int): Index row.
+
+        Returns:
+            dict: Category -> list of scores.
+        """
+        return group_by_category(self.position, self.scores[row])
+
+    def nearest(self, queries, k, exclude_players=None):
+        """
+        Find the k nearest index rows to each query vector by Euclidean distance.
+
+        Args:
+            queries (np.ndarray): Query vectors of shape (queries, metrics).
+            k (int): Number of neighbours per query.
+            exclude_players (list): For each query, a gsis_id whose rows are skipped (or None).
+                Default is None (nothing is skipped).
+
+        Returns:
+            tuple: (rows, distances), both of shape (queries, k), nearest first.
+        """
+        queries = np.atleast_2d(np.nan_to_num(np.asarray(queries, dtype=np.float64), nan=0.0))
+        k = min(k, len(self.vectors))
+        query_norms = np.einsum('ij,ij->i', queries, queries)
+        excluded_codes = np.array([
+            self._code_of.get(player_id, -1) for player_id in (exclude_players or [None] * len(queries))
+        ])[:, None]
+
+        best_rows = np.empty((len(queries), 0), dtype=np.intp)
+        best_distances = np.empty((len(queries), 0))
+        for start in range(0, len(self.vectors), BLOCK_ROWS):
+            block = slice(start, start + BLOCK_ROWS)
+            # Squared distances via |q|^2 - 2 q.v + |v|^2, one matrix product per block
+            distances = query_norms[:, None] - 2 * queries @ self.vectors[block].T + self.norms[block]
+            distances[self._player_codes[block] == excluded_codes] = np.inf
+
+            # Merge the block into the running best and keep only the k smallest
+            rows = np.broadcast_to(np.arange(start, start + distances.shape[1]), distances.shape)
+            best_distances = np.hstack([best_distances, distances])
+            best_rows = np.hstack([best_rows, rows])
+            if best_distances.shape[1] > k:
+                keep = np.argpartition(best_distances, k - 1, axis=1)[:, :k]
+                best_distances = np.take_along_axis(best_distances, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        order = np.argsort(best_distances, axis=1, kind='stable')
+        best_distances = np.sqrt(np.maximum(np.take_along_axis(best_distances, order, axis=1), 0))
+        return np.take_along_axis(best_rows, order, axis=1), best_distances
+
+    def comps(self, player_id, season=None, k=5):
+        """
+        Find the player-seasons most similar to a player's season, excluding the player's own seasons.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            season (int): The season to match. Default is None (the player's latest indexed season).
+            k (int): Number of comparables. Default is 5.
+
+        Returns:
+            pd.DataFrame: 'player_id', 'season', index 'row' and 'distance' of each comparable, most similar first.
+        """
+        with span('comps.search', rows_in=len(self.vectors)) as stage:
+            rows, distances = self.nearest(self.vectors[self.row(player_id, season)], k, exclude_players=[player_id])
+            found = np.isfinite(distances[0])
+            rows, distances = rows[0][found], distances[0][found]
+            stage.rows_out = len(rows)
+        return pd.DataFrame({
+            'player_id': self.player_ids[rows], 'season': self.seasons[rows], 'row': rows, 'distance': distances
+        })
@@ -0,0 +1,103 @@
+import logging
+from storage import load_table, find_table
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class NflDataSource:
+    """
+    Source of the raw nflverse datasets, fetched over the network through nfl-data-py.
+
+    Every method fetches one chunk (one dataset, one season), so the fetch layer
+    can run chunks concurrently and cache them one by one. Any source with the
+    same methods can stand in for this one (see `LocalFileSource`).
+    """
+    name = 'nfl_data_py'
+
+    def seasonal_data(self, year, season_type):
+        """
+        Args:
+            year (int): Season to fetch (e.g., 2024).
+            season_type (str): Season type, e.g., 'REG' for regular season.
+
+        Returns:
+            pd.DataFrame: One row per player for the season.
+        """
+        # Imported here so cache hits never pay for it
+        import nfl_data_py as nfl
+        return nfl.import_seasonal_data([year], season_type)
+
+    def weekly_data(self, season):
+        """
+        Args:
+            season (int): Season to fetch (e.g., 2024).
+
+        Returns:
+            pd.DataFrame: One row per player and week, for every season type.
+        """
+        import nfl_data_py as nfl
+        return nfl.import_weekly_data([season], downcast=False)
+
+    def player_ids(self):
+        """
+        Returns:
+            pd.DataFrame: Player information, one row per player.
+        """
+        import nfl_data_py as nfl
+        return nfl.import_ids()
+
+class LocalFileSource:
+    """
+    Offline stand-in for `NflDataSource` that serves the same datasets from stored tables.
+
+    The directory holds `seasonal_data_<year>`, `weekly_data_<season>` and
+    `player_ids` tables (Parquet or CSV) with the upstream schemas, so tests and
+    benchmarks can exercise the whole fetch layer without the network.
+    """
+    name = 'local'
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Directory holding the tables.
+        """
+        self.directory = directory.rstrip('/') + '/'
+
+    def _load(self, name):
+        path = f'{self.directory}{name}'
+        if find_table(path) is None:
+            raise FileNotFoundError(f"No {name} table in {self.directory}")
+        return load_table(path)
+
+    def seasonal_data(self, year, season_type):
+        data = self._load(f'seasonal_data_{year}')
+        if 'season_type' in data.columns:
+            data = data[data['season_type'] == season_type].reset_index(drop=True)
+        return data
+
+    def weekly_data(self, season):
+        return self._load(f'weekly_data_{season}')
+
+    def player_ids(self):
+        return self._load('player_ids')
+
+# Source used by the fetch functions unless one is passed explicitly
+_default_source = NflDataSource()
+
+def get_source():
+    """
+    Returns:
+        The source fetches use by default.
+    """
+    return _default_source
+
+def set_source(source):
+    """
+    Replace the default source, e.g. with a `LocalFileSource` for offline runs.
+
+    Args:
+        source: An object with `seasonal_data`, `weekly_data` and `player_ids` methods.
+    """
+    global _default_source
+    _default_source = source
+    logging.info(f"Fetching from the {getattr(source, 'name', type(source).__name__)} source.")
@@ -1,7 +1,15 @@
-import nfl_data_py as nfl
 import pandas as pd
 import os
+import json
+import time
+import itertools
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from storage import DEFAULT_FORMAT, DEFAULT_COMPRESSION, save_table, load_table
+from instrumentation import span
+from schema import optimize_dtypes
+from data_sources import get_source
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,6 +18,16 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 SEASONAL_DATA_DIR = './data/raw/'  # Directory for seasonal data
 PLAYER_INFO_DIR = './data/raw/'    # Directory for player info data
 
+# Fetch cache settings
+CACHE_DIR = './data/cache/'         # Directory for cached fetch results
+DEFAULT_CACHE_TTL = 24 * 60 * 60    # Seconds before a cached fetch is considered stale
+
+# Concurrent fetch settings
+FETCH_WORKERS = 4    # Chunks (datasets or seasons) fetched at once
+FETCH_RETRIES = 3    # Retries of a failed chunk before falling back to the cache
+RETRY_BACKOFF = 1.0  # Seconds before the first retry; doubled after each failure
+SEASON_PREFETCH = 1  # Seasons fetched ahead of the one being processed when streaming seasons
+
 def ensure_directory_exists(filepath):
     """
     Ensure the directory for the given filepath exists.
@@ -17,93 +35,415 @@ def ensure_directory_exists(filepath):
     """
     dir_path = os.path.dirname(filepath)
     if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
+        # Concurrent fetches may create the same directory at once
+        os.makedirs(dir_path, exist_ok=True)
         logging.info(f"Created directory: {dir_path}")
 
+def cache_key(dataset, years=None, season_type=None):
+    """
+    Build the cache key for a fetch request.
+
+    Args:
+        dataset (str): Name of the dataset (e.g., 'seasonal_data').
+        years (list): Years requested, if the dataset is per-season.
+        season_type (str): Season type requested, if any.
+
+    Returns:
+        str: Cache key, e.g. 'seasonal_data_2023-2024_REG'.
+    """
+    parts = [dataset]
+    if years:
+        parts.append('-'.join(str(year) for year in sorted(years)))
+    if season_type:
+        parts.append(season_type)
+    return '_'.join(parts)
+
+def read_cache(key, ttl=DEFAULT_CACHE_TTL, columns=None):
+    """
+    Read a cached fetch result if it exists and is fresh.
+
+    Args:
+        key (str): Cache key from `cache_key`.
+        ttl (float): Maximum age in seconds. None accepts a cached result of any age.
+        columns (list): Columns to read. Default is None (all columns).
+
+    Returns:
+        pd.DataFrame or None: Cached data, or None if missing or stale.
+    """
+    metadata_path = f'{CACHE_DIR}{key}.json'
+    if not os.path.exists(metadata_path):
+        return None
+
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+
+    age = time.time() - metadata['fetched_at']
+    if ttl is not None and age > ttl:
+        logging.info(f"Cache for {key} is stale ({age:.0f}s old).")
+        return None
+
+    # The cache records where the fetch was saved rather than keeping a second copy
+    cached_data = load_table(metadata.get('path', f'{CACHE_DIR}{key}'), columns)
+    if cached_data.empty:
+        return None
+
+    logging.info(f"Using cached {key} ({age:.0f}s old).")
+    return cached_data
+
+def write_cache(key, data, saved_path):
+    """
+    Record a saved fetch result in the cache along with its fetch time.
+
+    Only the metadata is written; the cache points at the raw file the fetch
+    was already saved to, so each fetch is written to disk once.
+
+    Args:
+        key (str): Cache key from `cache_key`.
+        data (pd.DataFrame): Fetched data.
+        saved_path (str): Path the data was saved to, from `save_table`.
+    """
+    metadata_path = f'{CACHE_DIR}{key}.json'
+    ensure_directory_exists(metadata_path)
+    with open(metadata_path, 'w') as f:
+        json.dump({'key': key, 'fetched_at': time.time(), 'rows': len(data), 'path': saved_path}, f)
+
+def fallback_to_cache(key, columns=None):
+    """
+    Recover from a failed fetch with the last cached result, regardless of age.
+
+    Args:
+        key (str): Cache key from `cache_key`.
+        columns (list): Columns to read. Default is None (all columns).
+
+    Returns:
+        pd.DataFrame: Cached data, or an empty DataFrame if nothing was cached.
+    """
+    cached_data = read_cache(key, ttl=None, columns=columns)
+    if cached_data is None:
+        logging.error(f"No cached {key} to fall back on.")
+        return pd.DataFrame()
+
+    logging.warning(f"Falling back to cached {key}.")
+    return cached_data
+
+
+def fetch_with_retries(fetch, description, retries=FETCH_RETRIES, backoff=RETRY_BACKOFF):
+    """
+    Call a fetch function, retrying failures with exponential backoff.
+
+    Args:
+        fetch (callable): Function performing the fetch, called with no arguments.
+        description (str): What is being fetched, for the log.
+        retries (int): Retries after the first failure. Default is FETCH_RETRIES.
+        backoff (float): Seconds to wait before the first retry; doubled after each failure.
+
+    Returns:
+        The fetch function's result. The last failure is raised if every attempt fails.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fetch()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            logging.warning(f"Fetching {description} failed ({e}); retrying in {delay:.1f}s.")
+            time.sleep(delay)
+
+def fetch_dataset(key, fetch, stage, output_path, file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION,
+                  ttl=DEFAULT_CACHE_TTL, force_refresh=False, columns=None):
+    """
+    Fetch one chunk of a dataset through the cache, saving it to disk on success.
+
+    The saved raw file doubles as the cached copy, so a fetch is written once.
+
+    Each chunk is cached on its own, so when some chunks of a request fail the
+    completed ones are kept and only the failed ones are fetched again next time.
+
+    Args:
+        key (str): Cache key from `cache_key`.
+        fetch (callable): Function fetching the chunk from a source, called with no arguments.
+        stage (str): Instrumentation stage name (e.g., 'fetch.seasonal_data').
+        output_path (str): Raw data path to save the chunk to, without an extension.
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        ttl (float): Seconds a cached fetch stays fresh. Default is one day.
+        force_refresh (bool): Fetch from the source even if the cache is fresh. Default is False.
+        columns (list): Columns to return. Default is None (all columns). The full chunk is
+            still fetched and cached, but cache hits only read these columns.
+
+    Returns:
+        pd.DataFrame: The chunk, the last cached chunk if the fetch failed, or an empty DataFrame.
+    """
+    if not force_refresh:
+        cached_data = read_cache(key, ttl, columns)
+        if cached_data is not None:
+            return cached_data
+
+    try:
+        with span(stage) as stage_span:
+            data = optimize_dtypes(fetch_with_retries(fetch, key))
+            stage_span.rows_out = len(data)
+        if data.empty:
+            logging.warning(f"No data fetched for {key}")
+            return fallback_to_cache(key, columns)
+
+        # Ensure the output directory exists
+        ensure_directory_exists(output_path)
+
+        # Save the data to disk, named by chunk so other chunks are not overwritten
+        saved_path = save_table(data, output_path, file_format, compression)
+
+        # Check if data was saved properly, and only then point the cache at it
+        if os.path.exists(saved_path):
+            logging.info(f"File successfully saved to: {os.path.abspath(saved_path)}")
+            write_cache(key, data, saved_path)
+        else:
+            logging.error(f"Failed to save file: {saved_path}")
+
+        return data if columns is None else data[columns]
+    except Exception as e:
+        # Log any errors and fall back to the last cached fetch
+        logging.error(f"Error fetching {key}: {e}")
+        return fallback_to_cache(key, columns)
+
+def run_concurrently(tasks, max_workers=FETCH_WORKERS):
+    """
+    Run fetch tasks on a bounded thread pool.
+
+    Fetches spend their time waiting on the network, so threads overlap them
+    even under the GIL.
+
+    Args:
+        tasks (dict): Functions to call with no arguments, keyed by name.
+        max_workers (int): Maximum number of tasks running at once. Default is FETCH_WORKERS.
+
+    Returns:
+        dict: Each task's result, keyed like `tasks`.
+    """
+    if len(tasks) <= 1 or max_workers <= 1:
+        return {name: task() for name, task in tasks.items()}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)), thread_name_prefix='fetch') as pool:
+        futures = {name: pool.submit(task) for name, task in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def get_season(year, season_type='REG', file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION,
+               ttl=DEFAULT_CACHE_TTL, force_refresh=False, source=None):
+    """
+    Fetch and save one season of seasonal data.
+
+    Args:
+        year (int): Season to fetch (e.g., 2024).
+        season_type (str): Season type, e.g., 'REG' for regular season, 'POST' for postseason. Default is 'REG'.
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        ttl (float): Seconds a cached fetch stays fresh. Default is one day.
+        force_refresh (bool): Fetch from the source even if the cache is fresh. Default is False.
+        source: Data source to fetch from. Default is None (the source from `data_sources.get_source`).
+
+    Returns:
+        pd.DataFrame: The season's data, or an empty DataFrame if it could not be fetched.
+    """
+    source = source or get_source()
+    key = cache_key('seasonal_data', [year], season_type)
+    return fetch_dataset(key, lambda: source.seasonal_data(year, season_type), 'fetch.seasonal_data',
+                         f'{SEASONAL_DATA_DIR}{key}', file_format, compression, ttl, force_refresh)
+
+def get_seasons(years, season_type='REG', file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION,
+                ttl=DEFAULT_CACHE_TTL, force_refresh=False, source=None, max_workers=FETCH_WORKERS):
+    """
+    Fetch and save several seasons concurrently, one chunk per season.
+
+    Args:
+        years (list): List of years to fetch data for (e.g., [2023, 2024]).
+        season_type (str): Season type, e.g., 'REG' for regular season, 'POST' for postseason. Default is 'REG'.
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        ttl (float): Seconds a cached fetch stays fresh. Default is one day.
+        force_refresh (bool): Fetch from the source even if the cache is fresh. Default is False.
+        source: Data source to fetch from. Default is None (the source from `data_sources.get_source`).
+        max_workers (int): Maximum number of seasons fetched at once. Default is FETCH_WORKERS.
+
+    Returns:
+        dict: Each fetched season's data keyed by year; seasons that could not be fetched are left out.
+    """
+    source = source or get_source()
+    seasons = run_concurrently({
+        year: (lambda year=year: get_season(year, season_type, file_format, compression, ttl, force_refresh, source))
+        for year in sorted(set(years))
+    }, max_workers)
+
+    missing = [year for year, data in seasons.items() if data.empty]
+    if missing:
+        logging.error(f"No seasonal data for years: {missing} and season_type: {season_type}")
+    return {year: data for year, data in seasons.items() if not data.empty}
 
-def get_seasonal_data(years, season_type='REG'):
+def get_seasonal_data(years, season_type='REG', file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION,
+                      ttl=DEFAULT_CACHE_TTL, force_refresh=False, source=None, max_workers=FETCH_WORKERS):
     """
     Fetch and save seasonal data for the specified years and season type.
+
+    Years are fetched concurrently and cached one by one (see `get_seasons`).
     
     Args:
         years (list): List of years to fetch data for (e.g., [2024]).
         season_type (str): Season type, e.g., 'REG' for regular season, 'POST' for postseason. Default is 'REG'.
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        ttl (float): Seconds a cached fetch stays fresh. Default is one day.
+        force_refresh (bool): Fetch from the source even if the cache is fresh. Default is False.
+        source: Data source to fetch from. Default is None (the source from `data_sources.get_source`).
+        max_workers (int): Maximum number of seasons fetched at once. Default is FETCH_WORKERS.
     
     Returns:
-        pd.DataFrame: Seasonal data as a DataFrame.
+        pd.DataFrame: Seasonal data as a DataFrame, for the years that could be fetched.
     """
-    try:        
-        # Fetch seasonal data from nfl-data-py
-        seasonal_data = nfl.import_seasonal_data(years, season_type)
-        if seasonal_data.empty:
-            logging.warning(f"No seasonal data fetched for years: {years} and season_type: {season_type}")
-        
-        # Ensure the output directory exists
-        ensure_directory_exists(SEASONAL_DATA_DIR)
-        
-        # Save the data to a CSV file
-        output_path = f'{SEASONAL_DATA_DIR}seasonal_data.csv'
-        seasonal_data.to_csv(output_path, index=False)
-        
-        # Check if data was saved properly
-        if os.path.exists(output_path):
-            logging.info(f"File successfully saved to: {os.path.abspath(output_path)}")
-        else:
-            logging.error(f"Failed to save file: {output_path}")
-            
-        return seasonal_data
-    except Exception as e:
-        # Log any errors and return an empty DataFrame
-        logging.error(f"Error fetching seasonal data: {e}")
-        return pd.DataFrame()
+    seasons = get_seasons(years, season_type, file_format, compression, ttl, force_refresh, source, max_workers)
+    if len(seasons) <= 1:
+        return next(iter(seasons.values()), pd.DataFrame())
+    # Categories differ between seasons, so the combined table is compacted again
+    return optimize_dtypes(pd.concat(seasons.values(), ignore_index=True))
+
+def get_weekly_data(season, weeks, season_type='REG', file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION,
+                    ttl=DEFAULT_CACHE_TTL, force_refresh=False, source=None):
+    """
+    Fetch and save per-week player stats for some weeks of a season.
+    
+    Args:
+        season (int): Season to fetch (e.g., 2024).
+        weeks (list): Weeks of the season to keep (e.g., [7]).
+        season_type (str): Season type, e.g., 'REG' for regular season, 'POST' for postseason. Default is 'REG'.
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        ttl (float): Seconds a cached fetch stays fresh. Default is one day.
+        force_refresh (bool): Fetch from the source even if the cache is fresh. Default is False.
+        source: Data source to fetch from. Default is None (the source from `data_sources.get_source`).
+    
+    Returns:
+        pd.DataFrame: One row per player and week.
+    """
+    source = source or get_source()
+    weeks = sorted(weeks)
+    key = cache_key(f"weekly_data_w{'-'.join(str(week) for week in weeks)}", [season], season_type)
 
-def get_player_info():
+    def fetch_weeks():
+        # The source serves the whole season; keep the requested weeks
+        weekly_data = source.weekly_data(season)
+        return weekly_data[
+            (weekly_data['season_type'] == season_type) & weekly_data['week'].isin(weeks)
+        ].reset_index(drop=True)
+
+    return fetch_dataset(key, fetch_weeks, 'fetch.weekly_data', f'{SEASONAL_DATA_DIR}{key}',
+                         file_format, compression, ttl, force_refresh)
+
+def get_player_info(file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION, ttl=DEFAULT_CACHE_TTL, force_refresh=False,
+                    columns=None, source=None):
     """
     Fetch and save player information data.
     
+    Args:
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        ttl (float): Seconds a cached fetch stays fresh. Default is one day.
+        force_refresh (bool): Fetch from the source even if the cache is fresh. Default is False.
+        columns (list): Columns to return. Default is None (all columns). The full table is
+            still fetched and cached, but cache hits only read these columns.
+        source: Data source to fetch from. Default is None (the source from `data_sources.get_source`).
+    
     Returns:
         pd.DataFrame: Player information as a DataFrame.
     """
-    try:
-        # Fetch player info from nfl-data-py
-        player_info = nfl.import_ids()
-        if player_info.empty:
-            logging.warning(f"No player info data fetched")
-        
-        # Ensure the output directory exists
-        ensure_directory_exists(PLAYER_INFO_DIR)
-        
-        # Save the data to a CSV file
-        output_path = f'{PLAYER_INFO_DIR}player_info.csv'
-        player_info.to_csv(output_path, index=False)
-        
-        # Check if data was saved properly
-        if os.path.exists(output_path):
-            logging.info(f"File successfully saved to: {os.path.abspath(output_path)}")
-        else:
-            logging.error(f"Failed to save file: {output_path}")
-            
-        return player_info
-    except Exception as e:
-        # Log any errors and return an empty DataFrame
-        logging.error(f"Error fetching player info: {e}")
-        return pd.DataFrame()
+    source = source or get_source()
+    return fetch_dataset(cache_key('player_info'), source.player_ids, 'fetch.player_info', f'{PLAYER_INFO_DIR}player_info',
+                         file_format, compression, ttl, force_refresh, columns)
+
+def fetch_all(years, season_type='REG', ttl=DEFAULT_CACHE_TTL, force_refresh=False, player_info_columns=None,
+              source=None, max_workers=FETCH_WORKERS):
+    """
+    Fetch player info and every requested season concurrently on one thread pool.
+
+    Args:
+        years (list): List of years to fetch data for (e.g., [2023, 2024]).
+        season_type (str): Season type, e.g., 'REG' for regular season, 'POST' for postseason. Default is 'REG'.
+        ttl (float): Seconds a cached fetch stays fresh. Default is one day.
+        force_refresh (bool): Fetch from the source even if the cache is fresh. Default is False.
+        player_info_columns (list): Player info columns to return. Default is None (all columns).
+        source: Data source to fetch from. Default is None (the source from `data_sources.get_source`).
+        max_workers (int): Maximum number of chunks fetched at once. Default is FETCH_WORKERS.
 
-def load_raw_data(filepath):
+    Returns:
+        tuple: (player info, dict of each fetched season's data keyed by year).
     """
-    Load raw data from a CSV file.
+    source = source or get_source()
+    tasks = {'player_info': lambda: get_player_info(
+        ttl=ttl, force_refresh=force_refresh, columns=player_info_columns, source=source
+    )}
+    for year in sorted(set(years)):
+        tasks[year] = lambda year=year: get_season(year, season_type, ttl=ttl, force_refresh=force_refresh, source=source)
+
+    with span('fetch.all') as stage:
+        results = run_concurrently(tasks, max_workers)
+        player_info = results.pop('player_info')
+        missing = [year for year, data in results.items() if data.empty]
+        if missing:
+            logging.error(f"No seasonal data for years: {missing} and season_type: {season_type}")
+        seasons = {year: data for year, data in results.items() if not data.empty}
+        stage.rows_out = len(player_info) + sum(len(data) for data in seasons.values())
+    return player_info, seasons
+
+def iter_seasons(years, season_type='REG', ttl=DEFAULT_CACHE_TTL, force_refresh=False, source=None,
+                 prefetch=SEASON_PREFETCH):
+    """
+    Fetch seasons one at a time, in season order, to stream them through preprocessing.
+
+    Unlike `fetch_all`, which holds every season at once, only the season being
+    consumed and the `prefetch` seasons fetched ahead of it on background threads
+    are in memory, however many seasons are requested.
+
+    Args:
+        years (list): List of years to fetch data for (e.g., [2023, 2024]).
+        season_type (str): Season type, e.g., 'REG' for regular season, 'POST' for postseason. Default is 'REG'.
+        ttl (float): Seconds a cached fetch stays fresh. Default is one day.
+        force_refresh (bool): Fetch from the source even if the cache is fresh. Default is False.
+        source: Data source to fetch from. Default is None (the source from `data_sources.get_source`).
+        prefetch (int): Seasons fetched ahead of the one being consumed, at least 1. Default is SEASON_PREFETCH.
+
+    Yields:
+        pd.DataFrame: Each season's data; seasons that could not be fetched are logged and skipped.
+    """
+    if prefetch < 1:
+        raise ValueError(f"prefetch must be at least 1, got {prefetch}")
+    source = source or get_source()
+    upcoming = iter(sorted(set(years)))
+
+    def fetch(year):
+        return get_season(year, season_type, ttl=ttl, force_refresh=force_refresh, source=source)
+
+    with ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix='fetch') as pool:
+        pending = deque((year, pool.submit(fetch, year)) for year in itertools.islice(upcoming, prefetch))
+        while pending:
+            year, future = pending.popleft()
+            data = future.result()
+            next_year = next(upcoming, None)
+            if next_year is not None:
+                pending.append((next_year, pool.submit(fetch, next_year)))
+
+            if data.empty:
+                logging.error(f"No seasonal data for year: {year} and season_type: {season_type}")
+                continue
+            yield data
+            del data  # Release the season before waiting on the next one
+
+def load_raw_data(filepath, columns=None):
+    """
+    Load raw data from a Parquet or CSV file, applying the compact dtype schema.
     
     Args:
-        filepath (str): Path to the CSV file.
+        filepath (str): Path to the file. Without an extension, Parquet is preferred over CSV.
+        columns (list): Columns to read. Default is None (all columns).
         
     Returns:
         pd.DataFrame: Loaded data as a DataFrame.
     """
-    try:
-        # Attempt to load the CSV file
-        logging.info(f"Loading data from {filepath}...")
-        return pd.read_csv(filepath)
-    except FileNotFoundError:
-        # Log an error if the file does not exist and return an empty DataFrame
-        logging.error(f"File not found: {filepath}")
-        return pd.DataFrame()
+    return optimize_dtypes(load_table(filepath, columns))
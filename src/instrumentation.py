@@ -0,0 +1,176 @@
+import cProfile
+import functools
+import json
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+try:
+    import resource  # Peak RSS is only available on Unix
+except ImportError:
+    resource = None
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Instrumentation state; everything is a no-op until `enable` is called
+_enabled = False
+_trace_memory = False
+_sink = None
+_profiler = None
+_profile_path = None
+_local = threading.local()  # Each thread nests its own spans, so concurrent fetches time correctly
+_lock = threading.Lock()      # Guards the totals and the sink shared by all threads
+_totals = defaultdict(lambda: {'calls': 0, 'seconds': 0.0, 'rows_in': 0, 'rows_out': 0})
+
+def enable(output_path=None, trace_memory=False, profile_path=None):
+    """
+    Turn on stage spans, optionally with memory tracing and a cProfile capture.
+
+    Args:
+        output_path (str): JSON lines file to write one record per span to. Default is None
+            (spans are only summarized in the log).
+        trace_memory (bool): Record each span's peak traced memory with tracemalloc. Default is False.
+        profile_path (str): File to dump cProfile stats to when `finish` is called. Default is None.
+    """
+    global _enabled, _trace_memory, _sink, _profiler, _profile_path
+    _enabled = True
+    _trace_memory = trace_memory
+    _sink = open(output_path, 'w', buffering=1) if output_path else None
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if profile_path:
+        _profile_path = profile_path
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+def is_enabled():
+    return _enabled
+
+def _span_stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+def _emit(record):
+    if _sink is not None:
+        _sink.write(json.dumps(record) + '\n')
+
+def finish():
+    """
+    Stop instrumentation, write the per-stage summary and dump any cProfile capture.
+    """
+    global _enabled, _trace_memory, _sink, _profiler, _profile_path
+    if not _enabled:
+        return
+
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_profile_path)
+        logging.info(f"cProfile stats saved to {_profile_path}.")
+        pstats.Stats(_profile_path).sort_stats('cumulative').print_stats(15)
+
+    for stage, totals in sorted(_totals.items(), key=lambda item: -item[1]['seconds']):
+        _emit({'type': 'summary', 'stage': stage, **totals})
+        logging.info(
+            f"{stage}: {totals['calls']} calls, {totals['seconds']:.4f}s, "
+            f"rows in {totals['rows_in']}, rows out {totals['rows_out']}"
+        )
+
+    if _sink is not None:
+        _sink.close()
+    if _trace_memory:
+        tracemalloc.stop()
+    _enabled, _trace_memory, _sink, _profiler, _profile_path = False, False, None, None, None
+    _span_stack().clear()
+    _totals.clear()
+
+class span:
+    """
+    Time a pipeline stage and record its row counts.
+
+    Usage:
+        with span('preprocess.merge', rows_in=len(data)) as stage:
+            merged = merge(data)
+            stage.rows_out = len(merged)
+
+    When instrumentation is disabled, entering and leaving a span does nothing.
+    """
+    __slots__ = ('stage', 'rows_in', 'rows_out', '_start', '_memory_start', '_memory_peak')
+
+    def __init__(self, stage, rows_in=None):
+        self.stage = stage
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        if not _enabled:
+            return self
+        stack = _span_stack()
+        if _trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Resetting the peak below would hide the parent's peak so far; carry it over
+                stack[-1]._memory_peak = max(stack[-1]._memory_peak, peak)
+            tracemalloc.reset_peak()
+            self._memory_start = current
+            self._memory_peak = current
+        stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stack = _span_stack()
+        if not _enabled or not stack or stack[-1] is not self:
+            return False
+        seconds = time.perf_counter() - self._start
+        stack.pop()
+
+        record = {
+            'type': 'span',
+            'stage': self.stage,
+            'seconds': seconds,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'depth': len(stack),
+            'ok': exc_type is None
+        }
+        if _trace_memory:
+            peak = max(self._memory_peak, tracemalloc.get_traced_memory()[1])
+            record['memory_peak_bytes'] = peak - self._memory_start
+            if stack:
+                stack[-1]._memory_peak = max(stack[-1]._memory_peak, peak)
+        if resource is not None:
+            record['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        with _lock:
+            totals = _totals[self.stage]
+            totals['calls'] += 1
+            totals['seconds'] += seconds
+            totals['rows_in'] += self.rows_in or 0
+            totals['rows_out'] += self.rows_out or 0
+            _emit(record)
+        return False
+
+def instrumented(stage):
+    """
+    Decorate a function so each call is recorded as a span.
+
+    Args:
+        stage (str): Name of the stage.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,8 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
 from matplotlib.gridspec import GridSpec
 import logging
+from instrumentation import span
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -23,32 +26,64 @@ def create_custom_colormap():
 
 custom_cmap = create_custom_colormap()  # Initialize the colormap
 
+# Image formats comparison charts and dashboards can be saved as
+EXPORT_FORMATS = ('png', 'svg', 'pdf')
+
+# Player colors on comparison charts, in legend order
+COMPARISON_COLORS = ['#D00000', '#0000D0', '#008040', '#E08000']
+
+# Dashboard card geometry, in inches
+CARD_WIDTH = 4.5  # Same width as a single chart
+CARD_LABEL_WIDTH = 0.9  # Room for the metric labels left of the bars
+CARD_HEADER_HEIGHT = 0.6  # Player name and subtitle
+CATEGORY_TITLE_HEIGHT = 0.3
+BAR_PITCH = 0.4  # Height per metric
+CARD_GAP = 0.3
+DASHBOARD_TITLE_HEIGHT = 0.7
+
 def plot_lollipop(category, metrics, values, ax):
     """
     Plots a lollipop chart for a given category.
 
+    Every part of the chart is drawn with a single artist per metric group (one
+    LineCollection for the background bars, one for the value bars and one
+    scatter for all heads), so it can be refreshed with `update_lollipop`.
+
     Parameters:
         category (str): Name of the category (e.g., 'Fantasy Value').
         metrics (list): List of metric names for the category.
         values (list): List of corresponding values for the metrics.
         ax (matplotlib.axes.Axes): The subplot axis to draw on.
+
+    Returns:
+        dict: The artists drawn for the category, for use with `update_lollipop`.
     """
-    y_positions = range(len(metrics))  # Create y positions for the bars
-    for y, (metric, value) in zip(y_positions, zip(reversed(metrics), reversed(values))):
-        normalized_value = value / 100  # Normalize value to [0, 1] for colormap
-        color = custom_cmap(normalized_value)  # Get color based on normalized value
+    y_positions = np.arange(len(metrics))  # Create y positions for the bars
+
+    # Draw the background bars (grey lines)
+    background = LineCollection([[(-5, y), (100, y)] for y in y_positions], linewidths=8, colors='#D0D0D0', zorder=0)
+    ax.add_collection(background)
 
-        # Draw the background bar (grey line)
-        ax.hlines(y=y, xmin=-5, xmax=100, linewidth=8, color='#D0D0D0', zorder=0)
+    # Draw the main lollipop bars
+    bars = LineCollection([[(-5, y), (-5, y)] for y in y_positions], linewidths=20, zorder=1)
+    ax.add_collection(bars)
 
-        # Draw the main lollipop bar
-        ax.hlines(y=y, xmin=-5, xmax=value, linewidth=20, color=color, zorder=1)
+    # Draw the scatter points (lollipop heads)
+    heads = ax.scatter(x=np.zeros(len(metrics)), y=y_positions, s=500, edgecolors='white', linewidth=1.5, zorder=3)
 
-        # Draw the scatter point (lollipop head)
-        ax.scatter(x=value, y=y, s=500, color=color, edgecolors='white', linewidth=1.5, zorder=3)
+    # Confidence whiskers (a line with end caps per metric), empty until `update_lollipop` is given bands
+    whiskers = LineCollection([], linewidths=1.5, colors='#303030', zorder=2)
+    ax.add_collection(whiskers)
 
-        # Add the value as a label inside the lollipop head
-        ax.text(x=value, y=y, s=f'{round(value)}', va='center', ha='center', color='white', fontsize=9, fontweight='bold', zorder=4)
+    # Hollow markers for comparison players, empty until `update_lollipop` is given overlays;
+    # drawn under the heads so a comparable near the player's value never covers its label
+    overlay = ax.scatter(x=[], y=[], s=60, facecolors='none', edgecolors='#303030', linewidth=1.2, zorder=2.5)
+
+    # Add the values as labels inside the lollipop heads
+    labels = [
+        ax.text(x=0, y=y, s='', va='center', ha='center', color='white', fontsize=9, fontweight='bold', zorder=4)
+        for y in y_positions
+    ]
 
     # Style the plot
     ax.set_xlim(-5, 110)
@@ -60,6 +95,45 @@ def plot_lollipop(category, metrics, values, ax):
     ax.tick_params(axis='x', which='both', length=0, labelbottom=False)
     ax.tick_params(axis='y', which='both', length=0)
 
+    artists = {'y_positions': y_positions, 'bars': bars, 'heads': heads, 'whiskers': whiskers, 'overlay': overlay, 'labels': labels}
+    update_lollipop(artists, values)
+    return artists
+
+def update_lollipop(artists, values, overlays=None, bands=None):
+    """
+    Move the bars, heads and labels of a drawn category to new values.
+
+    Parameters:
+        artists (dict): Artists returned by `plot_lollipop`.
+        values (list): New values for the category's metrics, in metric order.
+        overlays (list): Value lists of comparison players to mark on each bar, in metric order.
+            Default is None (no markers).
+        bands (list): (low, high) confidence bounds to draw as whiskers, in metric order.
+            Default is None (no whiskers).
+    """
+    values = np.asarray(values, dtype=float)[::-1]  # Metrics are drawn bottom-up
+    y_positions = artists['y_positions']
+    colors = custom_cmap(values / 100)  # Normalize values to [0, 1] for the colormap
+
+    artists['bars'].set_segments([[(-5, y), (value, y)] for y, value in zip(y_positions, values)])
+    artists['bars'].set_color(colors)
+    artists['heads'].set_offsets(np.column_stack([values, y_positions]))
+    artists['heads'].set_facecolor(colors)
+    for label, y, value in zip(artists['labels'], y_positions, values):
+        label.set_position((value, y))
+        label.set_text('' if np.isnan(value) else f'{round(value)}')  # Missing scores get no bar and no label
+
+    # All comparison players share one scatter; NaN values are simply not drawn
+    offsets = [np.column_stack([np.asarray(overlay, dtype=float)[::-1], y_positions]) for overlay in overlays or []]
+    artists['overlay'].set_offsets(np.vstack(offsets) if offsets else np.empty((0, 2)))
+
+    # Each whisker runs from low to high with a cap at each end, in the gap under its bar so the head never hides it
+    whiskers = []
+    for y, (low, high) in zip(y_positions - 0.36, np.asarray(bands, dtype=float)[::-1] if bands is not None else []):
+        if not np.isnan(low):
+            whiskers += [[(low, y), (high, y)], [(low, y - 0.08), (low, y + 0.08)], [(high, y - 0.08), (high, y + 0.08)]]
+    artists['whiskers'].set_segments(whiskers)
+
 def calculate_figure_height(categories, bar_height=0.5):
     """
     Calculate the total height of the figure based on the number of bars.
@@ -74,43 +148,339 @@ def calculate_figure_height(categories, bar_height=0.5):
     total_bars = sum(len(metrics) for metrics in categories.values())
     return total_bars * bar_height
 
-def setup_figure_and_gridspec(categories):
+def setup_figure_and_gridspec(categories, managed=True):
     """
     Create a figure and GridSpec layout for the lollipop charts.
 
     Parameters:
         categories (dict): Dictionary of categories and their metrics.
+        managed (bool): Register the figure with pyplot so it can be shown. Unmanaged
+            figures can only be saved, but are never closed or displayed by pyplot.
 
     Returns:
         tuple: (figure, GridSpec object)
     """
     fig_height = calculate_figure_height(categories)
-    fig = plt.figure(figsize=(4.5, fig_height))
-    gs = GridSpec(nrows=len(categories), ncols=1, height_ratios=[len(categories[key]) for key in categories])
+    figsize = (4.5, fig_height)
+    fig = plt.figure(figsize=figsize) if managed else Figure(figsize=figsize)
+    gs = GridSpec(nrows=len(categories), ncols=1, height_ratios=[len(categories[key]) for key in categories], figure=fig)
     return fig, gs
 
-def generate_lollipop_chart(categories, values, title, subtitle):
+class LollipopTemplate:
+    """
+    A laid-out lollipop figure for one set of categories that can be re-rendered
+    for any player by updating its artists in place.
+    """
+    def __init__(self, categories, managed=False):
+        self.categories = {category: list(metrics) for category, metrics in categories.items()}
+        self.fig, gs = setup_figure_and_gridspec(self.categories, managed)
+
+        self.groups = {}
+        for i, (category, metrics) in enumerate(self.categories.items()):
+            ax = self.fig.add_subplot(gs[i])
+            self.groups[category] = plot_lollipop(category, metrics, [0] * len(metrics), ax)
+            ax.set_title(category, fontsize=11, fontweight='bold', loc='left', pad=5)
+
+        # Add main title and subtitle (placeholders size the layout), then lay the figure out once
+        self.title = self.fig.suptitle(t='Player', fontweight='bold')
+        self.subtitle = self.fig.text(0.5, 0.9, 'Player', ha='center', fontsize=12)
+        with span('render.layout'):
+            self.fig.tight_layout(rect=[0, 0, 1, 0.95])
+
+    def update(self, values, title, subtitle, overlays=None, bands=None):
+        """
+        Redraw the template for a new player.
+
+        Parameters:
+            values (dict): Dictionary of values corresponding to the categories.
+            title (str): Main title of the chart.
+            subtitle (str): Subtitle for additional player information.
+            overlays (list): Value dictionaries of comparison players to mark on the bars.
+                Default is None (no markers).
+            bands (dict): (low, high) pairs per category to draw as whiskers. Default is None (no whiskers).
+        """
+        for category, artists in self.groups.items():
+            update_lollipop(artists, values[category], [overlay[category] for overlay in overlays or []],
+                            bands[category] if bands is not None else None)
+        self.title.set_text(title)
+        self.subtitle.set_text(subtitle)
+
+    def save(self, output_path, file_format=None):
+        """
+        Save the current state of the template.
+
+        Parameters:
+            output_path (str or file-like): File to save the chart to.
+            file_format (str): Image format (e.g., 'png'). Default is None (taken from the extension).
+        """
+        with span('render.save'):
+            self.fig.savefig(output_path, format=file_format)
+
+# Saved-chart templates, keyed by their category layout
+_templates = {}
+
+def get_template(categories):
+    """
+    Get the cached template for a category layout, building it on first use.
+
+    Parameters:
+        categories (dict): Dictionary of categories and their metrics.
+
+    Returns:
+        LollipopTemplate: Template for the layout.
+    """
+    key = tuple((category, tuple(metrics)) for category, metrics in categories.items())
+    if key not in _templates:
+        _templates[key] = LollipopTemplate(categories)
+    return _templates[key]
+
+def generate_lollipop_chart(categories, values, title, subtitle, output_path=None, overlays=None, bands=None):
     """
     Generate a lollipop chart for all categories.
 
+    Saved charts reuse a cached template per category layout, so rendering many
+    players with the same layout only updates artists instead of rebuilding the figure.
+
     Parameters:
         categories (dict): Dictionary of categories and their metrics.
         values (dict): Dictionary of values corresponding to the categories.
         title (str): Main title of the chart.
         subtitle (str): Subtitle for additional player information.
+        output_path (str): File to save the chart to (format taken from the extension).
+            If None, the chart is displayed interactively instead.
+        overlays (list): Value dictionaries of comparison players (e.g., comps) to mark on the bars.
+            Default is None (no markers).
+        bands (dict): (low, high) pairs per category (e.g., from `get_band_data`) to draw as whiskers.
+            Default is None (no whiskers).
     """
-    fig, gs = setup_figure_and_gridspec(categories)
+    if output_path is not None:
+        # Save the chart from the shared template
+        with span('render.template'):
+            template = get_template(categories)
+            template.update(values, title, subtitle, overlays, bands)
+        template.save(output_path)
+        logging.info(f"Lollipop chart saved to {output_path}.")
+        return
 
-    for i, (category, metrics) in enumerate(categories.items()):
-        ax = fig.add_subplot(gs[i])
-        plot_lollipop(category, metrics, values[category], ax)
-        ax.set_title(category, fontsize=11, fontweight='bold', loc='left', pad=5)
-
-    # Add main title and subtitle
-    fig.suptitle(t=title, fontweight='bold')
-    fig.text(0.5, 0.9, subtitle, ha='center', fontsize=12)
-    fig.tight_layout(rect=[0, 0, 1, 0.95])
+    with span('render.template'):
+        template = LollipopTemplate(categories, managed=True)
+        template.update(values, title, subtitle, overlays, bands)
 
     # Display the chart
     logging.info("Displaying the lollipop chart.")
     plt.show()
+
+def export_format(output_path):
+    """
+    Get the image format of an output path from its extension.
+
+    Parameters:
+        output_path (str): File to save a chart to (e.g., 'dashboard.pdf').
+
+    Returns:
+        str: The format, one of EXPORT_FORMATS.
+    """
+    file_format = output_path.rsplit('.', 1)[-1].lower() if '.' in output_path else ''
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported image format for {output_path}; use one of: {', '.join(EXPORT_FORMATS)}")
+    return file_format
+
+def plot_comparison(category, metrics, players_values, ax):
+    """
+    Plots several players' lollipops for a category on shared axes.
+
+    Each metric gets one row per player, in player order from the top, colored
+    by COMPARISON_COLORS rather than by score so the players can be told apart.
+
+    Parameters:
+        category (str): Name of the category (e.g., 'Fantasy Value').
+        metrics (list): List of metric names for the category.
+        players_values (list): One list of values per player, in metric order.
+        ax (matplotlib.axes.Axes): The subplot axis to draw on.
+    """
+    y_positions = np.arange(len(metrics))
+    offsets = (np.arange(len(players_values)) - (len(players_values) - 1) / 2) * (0.8 / len(players_values))
+
+    # One grey background bar per player row, as a single collection
+    rows = [y - offset for offset in offsets for y in y_positions]
+    ax.add_collection(LineCollection([[(-5, y), (100, y)] for y in rows], linewidths=4, colors='#E0E0E0', zorder=0))
+
+    for offset, values, color in zip(offsets, players_values, COMPARISON_COLORS):
+        values = np.asarray(values, dtype=float)[::-1]  # Metrics are drawn bottom-up
+        y_values = y_positions - offset
+        ax.add_collection(LineCollection([[(-5, y), (value, y)] for y, value in zip(y_values, values)],
+                                         linewidths=8, colors=color, zorder=1))
+        ax.scatter(x=values, y=y_values, s=120, color=color, edgecolors='white', linewidth=1, zorder=3)
+        for y, value in zip(y_values, values):
+            if not np.isnan(value):
+                ax.text(x=value + 3, y=y, s=f'{round(value)}', va='center', ha='left', color=color, fontsize=7, fontweight='bold')
+
+    # Style the plot like the single-player chart
+    ax.set_xlim(-5, 115)
+    ax.set_ylim(-0.5, len(metrics) - 0.5)
+    ax.set_yticks(y_positions)
+    ax.set_yticklabels(reversed(metrics), fontsize=8)
+    for spine in ['top', 'right', 'left', 'bottom']:
+        ax.spines[spine].set_visible(False)
+    ax.tick_params(axis='x', which='both', length=0, labelbottom=False)
+    ax.tick_params(axis='y', which='both', length=0)
+
+def generate_comparison_chart(categories, players, title, output_path=None):
+    """
+    Generate one lollipop chart comparing 2-4 players on shared axes.
+
+    Parameters:
+        categories (dict): Dictionary of categories and their metrics, shared by every player.
+        players (list): (label, values) pairs, where values is a dictionary of values per category.
+        title (str): Main title of the chart.
+        output_path (str): File to save the chart to, as PNG, SVG or PDF (taken from the extension).
+            If None, the chart is displayed interactively instead.
+    """
+    if not 2 <= len(players) <= len(COMPARISON_COLORS):
+        raise ValueError(f"A comparison needs 2 to {len(COMPARISON_COLORS)} players, got {len(players)}.")
+    for label, values in players:
+        if any(len(values.get(category, ())) != len(metrics) for category, metrics in categories.items()):
+            raise ValueError(f"Values for {label} do not match the chart's categories.")
+    file_format = export_format(output_path) if output_path is not None else None
+
+    with span('render.comparison'):
+        # Each metric row grows with the number of players so the bars keep their thickness
+        header_height = 0.3 + 0.2 * ((len(players) + 1) // 2)  # Title plus two legend entries per line
+        fig_height = calculate_figure_height(categories, bar_height=0.25 * len(players) + 0.2) + header_height
+        figsize = (4.5, fig_height)
+        fig = Figure(figsize=figsize) if file_format else plt.figure(figsize=figsize)
+        gs = GridSpec(nrows=len(categories), ncols=1, height_ratios=[len(metrics) for metrics in categories.values()], figure=fig)
+        for i, (category, metrics) in enumerate(categories.items()):
+            ax = fig.add_subplot(gs[i])
+            plot_comparison(category, metrics, [values[category] for _, values in players], ax)
+            ax.set_title(category, fontsize=11, fontweight='bold', loc='left', pad=5)
+
+        fig.suptitle(t=title, fontweight='bold', y=1 - 0.2 / fig_height)
+        handles = [plt.Line2D([], [], marker='o', linestyle='', color=color) for color in COMPARISON_COLORS[:len(players)]]
+        fig.legend(handles, [label for label, _ in players], loc='upper center', ncol=2,
+                   bbox_to_anchor=(0.5, 1 - 0.35 / fig_height), frameon=False, fontsize=9)
+        with span('render.layout'):
+            fig.tight_layout(rect=[0, 0, 1, 1 - header_height / fig_height])
+
+    if file_format:
+        with span('render.save'):
+            fig.savefig(output_path, format=file_format)
+        logging.info(f"Comparison chart saved to {output_path}.")
+        return
+
+    logging.info("Displaying the comparison chart.")
+    plt.show()
+
+def card_height(categories):
+    """
+    Calculate the height of a dashboard card.
+
+    Parameters:
+        categories (dict): Dictionary of categories and their metrics.
+
+    Returns:
+        float: Card height in inches.
+    """
+    return CARD_HEADER_HEIGHT + sum(CATEGORY_TITLE_HEIGHT + len(metrics) * BAR_PITCH for metrics in categories.values())
+
+def draw_card(ax, left, top, categories, values, title, subtitle, parts):
+    """
+    Lay out one player's card on a dashboard, in inches.
+
+    Bars and heads are appended to `parts` so every card shares the same few
+    collections; only text is added to the axes directly.
+
+    Parameters:
+        ax (matplotlib.axes.Axes): The dashboard axes, spanning the figure in inch coordinates.
+        left (float): Left edge of the card, in inches from the figure's left.
+        top (float): Top edge of the card, in inches from the figure's bottom.
+        categories (dict): Dictionary of categories and their metrics.
+        values (dict): Dictionary of values corresponding to the categories.
+        title (str): The card's title (e.g., the player's name and season).
+        subtitle (str): Subtitle for additional player information.
+        parts (dict): Lists of 'background' and 'bars' segments and 'heads' points with their 'values'.
+    """
+    ax.text(left, top - 0.2, title, ha='left', va='center', fontsize=11, fontweight='bold')
+    ax.text(left, top - 0.45, subtitle, ha='left', va='center', fontsize=8, color='#505050')
+
+    # Scores from -5 to 110 span the bar area, as on a single chart's x-axis
+    bar_left = left + CARD_LABEL_WIDTH
+    scale = (CARD_WIDTH - CARD_LABEL_WIDTH) / 115
+    top -= CARD_HEADER_HEIGHT
+    for category, metrics in categories.items():
+        ax.text(bar_left, top - CATEGORY_TITLE_HEIGHT / 2, category, ha='left', va='center', fontsize=10, fontweight='bold')
+        top -= CATEGORY_TITLE_HEIGHT
+        for i, (metric, value) in enumerate(zip(metrics, np.asarray(values[category], dtype=float))):
+            y = top - (i + 0.5) * BAR_PITCH
+            x = bar_left + (value + 5) * scale
+            ax.text(bar_left - 0.05, y, metric, ha='right', va='center', fontsize=8)
+            parts['background'].append([(bar_left, y), (bar_left + 105 * scale, y)])
+            parts['bars'].append([(bar_left, y), (x, y)])
+            parts['heads'].append((x, y))
+            parts['values'].append(value)
+            if not np.isnan(value):
+                ax.text(x, y, f'{round(value)}', ha='center', va='center', color='white', fontsize=9, fontweight='bold', zorder=4)
+        top -= len(metrics) * BAR_PITCH
+
+def generate_dashboard(cards, output_path=None, columns=4, title=None):
+    """
+    Generate a dashboard of many players' lollipop charts as one figure.
+
+    Cards are placed on a fixed grid computed once up front, in inches, on a
+    single axes covering the figure: every card's bars share one collection and
+    every head one scatter, so the figure costs a handful of artists plus text
+    instead of a figure, several axes and a `tight_layout` pass per player.
+    Each row is as tall as its tallest card, so cards of different positions
+    can share a dashboard.
+
+    Parameters:
+        cards (list): (categories, values, title, subtitle) tuples, as returned by `get_lollipop_data`.
+        output_path (str): File to save the dashboard to, as PNG, SVG or PDF (taken from the extension).
+            If None, the dashboard is displayed interactively instead.
+        columns (int): Cards per row. Default is 4.
+        title (str): Title above the grid. Default is None (no title).
+    """
+    if not cards:
+        raise ValueError("A dashboard needs at least one card.")
+    if columns < 1:
+        raise ValueError(f"A dashboard needs at least one column, got {columns}.")
+    file_format = export_format(output_path) if output_path is not None else None
+
+    with span('render.dashboard'):
+        columns = min(columns, len(cards))
+        rows = [cards[start:start + columns] for start in range(0, len(cards), columns)]
+        row_heights = [max(card_height(categories) for categories, *_ in row) for row in rows]
+        title_height = DASHBOARD_TITLE_HEIGHT if title else 0
+
+        width = CARD_GAP + columns * (CARD_WIDTH + CARD_GAP)
+        height = title_height + CARD_GAP + sum(row_height + CARD_GAP for row_height in row_heights)
+        fig = Figure(figsize=(width, height)) if file_format else plt.figure(figsize=(width, height))
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_xlim(0, width)
+        ax.set_ylim(0, height)
+        ax.set_axis_off()
+        if title:
+            ax.text(width / 2, height - CARD_GAP - title_height / 2, title, ha='center', va='center', fontsize=16, fontweight='bold')
+
+        parts = {'background': [], 'bars': [], 'heads': [], 'values': []}
+        top = height - title_height - CARD_GAP
+        for row, row_height in zip(rows, row_heights):
+            for column, card in enumerate(row):
+                draw_card(ax, CARD_GAP + column * (CARD_WIDTH + CARD_GAP), top, *card, parts)
+            top -= row_height + CARD_GAP
+
+        # Same styling as `plot_lollipop`, drawn once for every card
+        colors = custom_cmap(np.asarray(parts['values']) / 100)
+        ax.add_collection(LineCollection(parts['background'], linewidths=8, colors='#D0D0D0', zorder=0))
+        ax.add_collection(LineCollection(parts['bars'], linewidths=20, colors=colors, zorder=1))
+        heads = np.asarray(parts['heads'])
+        ax.scatter(x=heads[:, 0], y=heads[:, 1], s=500, c=colors, edgecolors='white', linewidth=1.5, zorder=3)
+
+    if file_format:
+        with span('render.save'):
+            fig.savefig(output_path, format=file_format)
+        logging.info(f"Dashboard of {len(cards)} players saved to {output_path}.")
+        return
+
+    logging.info("Displaying the dashboard.")
+    plt.show()
@@ -1,50 +1,453 @@
-from fetch_data import get_player_info, get_seasonal_data, load_raw_data
-from preprocess_data import preprocess_and_save
-from lollipop_chart import generate_lollipop_chart
-from profiles import QBProfile, RBProfile, WRProfile, TEProfile
+import argparse
+import logging
+import os
+import sys
+import instrumentation
+
+# Heavy modules (pandas, nfl_data_py, matplotlib) are imported inside the commands that
+# need them, so e.g. `profile` never loads matplotlib and only a fetch that misses the cache loads nfl_data_py
+
+# Seasons to fetch and preprocess; with more than one, profiles can rank players against the pooled seasons
+SEASONS = [2024]
+
+def ingest_seasons(years, season_type='REG', refresh=(), store=None):
+    """
+    Fetch and preprocess the seasons that have not been processed yet.
+
+    Player info is fetched first, then the pending seasons are fetched one at a
+    time (the next one in the background) and streamed through preprocessing, so
+    only about two seasons are in memory at once however many are pending.
+
+    Args:
+        years (list): Seasons that should be available.
+        season_type (str): Season type, e.g., 'REG' for regular season. Default is 'REG'.
+        refresh (iterable): Seasons to reprocess even if they were already processed.
+        store (PlayerStore): SQLite store to also save the processed tables to. Default is None.
+    """
+    from fetch_data import get_player_info, iter_seasons
+    from preprocess_data import PLAYER_INFO_COLUMNS, preprocess_and_save, processed_seasons
+
+    already_processed = set(processed_seasons())
+    pending = []
+    for year in sorted(years):
+        if year in already_processed and year not in refresh:
+            logging.info(f"Season {year} already processed; skipping.")
+        else:
+            pending.append(year)
+
+    if pending:
+        player_info = get_player_info(columns=PLAYER_INFO_COLUMNS)
+        preprocess_and_save(iter_seasons(pending, season_type), player_info, store=store)
+
+def open_store(path, create=False):
+    """
+    Open the SQLite player store at a path, if one was given.
+
+    Args:
+        path (str): The store's database file, or None.
+        create (bool): Create the store if it does not exist yet. Default is False.
+
+    Returns:
+        PlayerStore: The open store, or None when no path was given.
+    """
+    if path is None:
+        return None
+    if not create and not os.path.exists(path):
+        raise ValueError(f"No player store at {path}; run preprocess with --store first.")
+    from player_store import PlayerStore
+    return PlayerStore(path)
+
+def select_league(source, league=None):
+    """
+    Pick one league's scoring configuration from a preset name or JSON file.
+
+    Args:
+        source (str): A scoring preset name or a JSON file of configurations.
+        league (str): League to pick when the file holds several. Default is None.
+
+    Returns:
+        tuple: (league name, configuration).
+    """
+    from scoring import load_scoring_configs
+
+    configs = load_scoring_configs(source)
+    if league is None:
+        if len(configs) > 1:
+            raise ValueError(f"{source} holds {len(configs)} leagues; choose one with --league.")
+        league = next(iter(configs))
+    if league not in configs:
+        raise ValueError(f"Unknown league in {source}: {league}")
+    return league, configs[league]
+
+def load_player_index():
+    """
+    Index the saved player info, without any stats yet.
+
+    Returns:
+        PlayerIndex: Index of every player's metadata.
+    """
+    from fetch_data import PLAYER_INFO_DIR, load_raw_data
+    from preprocess_data import PLAYER_INFO_COLUMNS
+    from player_index import PlayerIndex
+
+    player_info = load_raw_data(f'{PLAYER_INFO_DIR}player_info', columns=PLAYER_INFO_COLUMNS)
+    if player_info.empty:
+        raise ValueError("No player info found; run the fetch command first.")
+    return PlayerIndex(player_info)
+
+def build_profile(player_id, seasons=None, league=None, bands=None, store=None):
+    """
+    Build a player's profile from data that was already fetched and preprocessed.
+
+    Nothing is fetched, so this works offline once `fetch` and `preprocess` have run.
+
+    Args:
+        player_id (str): The player's gsis_id.
+        seasons (list): Seasons to rank the player against; the player is profiled in the
+            latest of them. Default is None (the latest processed season).
+        league (tuple): (league name, scoring configuration) to rank fantasy points under.
+            Default is None (PPR scoring).
+        bands (int): Bootstrap resamples for confidence bands around the scores, computed for the
+            whole position at once. Default is None (no bands).
+        store (PlayerStore): SQLite store to read processed data from instead of the processed files.
+            Default is None.
+
+    Returns:
+        PlayerProfile: The player's profile.
+    """
+    from preprocess_data import qualifications, load_processed, processed_seasons, rank_pool, profile_columns
+
+    seasons = sorted(seasons) if seasons else (store.seasons() if store is not None else processed_seasons())[-1:]
+    if not seasons:
+        raise ValueError("No processed data found; run the preprocess command first.")
+    if store is not None and len(seasons) == 1 and league is None and bands is None:
+        from profiles import profile_from_store
+        return profile_from_store(store, player_id, seasons[0])
 
-# Main workflow
-def main():
-    # Fetch data
-    seasonal_data = get_seasonal_data(years=[2024], season_type='REG')
-    player_info = get_player_info()
-    
-    # Preprocess and save data
-    preprocess_and_save(seasonal_data, player_info)
-    
-    # Get player ID from user
-    player_id = input("Enter player ID: ")
-    
     # Determine position and load corresponding data
-    position = player_info[player_info['gsis_id'] == player_id].iloc[0]['position']
-    
-    stats_file = {
-        'QB': './data/processed/qb_data.csv',
-        'RB': './data/processed/rb_data.csv',
-        'WR': './data/processed/wr_data.csv',
-        'TE': './data/processed/te_data.csv'
-    }.get(position)
-    
-    if stats_file is None:
-        raise ValueError(f"Unsupported position: {position}")
-    
-    stats = load_raw_data(stats_file)
-    
-    # Create appropriate profile
-    profile_class = {
-        'QB': QBProfile,
-        'RB': RBProfile,
-        'WR': WRProfile,
-        'TE': TEProfile
-    }.get(position)
-    
-    profile = profile_class(player_id, player_info, stats)
-    
-    # Get lollipop data
+    player_index = load_player_index()
+    position = player_index.position(player_id)
+
+    columns = profile_columns(position, include_stats=len(seasons) > 1 or bands is not None)
+    if league is not None:
+        from scoring import SCORING_STATS, apply_league_scoring
+        columns = list(dict.fromkeys(columns + SCORING_STATS + [qualifications[position]['stat']]))
+
+    stats = store.load(position, seasons, columns) if store is not None else load_processed(position, seasons, columns=columns)
+    if stats.empty:
+        raise ValueError(f"No processed {position} data for seasons: {seasons}")
+    if league is not None:
+        stats = apply_league_scoring(stats, *league, position)
+    if len(seasons) > 1:
+        stats = rank_pool(stats, position)
+
+    player_index.add_stats(position, stats)
+    if bands is not None:
+        player_index.add_bands(position, n_resamples=bands)
+    return player_index.profile(player_id, seasons[-1])
+
+def fetch_command(args):
+    """
+    Fetch player info and each season's raw data into the raw data directory and fetch cache.
+    """
+    from fetch_data import fetch_all
+
+    fetch_all(args.seasons, args.season_type, force_refresh=args.refresh)
+
+def preprocess_command(args):
+    """
+    Preprocess the requested seasons, fetching any raw data that is not cached yet.
+    """
+    # The latest season may still be in progress, so it is always reprocessed
+    refresh = args.seasons if args.refresh else [max(args.seasons)]
+    store = open_store(args.store, create=True)
+    ingest_seasons(args.seasons, args.season_type, refresh, store)
+    if store is not None:
+        # Seasons processed before the store existed are copied from their files
+        from preprocess_data import populate_store
+        populate_store(store)
+        store.close()
+
+def ingest_week_command(args):
+    """
+    Apply one or more weeks of stats to a season's processed data, updating only the players who played.
+    """
+    from fetch_data import get_player_info, get_weekly_data
+    from preprocess_data import PLAYER_INFO_COLUMNS
+    from weekly_ingest import ingest_weeks
+
+    weekly_data = get_weekly_data(args.season, args.weeks, season_type=args.season_type, force_refresh=args.refresh)
+    ingest_weeks(args.season, weekly_data, get_player_info(columns=PLAYER_INFO_COLUMNS), args.season_type,
+                 store=open_store(args.store))
+
+def profile_command(args):
+    """
+    Print a player's profile metrics.
+    """
+    from profiles import format_profile
+
+    league = select_league(args.scoring, args.league) if args.scoring else None
+    profile = build_profile(args.player_id, args.seasons, league, args.bands, open_store(args.store))
+    print(format_profile(*profile.get_lollipop_data(), bands=profile.get_band_data()))
+
+def render_command(args):
+    """
+    Render a player's lollipop chart, to a file if an output path is given or to a window otherwise.
+    """
+    if args.output:
+        import matplotlib
+        matplotlib.use('Agg')  # Headless backend; must be selected before pyplot is imported
+    from lollipop_chart import generate_lollipop_chart
+
+    league = select_league(args.scoring, args.league) if args.scoring else None
+    profile = build_profile(args.player_id, args.seasons, league, args.bands, open_store(args.store))
     categories, values, title, subtitle = profile.get_lollipop_data()
-    
-    # Generate lollipop chart
-    generate_lollipop_chart(categories, values, title, subtitle)
+    generate_lollipop_chart(categories, values, title, subtitle, output_path=args.output, bands=profile.get_band_data())
+
+def comps_command(args):
+    """
+    Print the player-seasons most similar to a player's season, optionally charting them over the player's profile.
+    """
+    from comps import CompsIndex
+
+    player_index = load_player_index()
+    index = CompsIndex.load(player_index.position(args.player_id), args.seasons)
+    season = index.seasons[index.row(args.player_id, args.season)]
+    comps = index.comps(args.player_id, season, args.k)
+
+    print(f"{player_index.metadata(args.player_id)['name']} {season} comps")
+    for comp in comps.itertuples():
+        name = player_index.metadata(comp.player_id)['name'] if comp.player_id in player_index else comp.player_id
+        print(f"  {name:<28}{comp.season:>6}{comp.distance:>10.1f}")
+
+    if args.output:
+        import matplotlib
+        matplotlib.use('Agg')
+        from lollipop_chart import generate_lollipop_chart
+
+        categories, values, title, subtitle = build_profile(args.player_id, [season]).get_lollipop_data()
+        overlays = [index.values(row) for row in comps['row']]
+        generate_lollipop_chart(categories, values, title, subtitle, output_path=args.output, overlays=overlays)
+
+def load_season_index(position, season=None, extra_columns=()):
+    """
+    Index player info and one position's processed stats for a season.
+
+    Args:
+        position (str): The position to load (e.g., 'WR').
+        season (int): The season to load. Default is None (the latest processed season).
+        extra_columns (iterable): Processed columns to load besides the profile columns.
+
+    Returns:
+        tuple: (PlayerIndex, season, the position's stats table).
+    """
+    from preprocess_data import load_processed, processed_seasons, profile_columns
+
+    if season is None:
+        seasons = processed_seasons()
+        if not seasons:
+            raise ValueError("No processed data found; run the preprocess command first.")
+        season = seasons[-1]
+    stats = load_processed(position, [season], columns=list(dict.fromkeys(profile_columns(position) + list(extra_columns))))
+    if stats.empty:
+        raise ValueError(f"No processed {position} data for season: {season}")
+
+    player_index = load_player_index()
+    player_index.add_stats(position, stats)
+    return player_index, season, stats
+
+def compare_command(args):
+    """
+    Render 2-4 players' lollipops on one chart, to a file if an output path is given or to a window otherwise.
+    """
+    if args.output:
+        import matplotlib
+        matplotlib.use('Agg')
+    from lollipop_chart import generate_comparison_chart
+
+    player_index = load_player_index()
+    positions = {player_index.position(player_id) for player_id in args.player_ids}
+    if len(positions) > 1:
+        raise ValueError(f"Compared players must share a position, got: {', '.join(sorted(positions))}")
+    position = positions.pop()
+
+    player_index, season, _ = load_season_index(position, args.season)
+    players = []
+    for player_id in args.player_ids:
+        categories, values, title, _ = player_index.profile(player_id, season).get_lollipop_data()
+        players.append((title, values))
+    generate_comparison_chart(categories, players, f'{position} comparison {season}', output_path=args.output)
+
+def dashboard_command(args):
+    """
+    Render one figure of lollipop charts for a position's top scorers, optionally on one team.
+    """
+    if args.output:
+        import matplotlib
+        matplotlib.use('Agg')
+    from lollipop_chart import generate_dashboard
+
+    position = args.position.upper()
+    player_index, season, stats = load_season_index(position, args.season, ['team', 'fantasy_points_ppr'])
+    if args.team:
+        stats = stats[stats['team'] == args.team.upper()]
+    # Best PPR scorers first; a team dashboard shows the whole group unless --top is given
+    stats = stats.sort_values('fantasy_points_ppr', ascending=False, kind='stable')
+    top = args.top if args.top is not None else (None if args.team else 24)
+    player_ids = [player_id for player_id in stats['player_id'] if player_id in player_index][:top]
+    if not player_ids:
+        raise ValueError(f"No {position} players" + (f" on {args.team.upper()}" if args.team else "") + f" in {season}")
+
+    cards = [player_index.profile(player_id, season).get_lollipop_data() for player_id in player_ids]
+    group = f"{args.team.upper()} {position}s" if args.team else f"Top {len(cards)} {position}s"
+    generate_dashboard(cards, output_path=args.output, columns=args.columns, title=f'{group} {season}')
+
+def query_command(args):
+    """
+    Print the stored player-seasons matching the given filters.
+    """
+    import pandas as pd
+
+    min_values = {}
+    for condition in args.min or []:
+        column, sep, value = condition.partition('=')
+        if not sep:
+            raise ValueError(f"Expected COLUMN=VALUE for --min, got: {condition}")
+        min_values[column] = float(value)
+
+    with open_store(args.store) as store:
+        results = store.query(args.position, args.seasons, args.since, args.team, args.player_id, min_values,
+                              args.columns, args.order_by, not args.descending, args.limit)
+    with pd.option_context('display.max_rows', None, 'display.width', None):
+        print(results.to_string(index=False) if not results.empty else "No stored player-seasons match.")
+
+def session_command(args):
+    """
+    Start an interactive session that looks players up by name with the data kept loaded.
+    """
+    from session import run_session
+
+    run_session(args.output_dir)
+
+def build_parser():
+    """
+    Build the command-line parser.
+
+    Returns:
+        argparse.ArgumentParser: Parser with the fetch, preprocess, ingest-week, profile, render, comps, compare, dashboard, query and session commands.
+    """
+    parser = argparse.ArgumentParser(description="Fetch, preprocess and chart fantasy football player profiles.")
+    parser.add_argument('--instrument', metavar='PATH', help="write per-stage timings and row counts as JSON lines")
+    parser.add_argument('--trace-memory', action='store_true', help="record each stage's peak memory with tracemalloc")
+    parser.add_argument('--cprofile', metavar='PATH', help="capture a cProfile of the run")
+    parser.add_argument('--source-dir', metavar='DIR',
+                        help="fetch from local seasonal_data_<year>, weekly_data_<season> and player_ids tables instead of the network")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name, handler, description in [
+        ('fetch', fetch_command, "fetch raw player info and seasonal data"),
+        ('preprocess', preprocess_command, "compute percentiles for seasons that are not processed yet")
+    ]:
+        command = commands.add_parser(name, help=description, description=description)
+        command.add_argument('--seasons', type=int, nargs='+', default=SEASONS, help="seasons to process")
+        command.add_argument('--season-type', default='REG', help="season type, e.g. REG or POST")
+        command.add_argument('--refresh', action='store_true', help="refetch or reprocess even if already done")
+        if name == 'preprocess':
+            command.add_argument('--store', metavar='DB', help="also save processed tables to this SQLite store")
+        command.set_defaults(handler=handler)
+
+    description = "add a week's stats to a season's processed totals and re-rank percentiles"
+    command = commands.add_parser('ingest-week', help=description, description=description)
+    command.add_argument('--season', type=int, default=max(SEASONS), help="season the weeks belong to")
+    command.add_argument('--weeks', type=int, nargs='+', required=True, help="weeks to apply")
+    command.add_argument('--season-type', default='REG', help="season type, e.g. REG or POST")
+    command.add_argument('--refresh', action='store_true', help="refetch the weeks even if they are cached")
+    command.add_argument('--store', metavar='DB', help="also update this SQLite store")
+    command.set_defaults(handler=ingest_week_command)
+
+    for name, handler, description in [
+        ('profile', profile_command, "print a player's profile metrics from processed data"),
+        ('render', render_command, "render a player's lollipop chart from processed data")
+    ]:
+        command = commands.add_parser(name, help=description, description=description)
+        command.add_argument('player_id', help="the player's gsis_id, e.g. 00-0023459")
+        command.add_argument('--seasons', type=int, nargs='+',
+                             help="seasons to rank against; the player is profiled in the latest (default: latest processed season)")
+        command.add_argument('--scoring', metavar='PRESET_OR_JSON',
+                             help="rank fantasy points under a league's scoring (e.g. half_ppr, or a JSON file of leagues)")
+        command.add_argument('--league', help="league to use when the scoring file holds several")
+        command.add_argument('--bands', metavar='RESAMPLES', type=int, nargs='?', const=10_000,
+                             help="add 90%% bootstrap bands from resampling the qualifying pool (default: 10000 resamples)")
+        command.add_argument('--store', metavar='DB', help="read processed data from this SQLite store")
+        if name == 'render':
+            command.add_argument('--output', metavar='PATH', help="save the chart here instead of displaying it")
+        command.set_defaults(handler=handler)
+
+    description = "list the player-seasons at the same position most similar to a player's season"
+    command = commands.add_parser('comps', help=description, description=description)
+    command.add_argument('player_id', help="the player's gsis_id, e.g. 00-0023459")
+    command.add_argument('--season', type=int, help="season to match (default: the player's latest indexed season)")
+    command.add_argument('--seasons', type=int, nargs='+', help="seasons to search (default: every processed season)")
+    command.add_argument('-k', type=int, default=5, help="number of comparables")
+    command.add_argument('--output', metavar='PATH', help="save the player's chart with the comparables marked")
+    command.set_defaults(handler=comps_command)
+
+    description = "chart 2-4 players of the same position on shared axes"
+    command = commands.add_parser('compare', help=description, description=description)
+    command.add_argument('player_ids', nargs='+', metavar='player_id', help="the players' gsis_ids")
+    command.add_argument('--season', type=int, help="season to compare (default: latest processed season)")
+    command.add_argument('--output', metavar='PATH', help="save the chart here (.png, .svg or .pdf) instead of displaying it")
+    command.set_defaults(handler=compare_command)
+
+    description = "chart a position group, e.g. a team's WRs or the top 24 RBs, as one dashboard figure"
+    command = commands.add_parser('dashboard', help=description, description=description)
+    command.add_argument('--position', required=True, choices=['QB', 'RB', 'WR', 'TE'], type=str.upper, help="position to chart")
+    command.add_argument('--team', help="only chart players on this team, e.g. CHI")
+    command.add_argument('--top', type=int, help="chart the top N PPR scorers (default: 24, or the whole team with --team)")
+    command.add_argument('--season', type=int, help="season to chart (default: latest processed season)")
+    command.add_argument('--columns', type=int, default=6, help="cards per row")
+    command.add_argument('--output', metavar='PATH', help="save the dashboard here (.png, .svg or .pdf) instead of displaying it")
+    command.set_defaults(handler=dashboard_command)
+
+    description = "list stored player-seasons matching filters, e.g. WRs on CHI with 60+ targets since 2018"
+    command = commands.add_parser('query', help=description, description=description)
+    command.add_argument('--store', metavar='DB', default='./data/players.db', help="SQLite store to query")
+    command.add_argument('--position', type=str.upper, help="only this position, e.g. WR")
+    command.add_argument('--seasons', type=int, nargs='+', help="only these seasons")
+    command.add_argument('--since', type=int, help="only this season or later")
+    command.add_argument('--team', help="only this team, e.g. CHI")
+    command.add_argument('--player-id', help="only this gsis_id")
+    command.add_argument('--min', nargs='+', metavar='COLUMN=VALUE', help="minimum values, e.g. targets=60")
+    command.add_argument('--columns', nargs='+', help="columns to print (default: every column of the position)")
+    command.add_argument('--order-by', metavar='COLUMN', help="column to sort by")
+    command.add_argument('--descending', action='store_true', help="sort from high to low")
+    command.add_argument('--limit', type=int, help="maximum rows to print")
+    command.set_defaults(handler=query_command)
+
+    description = "look players up by name interactively, keeping processed data loaded between lookups"
+    command = commands.add_parser('session', help=description, description=description)
+    command.add_argument('--output-dir', default='./output/session/', help="directory to save rendered charts in")
+    command.set_defaults(handler=session_command)
+
+    return parser
+
+# Main workflow
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.instrument or args.trace_memory or args.cprofile:
+        instrumentation.enable(args.instrument, args.trace_memory, args.cprofile)
+    if args.source_dir:
+        from data_sources import LocalFileSource, set_source
+        set_source(LocalFileSource(args.source_dir))
+    try:
+        args.handler(args)
+    except (KeyError, ValueError) as e:
+        logging.error(e.args[0] if e.args else e)
+        return 1
+    finally:
+        instrumentation.finish()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
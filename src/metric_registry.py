@@ -0,0 +1,222 @@
+import numpy as np
+import metrics_utils
+from metrics_utils import (
+    BOOTSTRAP_CONFIDENCE, BOOTSTRAP_RESAMPLES, calculate_percentiles_from_qualifying, calculate_percentile_bands_from_qualifying
+)
+
+class Metric:
+    """
+    A profile metric: where its value comes from, how it is shown and which way is better.
+
+    Usage:
+        Metric('completion_percentage', 'Cmp %', 'Passing', formula=metrics_utils.calculate_completion_percentage)
+        Metric('interceptions', 'Ints', 'Passing', higher_is_better=False)
+    """
+    __slots__ = ('column', 'label', 'category', 'higher_is_better', 'formula')
+
+    def __init__(self, column, label, category, higher_is_better=True, formula=None):
+        """
+        Args:
+            column (str): Source column, or the column a derived metric is stored in.
+            label (str): Label shown on the chart.
+            category (str): Chart category the metric is grouped under.
+            higher_is_better (bool): If False, the percentile is inverted for display. Default is True.
+            formula (callable): Vectorized function deriving the column from a position table.
+                Default is None (the column comes straight from the seasonal data).
+        """
+        self.column = column
+        self.label = label
+        self.category = category
+        self.higher_is_better = higher_is_better
+        self.formula = formula
+
+    def __repr__(self):
+        return f"Metric({self.column!r}, {self.label!r}, {self.category!r})"
+
+# Position-specific qualification criteria
+qualifications = {
+    'QB': {'stat': 'attempts', 'min_attempts': 135},
+    'RB': {'stat': 'carries', 'min_attempts': 90},
+    'WR': {'stat': 'targets', 'min_attempts': 45},
+    'TE': {'stat': 'targets', 'min_attempts': 45}
+}
+
+# Metrics ranked for each position's profile, in chart order; each is saved as a `<column>_percentile` column
+RECEIVER_METRICS = [
+    Metric('fantasy_points_ppr', 'Fantasy Pts', 'Fantasy Value'),
+    Metric('receiving_epa', 'Rec Pts', 'Fantasy Value'),
+    Metric('receiving_yards', 'Rec Yds', 'Receiving'),
+    Metric('receiving_tds', 'Rec TDs', 'Receiving'),
+    Metric('targets', 'Targets', 'Receiving'),
+    Metric('air_yards_share', 'Air Yds Share', 'Receiving')
+]
+
+POSITION_METRICS = {
+    'QB': [
+        Metric('fantasy_points_ppr', 'Fantasy Pts', 'Fantasy Value'),
+        Metric('passing_fantasy_points', 'Pass Pts', 'Fantasy Value', formula=metrics_utils.calculate_passing_fantasy_points),
+        Metric('rushing_fantasy_points', 'Rush Pts', 'Fantasy Value', formula=metrics_utils.calculate_rushing_fantasy_points),
+        Metric('passing_yards', 'Pass Yds', 'Passing'),
+        Metric('passing_tds', 'Pass TDs', 'Passing'),
+        Metric('interceptions', 'Ints', 'Passing', higher_is_better=False),
+        Metric('completion_percentage', 'Cmp %', 'Passing', formula=metrics_utils.calculate_completion_percentage),
+        Metric('attempts', 'Pass Att', 'Passing'),
+        Metric('rushing_yards', 'Rush Yds', 'Rushing'),
+        Metric('rushing_tds', 'Rush TDs', 'Rushing'),
+        Metric('carries', 'Rush Att', 'Rushing')
+    ],
+    'RB': [
+        Metric('fantasy_points_ppr', 'Fantasy Pts', 'Fantasy Value'),
+        Metric('rushing_epa', 'Rush Pts', 'Fantasy Value'),
+        Metric('receiving_epa', 'Rec Pts', 'Fantasy Value'),
+        Metric('rushing_yards', 'Rush Yds', 'Rushing'),
+        Metric('rushing_tds', 'Rush TDs', 'Rushing'),
+        Metric('carries', 'Rush Att', 'Rushing'),
+        Metric('receiving_yards', 'Rec Yds', 'Receiving'),
+        Metric('receiving_tds', 'Rec TDs', 'Receiving'),
+        Metric('targets', 'Targets', 'Receiving')
+    ],
+    'WR': RECEIVER_METRICS,
+    'TE': RECEIVER_METRICS
+}
+
+# Ranked columns for each position, in chart order
+percentile_stats = {position: [metric.column for metric in metrics] for position, metrics in POSITION_METRICS.items()}
+
+def derived_columns(position):
+    """
+    List the columns a position derives from its seasonal data.
+
+    Args:
+        position (str): The position (e.g., 'QB').
+
+    Returns:
+        list: Derived column names, in registry order.
+    """
+    return [metric.column for metric in POSITION_METRICS[position] if metric.formula is not None]
+
+def category_layout(position):
+    """
+    Group a position's metric labels by chart category.
+
+    Args:
+        position (str): The position (e.g., 'QB').
+
+    Returns:
+        dict: Category -> list of metric labels, in chart order.
+    """
+    categories = {}
+    for metric in POSITION_METRICS[position]:
+        categories.setdefault(metric.category, []).append(metric.label)
+    return categories
+
+def group_by_category(position, scores):
+    """
+    Split a row of scores into per-category lists, as the charts take them.
+
+    Args:
+        position (str): The position (e.g., 'QB').
+        scores (array-like): One score per metric of the position, in registry order.
+
+    Returns:
+        dict: Category -> list of scores, in chart order.
+    """
+    values = {}
+    for metric, score in zip(POSITION_METRICS[position], np.asarray(scores, dtype=np.float64).tolist()):
+        values.setdefault(metric.category, []).append(score)
+    return values
+
+def derive_metrics(data, position):
+    """
+    Evaluate a position's derived metrics over a whole table.
+
+    Args:
+        data (pd.DataFrame): Seasonal data for the position.
+        position (str): The position (e.g., 'QB').
+
+    Returns:
+        pd.DataFrame: A copy of the data with every derived column (re)computed.
+    """
+    derived = {metric.column: metric.formula(data) for metric in POSITION_METRICS[position] if metric.formula is not None}
+    return data.assign(**derived) if derived else data.copy()
+
+def rank_metrics(data, position):
+    """
+    Rank all of a position's metrics against its qualifying players in one batched pass.
+
+    Args:
+        data (pd.DataFrame): Data for the position, with every metric column present.
+        position (str): The position (e.g., 'QB').
+
+    Returns:
+        pd.DataFrame: The data with a `<column>_percentile` column for every metric.
+    """
+    criteria = qualifications[position]
+    percentiles = calculate_percentiles_from_qualifying(
+        data, percentile_stats[position], criteria['stat'], criteria['min_attempts']
+    ).add_suffix('_percentile')
+    return data.drop(columns=percentiles.columns, errors='ignore').join(percentiles)
+
+def compile_metrics(data, position):
+    """
+    Evaluate every derived metric and percentile for a whole position table.
+
+    Adding a metric to the registry adds one vectorized column here and no
+    per-player work anywhere else.
+
+    Args:
+        data (pd.DataFrame): Seasonal data for the position.
+        position (str): The position (e.g., 'QB').
+
+    Returns:
+        pd.DataFrame: The data with derived and `<column>_percentile` columns.
+    """
+    return rank_metrics(derive_metrics(data, position), position)
+
+def score_table(data, position):
+    """
+    Build the position-wide table of displayed scores from stored percentiles.
+
+    Metrics where lower is better are inverted, so 100 is always best.
+
+    Args:
+        data (pd.DataFrame): Processed data for the position with its `<column>_percentile` columns.
+        position (str): The position (e.g., 'QB').
+
+    Returns:
+        np.ndarray: One row per row of `data` and one column per metric, in chart order.
+    """
+    metrics = POSITION_METRICS[position]
+    scores = np.empty((len(data), len(metrics)), dtype=np.float64)
+    for i, metric in enumerate(metrics):
+        percentiles = data[f'{metric.column}_percentile'].to_numpy(dtype=np.float64)
+        scores[:, i] = percentiles if metric.higher_is_better else 100 - percentiles
+    return scores
+
+def band_table(data, position, n_resamples=BOOTSTRAP_RESAMPLES, confidence=BOOTSTRAP_CONFIDENCE, seed=None):
+    """
+    Build the position-wide tables of bootstrap bands around the displayed scores.
+
+    Bands are computed for every player and metric in one batched pass, from the
+    raw metric columns and the qualifying stat, against the same qualifying pool
+    `rank_metrics` ranks against. Metrics where lower is better are inverted like
+    their scores, so low is always the worse end.
+
+    Args:
+        data (pd.DataFrame): Data for the position, with every metric column and the qualifying stat.
+        position (str): The position (e.g., 'QB').
+        n_resamples (int): Bootstrap resamples. Default is BOOTSTRAP_RESAMPLES.
+        confidence (float): Coverage of the bands, between 0 and 1. Default is BOOTSTRAP_CONFIDENCE.
+        seed (int): Seed for the random generator. Default is None (unseeded).
+
+    Returns:
+        tuple: (low, high) arrays with one row per row of `data` and one column per metric, in chart order.
+    """
+    criteria = qualifications[position]
+    metrics = POSITION_METRICS[position]
+    low, high = calculate_percentile_bands_from_qualifying(
+        data, [metric.column for metric in metrics], criteria['stat'], criteria['min_attempts'], n_resamples, confidence, seed
+    )
+    low, high = low.to_numpy(), high.to_numpy()
+    inverted = np.array([not metric.higher_is_better for metric in metrics])
+    return np.where(inverted, 100 - high, low), np.where(inverted, 100 - low, high)
@@ -1,5 +1,10 @@
+import numpy as np
 import pandas as pd
-from scipy.stats import percentileofscore
+
+# Default resamples and coverage of bootstrap percentile bands
+BOOTSTRAP_RESAMPLES = 10_000
+BOOTSTRAP_CONFIDENCE = 0.9
+BOOTSTRAP_BLOCK = 1_000_000  # Drawn values (or sampled ranks) held in memory at once while banding
 
 def format_height(inches):
     """
@@ -16,6 +21,198 @@ def format_height(inches):
     return f"{feet}'{remaining_inches}\""
 
 
+def rank_percentiles(distribution, scores):
+    """
+    Rank scores against a distribution, matching percentileofscore(kind='rank').
+
+    The distribution is sorted once and every score is located with a batched
+    searchsorted, so ties are averaged exactly as scipy does.
+
+    Args:
+        distribution (array-like): Values forming the reference distribution (no NaNs).
+        scores (array-like): Values to rank against the distribution.
+
+    Returns:
+        np.ndarray: Percentile for each score (NaN where the score is NaN).
+    """
+    sorted_distribution = np.sort(np.asarray(distribution, dtype=np.float64))
+    scores = np.asarray(scores, dtype=np.float64)
+    n = sorted_distribution.size
+
+    left = np.searchsorted(sorted_distribution, scores, side='left')
+    right = np.searchsorted(sorted_distribution, scores, side='right')
+    percentiles = (left + right + (left < right)) * (50.0 / n)
+    percentiles[np.isnan(scores)] = np.nan
+    return percentiles
+
+def rank_percentiles_by_column(distributions, scores):
+    """
+    Rank each column of scores against the matching column of a distribution matrix,
+    matching percentileofscore(kind='rank').
+
+    All columns are sorted in a single call, and each column's scores are then
+    located with a batched searchsorted, so ranking hundreds of columns stays cheap.
+
+    Args:
+        distributions (np.ndarray): Reference values of shape (n, k), one distribution per column (no NaNs).
+        scores (np.ndarray): Values of shape (m, k) to rank against their column's distribution.
+
+    Returns:
+        np.ndarray: Percentiles of shape (m, k) (NaN where the score is NaN).
+    """
+    sorted_columns = np.sort(np.asarray(distributions, dtype=np.float64), axis=0)
+    scores = np.asarray(scores, dtype=np.float64)
+    n = sorted_columns.shape[0]
+
+    ranks = np.empty(scores.shape, dtype=np.float64)
+    for column in range(scores.shape[1]):
+        left = np.searchsorted(sorted_columns[:, column], scores[:, column], side='left')
+        right = np.searchsorted(sorted_columns[:, column], scores[:, column], side='right')
+        ranks[:, column] = left + right + (left < right)
+    percentiles = ranks * (50.0 / n)
+    percentiles[np.isnan(scores)] = np.nan
+    return percentiles
+
+def bootstrap_percentile_bands(distributions, scores, n_resamples=BOOTSTRAP_RESAMPLES, confidence=BOOTSTRAP_CONFIDENCE, seed=None):
+    """
+    Estimate how far each percentile could move if the reference distribution were resampled.
+
+    Each resample draws n values with replacement from a column's distribution,
+    and every score is ranked against it as `rank_percentiles` does. A rank only
+    needs how many drawn values fall below and at the score, so each column's
+    resamples are drawn as indices into its sorted distribution, counted per
+    position with one bincount and accumulated, and every score's counts in every
+    resample are then read with a single gather. Scores that fall between the
+    same two distribution values share a band, so quantiles are only taken once
+    per such pair. Resamples are drawn in blocks of about BOOTSTRAP_BLOCK values,
+    keeping only the counts at the positions the scores fall at, so memory stays
+    bounded however large the pool is. Only the loops over columns and blocks are in Python.
+
+    Args:
+        distributions (list): One array of reference values per column (no NaNs); sizes may differ.
+        scores (np.ndarray): Values of shape (m, k) to rank against their column's distribution.
+        n_resamples (int): Bootstrap resamples. Default is BOOTSTRAP_RESAMPLES.
+        confidence (float): Coverage of the band, between 0 and 1. Default is BOOTSTRAP_CONFIDENCE.
+        seed (int): Seed for the random generator. Default is None (unseeded).
+
+    Returns:
+        tuple: (low, high) percentile arrays of shape (m, k) (NaN where the score is NaN).
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"Confidence must be between 0 and 1, got {confidence}.")
+    scores = np.asarray(scores, dtype=np.float64)
+    if len(distributions) != scores.shape[1]:
+        raise ValueError(f"Got {len(distributions)} distributions for {scores.shape[1]} score columns.")
+
+    rng = np.random.default_rng(seed)
+    # Order statistics of the band's ends among the sorted resamples (linear interpolation)
+    positions = np.array([(1 - confidence) / 2, (1 + confidence) / 2]) * (n_resamples - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, n_resamples - 1)
+    fraction = positions - lower
+    low = np.empty(scores.shape, dtype=np.float64)
+    high = np.empty(scores.shape, dtype=np.float64)
+    pair_block = max(1, BOOTSTRAP_BLOCK // n_resamples)  # Position pairs ranked at once
+
+    for column, distribution in enumerate(distributions):
+        sorted_distribution = np.sort(np.asarray(distribution, dtype=np.float64))
+        n = sorted_distribution.size
+        left = np.searchsorted(sorted_distribution, scores[:, column], side='left')
+        right = np.searchsorted(sorted_distribution, scores[:, column], side='right')
+        # Scores between the same two distribution values always rank alike, so band each position pair once
+        pairs, pair_of_score = np.unique(left * (n + 1) + right, return_inverse=True)
+        pair_left, pair_right = np.divmod(pairs, n + 1)
+        # Only the sorted positions the scores fall at are ever read
+        needed, needed_of_pair = np.unique(np.concatenate([pair_left, pair_right]), return_inverse=True)
+        needed_left, needed_right = np.split(needed_of_pair.ravel(), 2)
+
+        # drawn[i, r]: values drawn in resample r from below sorted position needed[i]. Blocks of
+        # resamples are drawn in order from the same generator, so the draws match one big draw.
+        drawn = np.empty((len(needed), n_resamples), dtype=np.int32)
+        resample_block = max(1, BOOTSTRAP_BLOCK // n)
+        for start in range(0, n_resamples, resample_block):
+            size = min(resample_block, n_resamples - start)
+            draws = rng.integers(0, n, size=(size, n)) * size + np.arange(size)[:, None]
+            counts = np.bincount(draws.ravel(), minlength=n * size).reshape(n, size)
+            below = np.zeros((n + 1, size), dtype=np.int32)
+            np.cumsum(counts, axis=0, dtype=np.int32, out=below[1:])
+            drawn[:, start:start + size] = below[needed]
+            del draws, counts, below
+
+        pair_bounds = np.empty((2, len(pairs)), dtype=np.float64)
+        for start in range(0, len(pairs), pair_block):
+            rows = slice(start, start + pair_block)
+            drawn_below, drawn_at_or_below = drawn[needed_left[rows]], drawn[needed_right[rows]]
+            ranks = drawn_below + drawn_at_or_below + (drawn_below < drawn_at_or_below)  # Percentile * n / 50
+            # Sorting small integers is much faster than np.quantile's partition; interpolate as it does
+            ranks.sort(axis=1)
+            pair_bounds[:, rows] = (ranks[:, lower] + (ranks[:, upper] - ranks[:, lower]) * fraction).T
+        low[:, column], high[:, column] = pair_bounds[:, pair_of_score.ravel()] * (50.0 / n)
+
+    missing = np.isnan(scores)
+    low[missing] = np.nan
+    high[missing] = np.nan
+    return low, high
+
+def calculate_percentiles_from_qualifying(data, stats, qualifying_stat, min_attempts):
+    """
+    Calculate percentiles for several stats using only qualifying players for the distribution.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing player stats.
+        stats (list): Column names for the stats to calculate percentiles.
+        qualifying_stat (str): Column name used to determine qualification.
+        min_attempts (int): Minimum attempts required to qualify.
+
+    Returns:
+        pd.DataFrame: Percentile values for all players (one column per stat), indexed like `data`.
+    """
+    qualifying_mask = (data[qualifying_stat] >= min_attempts).to_numpy()
+    percentiles = {}
+
+    for stat in stats:
+        values = data[stat].to_numpy(dtype=np.float64)
+        qualifying_players = values[qualifying_mask]
+        qualifying_players = qualifying_players[~np.isnan(qualifying_players)]
+
+        if qualifying_players.size == 0:
+            raise ValueError(f"No qualifying players found for {stat} with {qualifying_stat} >= {min_attempts}.")
+
+        percentiles[stat] = rank_percentiles(qualifying_players, values)
+
+    return pd.DataFrame(percentiles, index=data.index, columns=list(stats))
+
+def calculate_percentile_bands_from_qualifying(data, stats, qualifying_stat, min_attempts,
+                                               n_resamples=BOOTSTRAP_RESAMPLES, confidence=BOOTSTRAP_CONFIDENCE, seed=None):
+    """
+    Calculate bootstrap bands around several stats' percentiles, resampling only qualifying players.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing player stats.
+        stats (list): Column names for the stats to calculate bands for.
+        qualifying_stat (str): Column name used to determine qualification.
+        min_attempts (int): Minimum attempts required to qualify.
+        n_resamples (int): Bootstrap resamples. Default is BOOTSTRAP_RESAMPLES.
+        confidence (float): Coverage of the band, between 0 and 1. Default is BOOTSTRAP_CONFIDENCE.
+        seed (int): Seed for the random generator. Default is None (unseeded).
+
+    Returns:
+        tuple: (low, high) DataFrames of percentiles for all players (one column per stat), indexed like `data`.
+    """
+    qualifying_mask = (data[qualifying_stat] >= min_attempts).to_numpy()
+    values = data[list(stats)].to_numpy(dtype=np.float64)
+    distributions = []
+    for column, stat in enumerate(stats):
+        qualifying_players = values[qualifying_mask, column]
+        qualifying_players = qualifying_players[~np.isnan(qualifying_players)]
+        if qualifying_players.size == 0:
+            raise ValueError(f"No qualifying players found for {stat} with {qualifying_stat} >= {min_attempts}.")
+        distributions.append(qualifying_players)
+
+    low, high = bootstrap_percentile_bands(distributions, values, n_resamples, confidence, seed)
+    return (pd.DataFrame(low, index=data.index, columns=list(stats)),
+            pd.DataFrame(high, index=data.index, columns=list(stats)))
+
 def calculate_percentile_from_qualifying(data, stat, qualifying_stat, min_attempts):
     """
     Calculate percentiles for a stat using only qualifying players for the distribution.
@@ -29,14 +226,7 @@ def calculate_percentile_from_qualifying(data, stat, qualifying_stat, min_attemp
     Returns:
         pd.Series: Percentile values for all players based on qualifying players' distribution.
     """
-    # Filter qualifying players
-    qualifying_players = data[data[qualifying_stat] >= min_attempts][stat].dropna()
-
-    if qualifying_players.empty:
-        raise ValueError(f"No qualifying players found for {stat} with {qualifying_stat} >= {min_attempts}.")
-
-    # Calculate percentiles for all players based on the qualifying distribution
-    return data[stat].apply(lambda x: percentileofscore(qualifying_players, x, kind='rank'))
+    return calculate_percentiles_from_qualifying(data, [stat], qualifying_stat, min_attempts)[stat]
 
 def calculate_passing_fantasy_points(data):
     """
@@ -0,0 +1,116 @@
+import bisect
+import difflib
+import re
+import unicodedata
+import numpy as np
+import logging
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Matches returned by a search unless a limit is given
+DEFAULT_LIMIT = 10
+
+def normalize_name(name):
+    """
+    Normalize a player name for searching: no accents, punctuation or case, single spaces.
+
+    Args:
+        name (str): A name or query (e.g., "Ja'Marr Chase").
+
+    Returns:
+        str: The normalized name (e.g., 'jamarr chase').
+    """
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode()
+    name = re.sub(r"['.]", '', name.lower())  # "Ja'Marr" and "A.J." are searched as written without them
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name).split())
+
+class NameIndex:
+    """
+    Prefix and fuzzy search over player names.
+
+    Every name is stored under its full normalized form and under each of its
+    word-start suffixes ('patrick mahomes', 'mahomes'), in one sorted list, so
+    a prefix lookup is a binary search followed by a short scan. Queries with
+    no prefix match fall back to difflib's closest names.
+    """
+    def __init__(self, player_info):
+        """
+        Args:
+            player_info (pd.DataFrame): Player information with 'gsis_id', 'name', 'position' and 'team' columns.
+        """
+        # Every named row is searchable, including players without a gsis_id (who cannot be profiled)
+        self.player_info = player_info[player_info['name'].notna()].reset_index(drop=True)
+        self.names = [normalize_name(name) for name in self.player_info['name']]
+        self._positions = self.player_info['position'].astype(object).to_numpy()
+        self._teams = self.player_info['team'].astype(object).to_numpy()
+
+        entries = []
+        self._rows_by_name = {}
+        for row, name in enumerate(self.names):
+            self._rows_by_name.setdefault(name, []).append(row)
+            tokens = name.split()
+            entries.extend((' '.join(tokens[start:]), row) for start in range(len(tokens)))
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._rows = [row for _, row in entries]
+        logging.info(f"Indexed {len(self.names)} player names.")
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_rows(self, prefix):
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + '\x7f')  # '\x7f' sorts after every normalized character
+        return self._rows[start:end]
+
+    def _matches(self, query):
+        # Every query word must start a word of the name, in order; 'pat mah' finds 'patrick mahomes'
+        tokens = query.split()
+        pattern = re.compile(r'\b' + r'.*\b'.join(re.escape(token) for token in tokens))
+        exact, full_prefix, word_prefix = [], [], []
+        for row in dict.fromkeys(self._prefix_rows(tokens[0])):
+            name = self.names[row]
+            if name == query:
+                exact.append(row)
+            elif name.startswith(query):
+                full_prefix.append(row)
+            elif pattern.search(name):
+                word_prefix.append(row)
+        return exact + sorted(full_prefix, key=self.names.__getitem__) + sorted(word_prefix, key=self.names.__getitem__)
+
+    def _fuzzy_rows(self, query, count):
+        close = difflib.get_close_matches(query, self._rows_by_name, n=count, cutoff=0.6)
+        return [row for name in close for row in self._rows_by_name[name]]
+
+    def search(self, query, position=None, team=None, limit=DEFAULT_LIMIT):
+        """
+        Find players by name, best matches first.
+
+        Exact names rank first, then names starting with the query, then names with
+        a later word starting with it (e.g., a last name). Misspelled queries that
+        match nothing fall back to the closest names.
+
+        Args:
+            query (str): Full or partial name (e.g., 'mahomes', 'pat mah').
+            position (str): Only return players at this position (e.g., 'QB'). Default is None.
+            team (str): Only return players on this team (e.g., 'KC'). Default is None.
+            limit (int): Maximum number of players returned, or None for every match. Default is DEFAULT_LIMIT.
+
+        Returns:
+            pd.DataFrame: Matching rows of player info, best first.
+        """
+        query = normalize_name(query)
+        if not query:
+            raise ValueError("Search query is empty.")
+
+        keep = np.ones(len(self.names), dtype=bool)
+        if position is not None:
+            keep &= self._positions == position.upper()
+        if team is not None:
+            keep &= self._teams == team.upper()
+
+        rows = [row for row in self._matches(query) if keep[row]]
+        if not rows:
+            rows = [row for row in self._fuzzy_rows(query, 5 * (limit or DEFAULT_LIMIT)) if keep[row]]
+        return self.player_info.iloc[rows[:limit]]
@@ -0,0 +1,202 @@
+import pandas as pd
+import logging
+from profiles import PROFILE_CLASSES
+from metric_registry import band_table, score_table
+from metrics_utils import BOOTSTRAP_CONFIDENCE, BOOTSTRAP_RESAMPLES
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class PlayerIndex:
+    """
+    Shared, read-only lookup of player metadata and stats rows keyed by gsis_id.
+
+    Lookups resolve a player to a row position through a dictionary, so they cost
+    O(1) instead of a boolean-mask scan, and rows are returned as slices of the
+    indexed tables rather than copies. Callers must not modify what they get back.
+    """
+    def __init__(self, player_info, stats_by_position=None):
+        """
+        Args:
+            player_info (pd.DataFrame): Player information with a 'gsis_id' column.
+            stats_by_position (dict): Processed stats tables keyed by position (e.g., 'QB').
+        """
+        # Players without an ID can never be looked up; repeated IDs resolve to their first row
+        self.player_info = player_info[player_info['gsis_id'].notna()].reset_index(drop=True)
+        self._info_rows = {}
+        for row, player_id in enumerate(self.player_info['gsis_id']):
+            self._info_rows.setdefault(player_id, row)
+
+        self.stats = {}
+        self.scores = {}
+        self.bands = {}  # position -> (low, high) tables, only for positions given to `add_bands`
+        self._stats_rows = {}
+        self._latest_rows = {}
+        for position, stats in (stats_by_position or {}).items():
+            self.add_stats(position, stats)
+
+    def add_stats(self, position, stats):
+        """
+        Index a position's processed stats table, which may span several seasons.
+
+        Args:
+            position (str): The position of the table (e.g., 'QB').
+            stats (pd.DataFrame): Processed stats with 'player_id' and 'season' columns.
+        """
+        self.stats[position] = stats
+        self.scores[position] = score_table(stats, position)  # Displayed scores, row-aligned with `stats`
+        self.bands.pop(position, None)  # Bands of a replaced table no longer line up
+        rows = {}
+        latest = {}  # player_id -> (season, row) of the player's most recent season
+        for row, (player_id, season) in enumerate(zip(stats['player_id'], stats['season'])):
+            rows.setdefault((player_id, season), row)
+            if player_id not in latest or season > latest[player_id][0]:
+                latest[player_id] = (season, row)
+        self._stats_rows[position] = rows
+        self._latest_rows[position] = {player_id: row for player_id, (_, row) in latest.items()}
+        logging.info(f"Indexed {len(latest)} {position} players across {len(rows)} player-seasons.")
+
+    def __contains__(self, player_id):
+        return player_id in self._info_rows
+
+    def metadata(self, player_id):
+        """
+        Get a player's information row.
+
+        Args:
+            player_id (str): The player's gsis_id.
+
+        Returns:
+            pd.Series: The player's metadata.
+        """
+        if player_id not in self._info_rows:
+            raise KeyError(f"Unknown player ID: {player_id}")
+        return self.player_info.iloc[self._info_rows[player_id]]
+
+    def position(self, player_id):
+        """
+        Get a player's position.
+
+        Args:
+            player_id (str): The player's gsis_id.
+
+        Returns:
+            str: The player's position (e.g., 'QB').
+        """
+        return self.metadata(player_id)['position']
+
+    def _row(self, player_id, position, season):
+        if position not in self._stats_rows:
+            raise KeyError(f"No stats indexed for position: {position}")
+
+        if season is None:
+            row = self._latest_rows[position].get(player_id)
+        else:
+            row = self._stats_rows[position].get((player_id, season))
+        if row is None:
+            raise KeyError(f"No {position} stats for player ID: {player_id}" + (f" in {season}" if season else ""))
+        return row
+
+    def has_stats(self, player_id, season=None):
+        """
+        Check whether a player has an indexed stats row.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            season (int): The season to look up. Default is None (any indexed season).
+
+        Returns:
+            bool: True if the player's position table has a row for the player (and season).
+        """
+        if player_id not in self._info_rows:
+            return False
+        position = self.position(player_id)
+        if position not in self._stats_rows:
+            return False
+        if season is None:
+            return player_id in self._latest_rows[position]
+        return (player_id, season) in self._stats_rows[position]
+
+    def stats_row(self, player_id, position=None, season=None):
+        """
+        Get a player's processed stats as a one-row slice of the position table.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            position (str): The position table to look in. Default is the player's position.
+            season (int): The season to look up. Default is None (the player's latest season).
+
+        Returns:
+            pd.DataFrame: The player's stats row.
+        """
+        position = position or self.position(player_id)
+        row = self._row(player_id, position, season)
+        return self.stats[position].iloc[row:row + 1]
+
+    def scores_row(self, player_id, position=None, season=None):
+        """
+        Get a player's displayed metric scores, one per registry metric of the position.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            position (str): The position table to look in. Default is the player's position.
+            season (int): The season to look up. Default is None (the player's latest season).
+
+        Returns:
+            np.ndarray: The player's row of the position's score table (a view; do not modify).
+        """
+        position = position or self.position(player_id)
+        return self.scores[position][self._row(player_id, position, season)]
+
+    def add_bands(self, position, n_resamples=BOOTSTRAP_RESAMPLES, confidence=BOOTSTRAP_CONFIDENCE, seed=None):
+        """
+        Compute bootstrap bands around every score of an indexed position table.
+
+        The table must hold the raw metric columns and the qualifying stat
+        (e.g., loaded with `profile_columns(position, include_stats=True)`).
+
+        Args:
+            position (str): The position of the table (e.g., 'QB').
+            n_resamples (int): Bootstrap resamples. Default is BOOTSTRAP_RESAMPLES.
+            confidence (float): Coverage of the bands, between 0 and 1. Default is BOOTSTRAP_CONFIDENCE.
+            seed (int): Seed for the random generator. Default is None (unseeded).
+        """
+        if position not in self.stats:
+            raise KeyError(f"No stats indexed for position: {position}")
+        self.bands[position] = band_table(self.stats[position], position, n_resamples, confidence, seed)
+
+    def bands_row(self, player_id, position=None, season=None):
+        """
+        Get a player's bootstrap bands, one (low, high) pair of scores per registry metric.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            position (str): The position table to look in. Default is the player's position.
+            season (int): The season to look up. Default is None (the player's latest season).
+
+        Returns:
+            tuple: (low, high) rows of the position's band tables, or None if `add_bands` was not called.
+        """
+        position = position or self.position(player_id)
+        if position not in self.bands:
+            return None
+        row = self._row(player_id, position, season)
+        low, high = self.bands[position]
+        return low[row], high[row]
+
+    def profile(self, player_id, season=None):
+        """
+        Build the position profile for a player from the indexed tables.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            season (int): Season to profile. Default is None (the player's latest indexed season).
+
+        Returns:
+            PlayerProfile: Profile for the player's position.
+        """
+        position = self.position(player_id)
+        profile_class = PROFILE_CLASSES.get(position)
+        if profile_class is None:
+            raise ValueError(f"Unsupported position: {position}")
+        return profile_class.from_index(self, player_id, season)
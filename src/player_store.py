@@ -0,0 +1,295 @@
+import sqlite3
+import pandas as pd
+import logging
+from instrumentation import span
+from schema import optimize_dtypes
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Default location of the SQLite store of processed player-seasons
+STORE_PATH = './data/players.db'
+
+# Columns every stored row has, created with the table so they can be indexed up front
+KEY_COLUMNS = {'gsis_id': 'TEXT', 'player_id': 'TEXT', 'position': 'TEXT', 'team': 'TEXT', 'season': 'INTEGER'}
+
+# Indexes serving point lookups and the common filters
+INDEXES = {
+    'idx_player_seasons_gsis_id': ['gsis_id'],
+    'idx_player_seasons_season': ['season'],
+    'idx_player_seasons_position': ['position', 'season'],
+    'idx_player_seasons_team': ['team']
+}
+
+def sql_type(dtype):
+    """
+    Map a pandas dtype to the SQLite column type it is stored as.
+
+    Args:
+        dtype: A pandas or NumPy dtype.
+
+    Returns:
+        str: 'INTEGER', 'REAL' or 'TEXT'.
+    """
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+def quote(column):
+    """
+    Quote a column name for use in SQL.
+
+    Args:
+        column (str): The column name.
+
+    Returns:
+        str: The name as a quoted SQLite identifier.
+    """
+    return '"' + column.replace('"', '""') + '"'
+
+class PlayerStore:
+    """
+    Indexed SQLite store of processed player-seasons, with a query API returning DataFrames.
+
+    Every position and season lives in one `player_seasons` table, indexed on
+    gsis_id, season, position and team, so a point lookup or a filtered scan reads
+    only the matching rows instead of whole processed tables. Columns are added
+    as new ones are saved; `store_columns` remembers each position's own columns
+    and their order, so loads return the same columns as the Parquet tables.
+    Uses only the standard library's sqlite3.
+    """
+    def __init__(self, path=STORE_PATH):
+        """
+        Args:
+            path (str): SQLite database file, created if missing. Default is './data/players.db'.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            columns = ', '.join(f'{quote(column)} {column_type}' for column, column_type in KEY_COLUMNS.items())
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS player_seasons ({columns})')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS store_columns (position TEXT, name TEXT, ordinal INTEGER, PRIMARY KEY (position, name))'
+            )
+            for name, indexed in INDEXES.items():
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS {name} ON player_seasons ({", ".join(map(quote, indexed))})')
+        self._columns = self._table_columns()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        self.connection.close()
+
+    def _table_columns(self):
+        return [row[1] for row in self.connection.execute('PRAGMA table_info(player_seasons)')]
+
+    def _check_columns(self, columns):
+        unknown = [column for column in columns if column not in self._columns]
+        if unknown:
+            raise KeyError(f"Unknown columns in the store: {', '.join(unknown)}")
+
+    def position_columns(self, position):
+        """
+        List the columns saved for a position, in their original order.
+
+        Args:
+            position (str): The position (e.g., 'WR').
+
+        Returns:
+            list: Column names, empty if nothing was saved for the position.
+        """
+        rows = self.connection.execute('SELECT name FROM store_columns WHERE position = ? ORDER BY ordinal', (position,))
+        return [name for name, in rows]
+
+    def seasons(self, position=None):
+        """
+        List the seasons in the store.
+
+        Args:
+            position (str): Only list seasons with rows for this position. Default is None (any position).
+
+        Returns:
+            list: Sorted seasons.
+        """
+        if position is None:
+            rows = self.connection.execute('SELECT DISTINCT season FROM player_seasons ORDER BY season')
+        else:
+            rows = self.connection.execute('SELECT DISTINCT season FROM player_seasons WHERE position = ? ORDER BY season', (position,))
+        return [season for season, in rows]
+
+    def save(self, data, position, season):
+        """
+        Replace a position's rows for a season with a processed table, in one transaction.
+
+        Args:
+            data (pd.DataFrame): Processed data for the position and season.
+            position (str): The position of the table (e.g., 'QB').
+            season (int): The season of the table (e.g., 2024).
+        """
+        data = data.assign(position=position, season=season)
+        with span('store.save', rows_in=len(data)) as stage, self.connection:
+            self._add_columns(data)
+            self.connection.execute('DELETE FROM store_columns WHERE position = ?', (position,))
+            self.connection.executemany(
+                'INSERT INTO store_columns (position, name, ordinal) VALUES (?, ?, ?)',
+                [(position, column, ordinal) for ordinal, column in enumerate(data.columns)]
+            )
+
+            self.connection.execute('DELETE FROM player_seasons WHERE position = ? AND season = ?', (position, int(season)))
+            self._insert(data)
+            stage.rows_out = len(data)
+        logging.info(f"Stored {len(data)} {season} {position} rows in {self.path}.")
+
+    def update(self, data, position, season):
+        """
+        Rewrite the stored rows of some of a position's players for a season, in one transaction.
+
+        Players not in `data` keep their stored rows untouched, so after an incremental
+        update only the rows that changed are written. Stored players are updated in
+        place, keeping their order, and players new to the season are appended.
+
+        Args:
+            data (pd.DataFrame): Processed rows of the players to write, with a 'player_id' column.
+            position (str): The position of the rows (e.g., 'QB').
+            season (int): The season of the rows (e.g., 2024).
+        """
+        data = data.assign(position=position, season=season)
+        with span('store.update', rows_in=len(data)) as stage, self.connection:
+            self._add_columns(data)
+            stored = {
+                player_id for player_id, in self.connection.execute(
+                    'SELECT player_id FROM player_seasons WHERE position = ? AND season = ?', (position, int(season))
+                )
+            }
+            is_stored = data['player_id'].isin(stored).to_numpy()
+
+            columns = [column for column in data.columns if column not in ('player_id', 'position', 'season')]
+            rows = data[columns + ['player_id', 'position', 'season']][is_stored]
+            self.connection.executemany(
+                f'UPDATE player_seasons SET {", ".join(f"{quote(column)} = ?" for column in columns)} '
+                'WHERE player_id = ? AND position = ? AND season = ?',
+                rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+            )
+            self._insert(data[~is_stored])
+            stage.rows_out = len(data)
+        logging.info(f"Updated {len(data)} {season} {position} rows in {self.path}.")
+
+    def _add_columns(self, data):
+        for column in data.columns:
+            if column not in self._columns:
+                self.connection.execute(f'ALTER TABLE player_seasons ADD COLUMN {quote(column)} {sql_type(data[column].dtype)}')
+                self._columns.append(column)
+
+    def _insert(self, data):
+        # Python objects with None for missing values, which sqlite3 stores as NULL
+        rows = data.astype(object).where(data.notna(), None)
+        self.connection.executemany(
+            f'INSERT INTO player_seasons ({", ".join(map(quote, data.columns))}) VALUES ({", ".join("?" * len(data.columns))})',
+            rows.itertuples(index=False, name=None)
+        )
+
+    def query(self, position=None, seasons=None, since=None, team=None, player_id=None, min_values=None,
+              columns=None, order_by=None, ascending=True, limit=None):
+        """
+        Select player-seasons matching every given filter.
+
+        For example, every WR on CHI with at least 60 targets since 2018:
+            store.query('WR', since=2018, team='CHI', min_values={'targets': 60})
+
+        Args:
+            position (str): Only rows for this position (e.g., 'WR'). Default is None (every position).
+            seasons (list): Only rows for these seasons. Default is None (every season).
+            since (int): Only rows for this season or later. Default is None.
+            team (str): Only rows for this team (e.g., 'CHI'). Default is None.
+            player_id (str): Only rows for this gsis_id. Default is None.
+            min_values (dict): Column -> minimum value each row must reach (e.g., {'targets': 60}). Default is None.
+            columns (list): Columns to return. Default is None (the position's columns, or every column).
+            order_by (str): Column to sort by. Default is None (season, then the order rows were saved in).
+            ascending (bool): Sort `order_by` from low to high. Default is True.
+            limit (int): Maximum rows returned. Default is None (no limit).
+
+        Returns:
+            pd.DataFrame: The matching rows, with the processed tables' compact dtypes.
+        """
+        if columns is None:
+            columns = self.position_columns(position) if position is not None else list(self._columns)
+        min_values = min_values or {}
+        self._check_columns(list(columns) + list(min_values) + ([order_by] if order_by else []))
+
+        conditions, params = [], []
+        if position is not None:
+            conditions.append('position = ?')
+            params.append(position.upper())
+        if seasons is not None:
+            conditions.append(f'season IN ({", ".join("?" * len(seasons))})')
+            params.extend(int(season) for season in seasons)
+        if since is not None:
+            conditions.append('season >= ?')
+            params.append(int(since))
+        if team is not None:
+            conditions.append('team = ?')
+            params.append(team.upper())
+        if player_id is not None:
+            conditions.append('gsis_id = ?')
+            params.append(player_id)
+        for column, minimum in min_values.items():
+            conditions.append(f'{quote(column)} >= ?')
+            params.append(minimum)
+
+        sql = f'SELECT {", ".join(map(quote, columns))} FROM player_seasons'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += f' ORDER BY {quote(order_by)} {"ASC" if ascending else "DESC"}' if order_by else ' ORDER BY season, rowid'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+
+        with span('store.query') as stage:
+            data = pd.read_sql_query(sql, self.connection, params=params)
+            stage.rows_out = len(data)
+        return optimize_dtypes(data)
+
+    def load(self, position, seasons=None, columns=None):
+        """
+        Load a position's processed data for one or more seasons, as `load_processed` does.
+
+        Args:
+            position (str): The position to load (e.g., 'QB').
+            seasons (list): Seasons to load. Default is None (every stored season).
+            columns (list): Columns to read. Default is None (all of the position's columns).
+
+        Returns:
+            pd.DataFrame: Processed data for the seasons, in season order.
+        """
+        data = self.query(position, seasons=seasons, columns=columns)
+        if data.empty:
+            logging.error(f"No stored {position} data found for seasons: {seasons}")
+        return data
+
+    def player(self, player_id, seasons=None, columns=None):
+        """
+        Look up a player's processed rows through the gsis_id index.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            seasons (list): Seasons to look up. Default is None (every stored season).
+            columns (list): Columns to return. Default is None (the player's position's columns).
+
+        Returns:
+            pd.DataFrame: The player's rows, in season order (empty if the player is not stored).
+        """
+        if columns is None:
+            row = self.connection.execute('SELECT position FROM player_seasons WHERE gsis_id = ? LIMIT 1', (player_id,)).fetchone()
+            if row is None:
+                return pd.DataFrame()
+            columns = self.position_columns(row[0])
+        return self.query(seasons=seasons, player_id=player_id, columns=columns)
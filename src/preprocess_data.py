@@ -1,6 +1,13 @@
+import numpy as np
 import pandas as pd
 import os
+import json
+import time
 import logging
+from metric_registry import qualifications, percentile_stats, compile_metrics, rank_metrics
+from storage import DEFAULT_FORMAT, DEFAULT_COMPRESSION, save_table, load_table, save_snapshot, load_snapshot
+from instrumentation import span
+from schema import optimize_dtypes
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -8,6 +15,12 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Directory for saving processed data
 PROCESSED_DATA_DIR = './data/processed/'
 
+# Player info columns kept for profiles; loaders can project to just these
+PLAYER_INFO_COLUMNS = ['gsis_id', 'name', 'position', 'team', 'height', 'weight', 'age', 'college']
+
+# Raw seasonal rows merged and routed to positions at once while preprocessing
+CHUNK_ROWS = 50_000
+
 def ensure_directory_exists(filepath):
     """
     Ensure the directory for the given filepath exists.
@@ -18,22 +31,18 @@ def ensure_directory_exists(filepath):
     """
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-def load_raw_data(filepath):
+def load_raw_data(filepath, columns=None):
     """
-    Load raw data from a CSV file.
+    Load raw data from a Parquet or CSV file, applying the compact dtype schema.
     
     Args:
-        filepath (str): Path to the CSV file.
+        filepath (str): Path to the file. Without an extension, Parquet is preferred over CSV.
+        columns (list): Columns to read. Default is None (all columns).
         
     Returns:
         pd.DataFrame: Loaded data as a DataFrame.
     """
-    try:
-        logging.info(f"Loading data from {filepath}...")
-        return pd.read_csv(filepath)
-    except FileNotFoundError:
-        logging.error(f"File not found: {filepath}")
-        return pd.DataFrame()
+    return optimize_dtypes(load_table(filepath, columns))
 
 def filter_player_info(player_info):
     """
@@ -45,8 +54,7 @@ def filter_player_info(player_info):
     Returns:
         pd.DataFrame: Filtered player info including only QB, RB, WR, and TE positions.
     """
-    relevant_columns = ['gsis_id', 'name', 'position', 'team', 'height', 'weight', 'age', 'college']
-    return player_info[relevant_columns][player_info['position'].isin(['QB', 'RB', 'WR', 'TE'])].reset_index(drop=True)
+    return player_info[PLAYER_INFO_COLUMNS][player_info['position'].isin(['QB', 'RB', 'WR', 'TE'])].reset_index(drop=True)
 
 def merge_data(seasonal_data, player_info):
     """
@@ -78,38 +86,389 @@ def filter_qualifying_players(data, position, qualifying_stat, min_attempts):
     non_qualifying = data[(data['position'] == position) & (data[qualifying_stat] < min_attempts)]
     return qualifying, non_qualifying
 
-def preprocess_and_save(seasonal_data, player_info):
+def profile_columns(position, include_stats=False):
+    """
+    List the processed columns a position's profiles read, for column projection on load.
+
+    Args:
+        position (str): The position (e.g., 'QB').
+        include_stats (bool): Also include the raw stats, which `rank_pool` needs to re-rank
+            a multi-season pool. Default is False.
+
+    Returns:
+        list: Column names, without duplicates.
+    """
+    columns = ['player_id', 'season'] + [f'{stat}_percentile' for stat in percentile_stats[position]]
+    if include_stats:
+        columns += percentile_stats[position] + [qualifications[position]['stat']]
+    return list(dict.fromkeys(columns))
+
+def processed_path(position, season):
+    """
+    Build the path of a processed table, partitioned by season and position.
+
+    Args:
+        position (str): The position of the table (e.g., 'QB').
+        season (int): The season of the table (e.g., 2024).
+
+    Returns:
+        str: Path to the table without a file extension.
+    """
+    return f"{PROCESSED_DATA_DIR}season={int(season)}/{position.lower()}_data"
+
+def applied_weeks_path(season):
+    """
+    Path of the log of weeks applied to a season's processed data by weekly ingestion.
+
+    Args:
+        season (int): The season (e.g., 2024).
+
+    Returns:
+        str: Path to the log file.
+    """
+    return f"{PROCESSED_DATA_DIR}season={int(season)}/_weeks.json"
+
+def processed_seasons():
+    """
+    List the seasons that already have processed data.
+
+    Returns:
+        list: Seasons with a processed partition, in ascending order.
+    """
+    if not os.path.isdir(PROCESSED_DATA_DIR):
+        return []
+    return sorted(
+        int(entry.split('=', 1)[1]) for entry in os.listdir(PROCESSED_DATA_DIR)
+        if entry.startswith('season=') and entry.split('=', 1)[1].isdigit()
+    )
+
+def manifest_path():
+    """
+    Path of the manifest that is rewritten every time processed data is regenerated.
+
+    Returns:
+        str: Path to the manifest file.
+    """
+    return f"{PROCESSED_DATA_DIR}_manifest.json"
+
+def write_manifest(updated_seasons):
+    """
+    Record that processed data was regenerated, so long-running readers can invalidate caches.
+
+    Args:
+        updated_seasons (list): Seasons that were just processed.
+    """
+    with open(manifest_path(), 'w') as f:
+        json.dump({'updated_at': time.time(), 'updated_seasons': updated_seasons, 'seasons': processed_seasons()}, f)
+
+def data_version():
+    """
+    Get a cheap version stamp for the processed data.
+
+    Returns:
+        int or None: Modification time of the manifest in nanoseconds, or None if none exists.
+    """
+    try:
+        return os.stat(manifest_path()).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def load_processed(position, seasons=None, columns=None):
+    """
+    Load a position's processed data for one or more seasons.
+
+    Only the requested season partitions are read, so the full history never
+    has to be in memory at once.
+
+    Args:
+        position (str): The position to load (e.g., 'QB').
+        seasons (list): Seasons to load. Default is None (every processed season).
+        columns (list): Columns to read. Default is None (all columns).
+
+    Returns:
+        pd.DataFrame: Processed data for the seasons, in season order. Without any, an empty
+            frame with the requested columns (or the columns profiles read).
+    """
+    seasons = processed_seasons() if seasons is None else sorted(seasons)
+    partitions = [load_table(processed_path(position, season), columns) for season in seasons]
+    partitions = [partition for partition in partitions if not partition.empty]
+    if not partitions:
+        logging.error(f"No processed {position} data found for seasons: {seasons}")
+        # Keep the schema so callers can index and score an empty position
+        return pd.DataFrame(columns=columns or profile_columns(position))
+    # Categories differ between seasons, so restore the compact dtypes after combining
+    return optimize_dtypes(pd.concat(partitions, ignore_index=True))
+
+def save_processed(data, position, season, file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION, store=None):
+    """
+    Save a position's processed table for a season, along with its memory-mappable numeric snapshot.
+
+    Args:
+        data (pd.DataFrame): Processed data for the position and season.
+        position (str): The position of the table (e.g., 'QB').
+        season (int): The season of the table (e.g., 2024).
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        store (PlayerStore): SQLite store to also save the table to. Default is None.
+
+    Returns:
+        str: Path the table was written to.
+    """
+    output_path = save_table(data, processed_path(position, season), file_format, compression)
+    save_snapshot(data, processed_path(position, season))
+    if store is not None:
+        store.save(data, position, season)
+    return output_path
+
+def populate_store(store, seasons=None):
+    """
+    Copy processed tables that are missing from a SQLite store into it.
+
+    Args:
+        store (PlayerStore): The store to fill.
+        seasons (list): Seasons to copy. Default is None (every processed season).
+
+    Returns:
+        list: (position, season) pairs that were copied.
+    """
+    copied = []
+    for season in processed_seasons() if seasons is None else sorted(seasons):
+        for position in qualifications:
+            if season in store.seasons(position):
+                continue
+            data = load_table(processed_path(position, season))
+            if not data.empty:
+                store.save(optimize_dtypes(data), position, season)
+                copied.append((position, season))
+    return copied
+
+def load_processed_snapshot(position, season, columns=None):
+    """
+    Load a position's processed data for one season from its memory-mapped snapshot.
+
+    The numeric columns are read-only float64 views of the mapped file, so worker
+    processes share one copy of the data through the page cache and load it almost
+    instantly. Callers must not modify the result. Falls back to `load_processed`
+    when the season has no snapshot or a requested column is not numeric.
+
+    Args:
+        position (str): The position to load (e.g., 'QB').
+        season (int): The season to load.
+        columns (list): Columns to read. Default is None (all snapshot columns).
+
+    Returns:
+        pd.DataFrame: Processed data for the season.
+    """
+    snapshot = load_snapshot(processed_path(position, season), columns)
+    if snapshot is None:
+        return load_processed(position, [season], columns)
+    return snapshot
+
+def rank_pool(data, position):
+    """
+    Re-rank a multi-season pool so percentiles compare players across all of its seasons.
+
+    Args:
+        data (pd.DataFrame): Processed data for a position, possibly spanning several seasons.
+        position (str): The position of the data (e.g., 'QB').
+
+    Returns:
+        pd.DataFrame: The data with its `<stat>_percentile` columns ranked against the whole pool.
+    """
+    return rank_metrics(data.reset_index(drop=True), position)
+
+def iter_season_chunks(seasonal_data, chunk_rows=CHUNK_ROWS):
+    """
+    Split raw seasonal data into chunks of at most `chunk_rows` rows, in season order.
+
+    Rows keep their original order within each season, and no chunk spans two seasons.
+    A single DataFrame is already wholly in memory, so chunking it only bounds the
+    merged rows built from it; an iterable is consumed one frame at a time, so a
+    generator of seasons (e.g., `fetch_data.iter_seasons`) also bounds the raw data held.
+
+    Args:
+        seasonal_data (pd.DataFrame or iterable): Raw seasonal data, or an iterable of
+            DataFrames (e.g., one per season) to split in turn.
+        chunk_rows (int): Maximum rows per chunk. Default is CHUNK_ROWS.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of one season's rows.
+    """
+    frames = [seasonal_data] if isinstance(seasonal_data, pd.DataFrame) else seasonal_data
+    for frame in frames:
+        for season, rows in sorted(frame.groupby('season', sort=False).indices.items()):
+            for start in range(0, len(rows), chunk_rows):
+                yield frame.take(rows[start:start + chunk_rows])
+        del frame  # Release this frame before the iterable produces the next one
+
+def join_player_info(chunk, filtered_player_info, player_lookup=None):
+    """
+    Join a chunk of raw seasonal data with player info, as `merge_data` does.
+
+    With a lookup built once by `build_player_lookup`, each chunk is joined by
+    locating its player IDs in the lookup instead of re-hashing the whole
+    player table for every chunk.
+
+    Args:
+        chunk (pd.DataFrame): Raw seasonal data.
+        filtered_player_info (pd.DataFrame): Player info from `filter_player_info`.
+        player_lookup (pd.Index): Lookup from `build_player_lookup`. Default is None (use `merge_data`).
+
+    Returns:
+        pd.DataFrame: Merged data, with the rows and columns `merge_data` would return.
+    """
+    if player_lookup is None:
+        return merge_data(chunk, filtered_player_info)
+    # Unmatched players get a missing label, so reindex fills their player info with NaN as the merge does
+    player_rows = player_lookup.get_indexer(chunk['player_id'])
+    info = filtered_player_info.reindex(player_rows).reset_index(drop=True)
+    return pd.concat([info, chunk.reset_index(drop=True)], axis=1)
+
+def build_player_lookup(filtered_player_info):
+    """
+    Index the filtered player table by gsis_id for `join_player_info`.
+
+    Args:
+        filtered_player_info (pd.DataFrame): Player info from `filter_player_info`.
+
+    Returns:
+        pd.Index or None: The gsis_ids, or None if an ID repeats (a merge would then duplicate rows).
+    """
+    player_lookup = pd.Index(filtered_player_info['gsis_id'].astype(object))
+    return player_lookup if player_lookup.is_unique else None
+
+def route_chunk(chunk, filtered_player_info, player_lookup=None):
+    """
+    Merge a chunk of raw seasonal data with player info and split it by position in one pass.
+
+    Every row gets a single routing key (position, then qualifying before
+    non-qualifying), so the chunk is sorted once and cut into contiguous groups
+    instead of being masked once per position and qualification.
+
+    Args:
+        chunk (pd.DataFrame): Raw seasonal data for one season.
+        filtered_player_info (pd.DataFrame): Player info from `filter_player_info`.
+        player_lookup (pd.Index): Lookup from `build_player_lookup`. Default is None (use `merge_data`).
+
+    Returns:
+        dict: (position, qualifies) -> the position's merged rows, in chunk order. Rows
+            without a profiled position or without a value for its qualifying stat are dropped.
+    """
+    merged = join_player_info(chunk, filtered_player_info, player_lookup)
+    positions = list(qualifications)
+    position_codes = pd.Categorical(merged['position'], categories=positions).codes
+
+    # Read each qualifying stat once and pick, per row, the one of its position
+    stats = list(dict.fromkeys(criteria['stat'] for criteria in qualifications.values()))
+    stat_values = merged[stats].to_numpy(dtype=np.float64)
+    stat_columns = np.array([stats.index(qualifications[position]['stat']) for position in positions])
+    min_attempts = np.array([qualifications[position]['min_attempts'] for position in positions], dtype=np.float64)
+    values = stat_values[np.arange(len(merged)), stat_columns[position_codes]]
+    valid = (position_codes >= 0) & ~np.isnan(values)
+
+    # Key 2 * position + 0 for qualifying rows and + 1 for the rest; a stable sort keeps chunk order in each group
+    keys = 2 * position_codes.astype(np.int64) + (values < min_attempts[position_codes])
+    rows = np.flatnonzero(valid)
+    rows = rows[np.argsort(keys[rows], kind='stable')]
+    group_keys, starts = np.unique(keys[rows], return_index=True)
+    ends = np.append(starts[1:], len(rows))
+
+    return {
+        (positions[key // 2], key % 2 == 0): merged.take(rows[start:end])
+        for key, start, end in zip(group_keys.tolist(), starts, ends)
+    }
+
+def save_season(season, routed, file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION, store=None):
+    """
+    Rank and save every position of a fully routed season.
+
+    Args:
+        season (int): The season (e.g., 2024).
+        routed (dict): (position, qualifies) -> list of routed frames from `route_chunk`.
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        store (PlayerStore): SQLite store to also save each position to. Default is None.
     """
-    Preprocess raw data for all positions, including filtering and merging.
+    for position in qualifications:
+        # Qualifying players first, then non-qualifying players, each in their original order
+        parts = routed.get((position, True), []) + routed.get((position, False), [])
+        if not parts:
+            logging.warning(f"No {position} rows in season {season}.")
+            continue
+        combined_data = pd.concat(parts, ignore_index=True)
+
+        # Materialize derived metrics and percentiles so profiles only need to look them up
+        with span('preprocess.percentiles', rows_in=len(combined_data)) as stage:
+            combined_data = compile_metrics(combined_data, position)
+            stage.rows_out = len(combined_data)
+
+        # Save processed data for each season and position
+        output_path = save_processed(combined_data, position, season, file_format, compression, store)
+        logging.info(f"Processed {season} {position} data saved to {output_path}.")
+
+    # Full season totals supersede any weeks applied incrementally
+    if os.path.exists(applied_weeks_path(season)):
+        os.remove(applied_weeks_path(season))
+
+def preprocess_and_save(seasonal_data, player_info, file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION,
+                        chunk_rows=CHUNK_ROWS, store=None):
+    """
+    Preprocess raw data for all positions, including filtering, merging and
+    ranking every profile stat against the position's qualifying players.
+
+    Raw data is streamed in chunks: each chunk is merged with the small player
+    table and routed to its positions in one pass, and each season is ranked
+    and saved to its own partition as soon as its last chunk is routed. Only
+    one season's routed rows are held at a time, however many seasons are
+    processed, and adding a season never rewrites the ones already processed.
+    Pass a generator of seasons (e.g., `fetch_data.iter_seasons`) rather than
+    one combined DataFrame to also hold only one season of raw data at a time.
     
     Args:
-        seasonal_data (pd.DataFrame): Raw seasonal data.
+        seasonal_data (pd.DataFrame or iterable): Raw seasonal data for one or more seasons, or
+            an iterable of DataFrames (e.g., one per season) in season order.
         player_info (pd.DataFrame): Player information data.
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        chunk_rows (int): Maximum raw rows merged and routed at once. Default is CHUNK_ROWS.
+        store (PlayerStore): SQLite store to also save every processed table to, for indexed
+            queries (see `player_store`). Default is None (files only).
+
+    Returns:
+        list: The seasons that were processed.
     """
-    ensure_directory_exists(PROCESSED_DATA_DIR)
+    # Never overwrite processed files with the result of a failed fetch
+    if player_info.empty:
+        logging.error("Player info is empty; keeping existing processed data.")
+        return []
     
-    # Filter and merge data
-    filtered_player_info = filter_player_info(player_info)
-    merged_data = merge_data(seasonal_data, filtered_player_info)
+    ensure_directory_exists(PROCESSED_DATA_DIR)
+    with span('preprocess.filter_player_info', rows_in=len(player_info)) as stage:
+        filtered_player_info = filter_player_info(player_info)
+        stage.rows_out = len(filtered_player_info)
+    player_lookup = build_player_lookup(filtered_player_info)
     
-    # Define position-specific qualification criteria
-    qualifications = {
-        'QB': {'stat': 'attempts', 'min_attempts': 135},
-        'RB': {'stat': 'carries', 'min_attempts': 90},
-        'WR': {'stat': 'targets', 'min_attempts': 45},
-        'TE': {'stat': 'targets', 'min_attempts': 45}
-    }
+    seasons = []
+    routed = {}
+    for chunk in iter_season_chunks(seasonal_data, chunk_rows):
+        season = int(chunk['season'].iloc[0])
+        if not seasons or season != seasons[-1]:
+            if season in seasons:
+                raise ValueError(f"Seasonal data for {season} must arrive in one run of chunks.")
+            if seasons:
+                save_season(seasons[-1], routed, file_format, compression, store)
+                routed = {}
+            seasons.append(season)
+
+        with span('preprocess.route', rows_in=len(chunk)) as stage:
+            chunk_routed = route_chunk(chunk, filtered_player_info, player_lookup)
+            for key, rows in chunk_routed.items():
+                routed.setdefault(key, []).append(rows)
+            stage.rows_out = sum(len(rows) for rows in chunk_routed.values())
+    if not seasons:
+        logging.error("Seasonal data is empty; keeping existing processed data.")
+        return []
+    save_season(seasons[-1], routed, file_format, compression, store)
     
-    # Process each position
-    for position, criteria in qualifications.items():
-        qualifying, non_qualifying = filter_qualifying_players(
-            merged_data, position, criteria['stat'], criteria['min_attempts']
-        )
-        
-        # Combine qualifying and non-qualifying players
-        combined_data = pd.concat([qualifying, non_qualifying])
-        
-        # Save processed data for each position
-        output_path = f"{PROCESSED_DATA_DIR}{position.lower()}_data.csv"
-        combined_data.to_csv(output_path, index=False)
-        logging.info(f"Processed {position} data saved to {output_path}.")
+    write_manifest(seasons)
+    return seasons
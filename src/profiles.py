@@ -1,16 +1,84 @@
-import pandas as pd
 import logging
 import metrics_utils
-from metrics_utils import calculate_percentile_from_qualifying
+from metric_registry import category_layout, group_by_category, score_table
+from instrumentation import instrumented
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class PlayerProfile:
-    def __init__(self, player_id, player_info, player_stats):
+    # Registry position whose metrics the profile shows; set by each position's subclass
+    metrics_position = None
+
+    @instrumented('profile.build')
+    def __init__(self, player_id, player_info, player_stats, season=None):
+        """
+        Build a profile from whole tables by indexing them first.
+
+        Prefer `from_index` with a shared PlayerIndex when building several
+        profiles, so the tables are indexed once.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            player_info (pd.DataFrame): Player information with a 'gsis_id' column.
+            player_stats (pd.DataFrame): Processed stats of the profile's position.
+            season (int): Season to profile. Default is None (the player's latest season).
+        """
+        from player_index import PlayerIndex
+        player_index = PlayerIndex(player_info, {self.metrics_position: player_stats})
+        self._load_from_index(player_index, player_id, season, self.metrics_position)
+
+    @classmethod
+    @instrumented('profile.build')
+    def from_index(cls, player_index, player_id, season=None):
+        """
+        Build a profile from a PlayerIndex without scanning or copying the tables.
+
+        Args:
+            player_index (PlayerIndex): Index holding player info and the position's stats.
+            player_id (str): The player's gsis_id.
+            season (int): Season to profile. Default is None (the player's latest indexed season).
+
+        Returns:
+            PlayerProfile: The player's profile.
+        """
+        profile = cls.__new__(cls)
+        profile._load_from_index(player_index, player_id, season)
+        return profile
+
+    @classmethod
+    @instrumented('profile.build')
+    def from_row(cls, player_id, row):
+        """
+        Build a profile from a single processed row that also carries the player's info.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            row (pd.DataFrame): One processed row of the profile's position, with the
+                name, position, team, age, height and weight columns.
+
+        Returns:
+            PlayerProfile: The player's profile.
+        """
+        profile = cls.__new__(cls)
+        profile._load(player_id, row.iloc[0], row, score_table(row, cls.metrics_position)[0])
+        return profile
+
+    def _load_from_index(self, player_index, player_id, season, position=None):
+        self._load(
+            player_id,
+            player_index.metadata(player_id),
+            player_index.stats_row(player_id, position, season),
+            player_index.scores_row(player_id, position, season),
+            player_index.bands_row(player_id, position, season)
+        )
+
+    def _load(self, player_id, metadata, stats, scores, bands=None):
         self.player_id = player_id
-        self.metadata = player_info[player_info['gsis_id'] == player_id].iloc[0]
-        self.stats = player_stats[player_stats['player_id'] == player_id]
-        self.all_stats = player_stats.copy()  # Create a copy to avoid shared state
+        self.metadata = metadata
+        self.stats = stats
+        self.scores = scores  # The player's row of the position's score table, in registry order
+        self.bands = bands  # (low, high) rows of the position's band tables, if the index computed them
+        self.season = int(self.stats['season'].iloc[0])
 
         self.name = self.metadata['name']
         self.position = self.metadata['position']
@@ -19,115 +87,104 @@ class PlayerProfile:
         self.height = metrics_utils.format_height(self.metadata['height'])
         self.weight = round(self.metadata['weight'])
 
-
+    @instrumented('profile.lollipop_data')
     def get_lollipop_data(self):
-        raise NotImplementedError("This method should be implemented by subclasses.")
+        if self.metrics_position is None:
+            raise NotImplementedError("Subclasses must set metrics_position.")
 
-class QBProfile(PlayerProfile):
-    def get_lollipop_data(self):
-        # Calculate necessary metrics
-        self.all_stats['passing_fantasy_points'] = metrics_utils.calculate_passing_fantasy_points(self.all_stats)
-        self.all_stats['rushing_fantasy_points'] = metrics_utils.calculate_rushing_fantasy_points(self.all_stats)
-        self.all_stats['completion_percentage'] = metrics_utils.calculate_completion_percentage(self.all_stats)
-        
-        # Get the player's row index in `self.all_stats`
-        player_row_index = self.all_stats[self.all_stats['player_id'] == self.player_id].index[0]
-
-        categories = {
-            'Fantasy Value': ['Fantasy Pts', 'Pass Pts', 'Rush Pts'],
-            'Passing': ['Pass Yds', 'Pass TDs', 'Ints', 'Cmp %', 'Pass Att'],
-            'Rushing': ['Rush Yds', 'Rush TDs', 'Rush Att']
-        }
-
-        values = {
-            'Fantasy Value': [
-                calculate_percentile_from_qualifying(self.all_stats, 'fantasy_points_ppr', 'attempts', 135).iloc[player_row_index],
-                calculate_percentile_from_qualifying(self.all_stats, 'passing_fantasy_points', 'attempts', 135).iloc[player_row_index],
-                calculate_percentile_from_qualifying(self.all_stats, 'rushing_fantasy_points', 'attempts', 135).iloc[player_row_index]
-            ],
-            'Passing': [
-                calculate_percentile_from_qualifying(self.all_stats, 'passing_yards', 'attempts', 135).iloc[player_row_index],
-                calculate_percentile_from_qualifying(self.all_stats, 'passing_tds', 'attempts', 135).iloc[player_row_index],
-                100 - calculate_percentile_from_qualifying(self.all_stats, 'interceptions', 'attempts', 135).iloc[player_row_index],
-                calculate_percentile_from_qualifying(self.all_stats, 'completion_percentage', 'attempts', 135).iloc[player_row_index],
-                calculate_percentile_from_qualifying(self.all_stats, 'attempts', 'attempts', 135).iloc[player_row_index]
-            ],
-            'Rushing': [
-                calculate_percentile_from_qualifying(self.all_stats, 'rushing_yards', 'attempts', 135).iloc[player_row_index],
-                calculate_percentile_from_qualifying(self.all_stats, 'rushing_tds', 'attempts', 135).iloc[player_row_index],
-                calculate_percentile_from_qualifying(self.all_stats, 'carries', 'attempts', 135).iloc[player_row_index]
-            ]
-        }
-
-        title = f'{self.name} 2024'
+        # Scores are already inverted where lower is better, so this only slices the row
+        categories = category_layout(self.metrics_position)
+        values = group_by_category(self.metrics_position, self.scores)
+
+        title = f'{self.name} {self.season}'
         subtitle = f'{self.position} | {self.team} | {self.height} {self.weight}LBS | Age: {self.age}'
         
         logging.info(f"Lollipop data prepared for: {self.name}")
         return categories, values, title, subtitle
 
+    def get_band_data(self):
+        """
+        Group the profile's bootstrap bands by category, as the charts take them.
 
-class RBProfile(PlayerProfile):
-    def get_lollipop_data(self):
-        
-        categories = {
-            'Fantasy Value': ['Fantasy Pts', 'Rush Pts', 'Rec Pts'],
-            'Rushing': ['Rush Yds', 'Rush TDs', 'Rush Att'],
-            'Receiving': ['Rec Yds', 'Rec TDs', 'Targets']
-        }
-        
-        values = {
-            'Fantasy Value': [
-                self.stats['fantasy_points_ppr_percentile'].iloc[0],
-                self.stats['rushing_epa_percentile'].iloc[0],
-                self.stats['receiving_epa_percentile'].iloc[0]
-            ],
-            'Rushing': [
-                self.stats['rushing_yards_percentile'].iloc[0],
-                self.stats['rushing_tds_percentile'].iloc[0],
-                self.stats['carries_percentile'].iloc[0]
-            ],
-            'Receiving': [
-                self.stats['receiving_yards_percentile'].iloc[0],
-                self.stats['receiving_tds_percentile'].iloc[0],
-                self.stats['targets_percentile'].iloc[0]
-            ]
-        }
-        
-        title = f'{self.name} 2024'
-        subtitle = f'{self.position} | {self.team} | {self.height} {self.weight}LBS | Age: {self.age}'
-        
-        logging.info(f"Lollipop data prepared for: {self.name}")
-        return categories, values, title, subtitle
+        Returns:
+            dict: Category -> list of (low, high) pairs in chart order, or None if the profile has no bands.
+        """
+        if self.bands is None:
+            return None
+        low, high = (group_by_category(self.metrics_position, row) for row in self.bands)
+        return {category: list(zip(low[category], high[category])) for category in low}
 
+def format_profile(categories, values, title, subtitle, bands=None):
+    """
+    Format lollipop data as plain text, one metric per line.
 
-class WRProfile(PlayerProfile):
-    def get_lollipop_data(self):
-        categories = {
-            'Fantasy Value': ['Fantasy Pts', 'Rec Pts'],
-            'Receiving': ['Rec Yds', 'Rec TDs', 'Targets', 'Air Yds Share']
-        }
-        
-        values = {
-            'Fantasy Value': [
-                self.stats['fantasy_points_ppr_percentile'].iloc[0],
-                self.stats['receiving_epa_percentile'].iloc[0]
-            ],
-            'Receiving': [
-                self.stats['receiving_yards_percentile'].iloc[0],
-                self.stats['receiving_tds_percentile'].iloc[0],
-                self.stats['targets_percentile'].iloc[0],
-                self.stats['air_yards_share_percentile'].iloc[0]
-            ]
-        }
-        
-        title = f'{self.name} 2024'
-        subtitle = f'{self.position} | {self.team} | {self.height} {self.weight}LBS | Age: {self.age}'
-        
-        logging.info(f"Lollipop data prepared for: {self.name}")
-        return categories, values, title, subtitle
+    Args:
+        categories (dict): Category -> metric labels, from `get_lollipop_data`.
+        values (dict): Category -> scores; missing scores may be NaN or None.
+        title (str): Title of the profile.
+        subtitle (str): Subtitle of the profile.
+        bands (dict): Category -> (low, high) pairs, from `get_band_data`, shown after each score.
+            Default is None (scores only).
+
+    Returns:
+        str: The formatted profile.
+    """
+    def score(value):
+        return '-' if value is None or value != value else round(value)
+
+    lines = [title, subtitle]
+    for category, metrics in categories.items():
+        lines.append(f"\n{category}")
+        for i, (metric, value) in enumerate(zip(metrics, values[category])):
+            line = f"  {metric:<32}{score(value):>4}"
+            if bands is not None and score(value) != '-':
+                low, high = bands[category][i]
+                line += f"  ({score(low)}-{score(high)})"
+            lines.append(line)
+    return '\n'.join(lines)
+
+class QBProfile(PlayerProfile):
+    metrics_position = 'QB'
+
+class RBProfile(PlayerProfile):
+    metrics_position = 'RB'
 
+class WRProfile(PlayerProfile):
+    metrics_position = 'WR'
 
 class TEProfile(WRProfile):
-    # Inherits get_lollipop_data from WRProfile
-    def get_lollipop_data(self):
-        return super().get_lollipop_data()
+    metrics_position = 'TE'
+
+
+# Profile class for each supported position
+PROFILE_CLASSES = {
+    'QB': QBProfile,
+    'RB': RBProfile,
+    'WR': WRProfile,
+    'TE': TEProfile
+}
+
+def profile_from_store(store, player_id, season=None):
+    """
+    Build a player's profile from one indexed lookup in a PlayerStore.
+
+    Stored rows carry the player's info and the percentiles ranked when the
+    season was preprocessed, so no other table is read.
+
+    Args:
+        store (PlayerStore): Store of processed player-seasons.
+        player_id (str): The player's gsis_id.
+        season (int): Season to profile. Default is None (the player's latest stored season).
+
+    Returns:
+        PlayerProfile: Profile for the player's position.
+    """
+    stats = store.player(player_id, [season] if season is not None else None)
+    if stats.empty:
+        raise KeyError(f"No stored stats for player ID: {player_id}" + (f" in {season}" if season else ""))
+    stats = stats.iloc[-1:]  # Rows come in season order
+
+    profile_class = PROFILE_CLASSES.get(stats['position'].iloc[0])
+    if profile_class is None:
+        raise ValueError(f"Unsupported position: {stats['position'].iloc[0]}")
+    return profile_class.from_row(player_id, stats)
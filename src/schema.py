@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import logging
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Store the rate/share columns as float32 to halve their memory (at ~7 significant digits)
+FLOAT32_RATES = False
+
+# Low-cardinality strings stored as categoricals
+CATEGORICAL_COLUMNS = ['season_type', 'position', 'team', 'college']
+
+# Count columns and their compact integer types; a season total never approaches the int16 limit
+INTEGER_COLUMNS = {
+    'season': 'int16',
+    'completions': 'int16',
+    'attempts': 'int16',
+    'passing_tds': 'int16',
+    'sack_fumbles': 'int16',
+    'sack_fumbles_lost': 'int16',
+    'passing_2pt_conversions': 'int16',
+    'carries': 'int16',
+    'rushing_tds': 'int16',
+    'rushing_2pt_conversions': 'int16',
+    'receptions': 'int16',
+    'targets': 'int16',
+    'receiving_tds': 'int16',
+    'receiving_2pt_conversions': 'int16',
+    'games': 'int16',
+    'db_season': 'int16',
+    'mfl_id': 'int32'
+}
+
+# Rate and share columns, which can be stored as float32
+RATE_COLUMNS = [
+    'pacr', 'dakota', 'racr', 'target_share', 'air_yards_share', 'wopr_x', 'tgt_sh', 'ay_sh', 'yac_sh',
+    'wopr_y', 'ry_sh', 'rtd_sh', 'rfd_sh', 'rtdfd_sh', 'dom', 'w8dom', 'yptmpa', 'ppr_sh'
+]
+
+def _fits(series, dtype):
+    # Integer casts wrap silently, so only cast complete columns whose values are in range
+    if series.isna().any():
+        return False
+    limits = np.iinfo(dtype)
+    return series.empty or (series.min() >= limits.min and series.max() <= limits.max)
+
+def optimize_dtypes(data, float32_rates=None):
+    """
+    Apply the compact dtype schema to any of its columns present in a table.
+
+    Columns the schema does not know are left unchanged, so this is safe to call
+    on raw, merged or processed tables.
+
+    Args:
+        data (pd.DataFrame): Table to convert.
+        float32_rates (bool): Store rate/share columns as float32. Default is None (use FLOAT32_RATES).
+
+    Returns:
+        pd.DataFrame: The table with compact dtypes.
+    """
+    if data.empty:
+        return data
+    float32_rates = FLOAT32_RATES if float32_rates is None else float32_rates
+
+    conversions = {}
+    for column in CATEGORICAL_COLUMNS:
+        if column in data.columns and not isinstance(data[column].dtype, pd.CategoricalDtype):
+            conversions[column] = 'category'
+
+    for column, dtype in INTEGER_COLUMNS.items():
+        if column in data.columns and data[column].dtype != dtype and _fits(data[column], dtype):
+            conversions[column] = dtype
+
+    if float32_rates:
+        for column in RATE_COLUMNS:
+            if column in data.columns and data[column].dtype == np.float64:
+                conversions[column] = np.float32
+
+    return data.astype(conversions) if conversions else data
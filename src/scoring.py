@@ -0,0 +1,195 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+from metrics_utils import rank_percentiles_by_column
+from metric_registry import qualifications
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Seasonal stats a scoring configuration can award points for
+SCORING_STATS = [
+    'passing_yards', 'passing_tds', 'interceptions', 'passing_2pt_conversions', 'sack_fumbles_lost',
+    'rushing_yards', 'rushing_tds', 'rushing_2pt_conversions', 'rushing_fumbles_lost',
+    'receptions', 'receiving_yards', 'receiving_tds', 'receiving_2pt_conversions', 'receiving_fumbles_lost',
+    'special_teams_tds'
+]
+
+# Standard scoring; reproduces the upstream `fantasy_points` column exactly
+STANDARD_SCORING = {
+    'passing_yards': 0.04, 'passing_tds': 4, 'interceptions': -2, 'passing_2pt_conversions': 2,
+    'sack_fumbles_lost': -2, 'rushing_yards': 0.1, 'rushing_tds': 6, 'rushing_2pt_conversions': 2,
+    'rushing_fumbles_lost': -2, 'receiving_yards': 0.1, 'receiving_tds': 6, 'receiving_2pt_conversions': 2,
+    'receiving_fumbles_lost': -2, 'special_teams_tds': 6
+}
+
+# Registry metric whose values and percentile follow a league's scoring in its profiles
+FANTASY_POINTS_METRIC = 'fantasy_points_ppr'
+
+# Named scoring configurations. A configuration maps stats to points and may add
+# per-position points under 'position_bonuses' (e.g., a TE premium per reception).
+SCORING_PRESETS = {
+    'standard': STANDARD_SCORING,
+    'half_ppr': {**STANDARD_SCORING, 'receptions': 0.5},
+    'ppr': {**STANDARD_SCORING, 'receptions': 1},
+    'ppr_6pt_pass_td': {**STANDARD_SCORING, 'receptions': 1, 'passing_tds': 6},
+    'ppr_te_premium': {**STANDARD_SCORING, 'receptions': 1, 'position_bonuses': {'TE': {'receptions': 0.5}}}
+}
+
+def load_scoring_configs(source):
+    """
+    Load scoring configurations by preset name or from a JSON file.
+
+    Args:
+        source (str): A preset name (e.g., 'half_ppr') or a path to a JSON file holding
+            either one configuration or an object of configurations keyed by league name.
+
+    Returns:
+        dict: Configurations keyed by league name.
+    """
+    if source in SCORING_PRESETS:
+        return {source: SCORING_PRESETS[source]}
+
+    with open(source) as f:
+        configs = json.load(f)
+    # A single configuration maps stats to numbers; name it after the file
+    if all(not isinstance(value, dict) for key, value in configs.items() if key != 'position_bonuses'):
+        configs = {source: configs}
+    logging.info(f"Loaded {len(configs)} scoring configurations from {source}.")
+    return configs
+
+def scoring_features(configs):
+    """
+    List the features the configurations score: every scoring stat, then each position bonus.
+
+    Args:
+        configs (dict): Scoring configurations keyed by league name.
+
+    Returns:
+        list: SCORING_STATS followed by (position, stat) pairs for position bonuses.
+    """
+    bonuses = set()
+    for name, config in configs.items():
+        for stat in config:
+            if stat != 'position_bonuses' and stat not in SCORING_STATS:
+                raise ValueError(f"Unknown scoring stat in {name}: {stat}")
+        for position, position_points in config.get('position_bonuses', {}).items():
+            for stat in position_points:
+                if stat not in SCORING_STATS:
+                    raise ValueError(f"Unknown scoring stat in {name} {position} bonus: {stat}")
+                bonuses.add((position, stat))
+    return SCORING_STATS + sorted(bonuses)
+
+def weights_matrix(configs, features):
+    """
+    Build the weights matrix with one column of points per feature for each configuration.
+
+    Args:
+        configs (dict): Scoring configurations keyed by league name.
+        features (list): Features from `scoring_features`.
+
+    Returns:
+        np.ndarray: Weights of shape (features, leagues).
+    """
+    feature_rows = {feature: row for row, feature in enumerate(features)}
+    weights = np.zeros((len(features), len(configs)), dtype=np.float64)
+    for column, config in enumerate(configs.values()):
+        for stat, points in config.items():
+            if stat != 'position_bonuses':
+                weights[feature_rows[stat], column] = points
+        for position, position_points in config.get('position_bonuses', {}).items():
+            for stat, points in position_points.items():
+                weights[feature_rows[(position, stat)], column] = points
+    return weights
+
+def stats_matrix(data, features, position=None):
+    """
+    Build the stats matrix with one column per feature; missing stats count as zero.
+
+    Args:
+        data (pd.DataFrame): Seasonal or processed stats.
+        features (list): Features from `scoring_features`.
+        position (str): Position of every row. Default is None (read the 'position' column).
+
+    Returns:
+        np.ndarray: Stats of shape (players, features).
+    """
+    stats = np.zeros((len(data), len(features)), dtype=np.float64)
+    positions = None
+    # Position bonuses follow the scoring stats, so the stat they copy is already filled in
+    for column, feature in enumerate(features):
+        if isinstance(feature, tuple):
+            feature_position, stat = feature
+            if position is not None:
+                if position != feature_position:
+                    continue
+                stats[:, column] = stats[:, SCORING_STATS.index(stat)]
+            else:
+                if positions is None:
+                    positions = data['position'].astype(object).to_numpy()
+                stats[:, column] = np.where(positions == feature_position, stats[:, SCORING_STATS.index(stat)], 0)
+        elif feature in data.columns:
+            stats[:, column] = np.nan_to_num(data[feature].to_numpy(dtype=np.float64))
+    return stats
+
+def score_leagues(data, configs, position=None):
+    """
+    Score every player under every configuration with a single matrix product.
+
+    Args:
+        data (pd.DataFrame): Seasonal or processed stats.
+        configs (dict): Scoring configurations keyed by league name.
+        position (str): Position of every row. Default is None (read the 'position' column).
+
+    Returns:
+        pd.DataFrame: Fantasy points with one column per league, indexed like `data`.
+    """
+    features = scoring_features(configs)
+    points = stats_matrix(data, features, position) @ weights_matrix(configs, features)
+    return pd.DataFrame(points, index=data.index, columns=list(configs))
+
+def league_percentiles(data, configs, position, points=None):
+    """
+    Rank every player's points in every league against the position's qualifying players.
+
+    Args:
+        data (pd.DataFrame): A position's stats, including its qualifying stat.
+        configs (dict): Scoring configurations keyed by league name.
+        position (str): The position of the data (e.g., 'QB').
+        points (pd.DataFrame): Points from `score_leagues`, if already computed. Default is None.
+
+    Returns:
+        pd.DataFrame: Percentiles with one column per league, indexed like `data`.
+    """
+    criteria = qualifications[position]
+    if points is None:
+        points = score_leagues(data, configs, position)
+    qualifying_mask = (data[criteria['stat']] >= criteria['min_attempts']).to_numpy()
+    if not qualifying_mask.any():
+        raise ValueError(f"No qualifying players found with {criteria['stat']} >= {criteria['min_attempts']}.")
+
+    # Every league shares the qualifying players, so all leagues are ranked in one batched search
+    points = points.to_numpy()
+    percentiles = rank_percentiles_by_column(points[qualifying_mask], points)
+    return pd.DataFrame(percentiles, index=data.index, columns=list(configs))
+
+def apply_league_scoring(data, league, config, position):
+    """
+    Rescore a position table under one league's configuration for its profile charts.
+
+    Args:
+        data (pd.DataFrame): A position's stats, including SCORING_STATS and its qualifying stat.
+        league (str): Name of the league.
+        config (dict): The league's scoring configuration.
+        position (str): The position of the data (e.g., 'QB').
+
+    Returns:
+        pd.DataFrame: A copy of the data whose fantasy points metric and its percentile use the league's scoring.
+    """
+    configs = {league: config}
+    points = score_leagues(data, configs, position)
+    return data.assign(**{
+        FANTASY_POINTS_METRIC: points[league],
+        f'{FANTASY_POINTS_METRIC}_percentile': league_percentiles(data, configs, position, points)[league]
+    })
@@ -0,0 +1,281 @@
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; must be selected before pyplot is imported
+
+import argparse
+import io
+import json
+import math
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from fetch_data import PLAYER_INFO_DIR, load_raw_data
+from preprocess_data import PLAYER_INFO_COLUMNS, load_processed_snapshot, processed_seasons, data_version, profile_columns
+from lollipop_chart import get_template
+from player_index import PlayerIndex
+from profiles import PROFILE_CLASSES
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Server defaults
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+DEFAULT_CACHE_SIZE = 512  # Entries per cache (profiles and charts are cached separately)
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry when full.
+    """
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class ProfileService:
+    """
+    Serves profile data and rendered charts from tables loaded once, with LRU
+    caches that are dropped whenever the processed data is regenerated.
+    """
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        self.profiles = LRUCache(cache_size)
+        self.charts = LRUCache(cache_size)
+        self._lock = threading.Lock()  # Guards reloads and the shared chart templates
+        self._version = None
+        self._indexes = {}  # season -> PlayerIndex, loaded on first request for the season
+        self._player_info = None
+        self.reload()
+
+    def reload(self):
+        """
+        Load player info and drop every cached index, profile and chart.
+        """
+        self._version = data_version()
+        self._player_info = load_raw_data(f'{PLAYER_INFO_DIR}player_info', columns=PLAYER_INFO_COLUMNS)
+        self._indexes = {}
+        self.profiles.clear()
+        self.charts.clear()
+        logging.info("Profile service loaded processed data.")
+
+    def _check_version(self):
+        # One stat() call per request detects a regenerated dataset
+        if data_version() != self._version:
+            with self._lock:
+                if data_version() != self._version:
+                    logging.info("Processed data changed; invalidating caches.")
+                    self.reload()
+
+    @property
+    def player_info(self):
+        """
+        Player information loaded with the processed data.
+        """
+        return self._player_info
+
+    def latest_season(self):
+        """
+        Returns:
+            int: The latest processed season.
+        """
+        return self._resolve_season(None)
+
+    def player_index(self, season=None):
+        """
+        Get the index of a season's stats, loading it on first use.
+
+        Args:
+            season (int): The season. Default is None (the latest processed season).
+
+        Returns:
+            PlayerIndex: Index of player info and the season's stats.
+        """
+        self._check_version()
+        season = self._resolve_season(season)
+        with self._lock:
+            return self._index(season)
+
+    def warm(self, season=None):
+        """
+        Load a season's stats ahead of the first request for it.
+
+        Args:
+            season (int): The season. Default is None (the latest processed season).
+        """
+        self.player_index(season)
+
+    def has_stats(self, player_id, season=None):
+        """
+        Check whether a player has processed stats in a season.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            season (int): The season. Default is None (the latest processed season).
+
+        Returns:
+            bool: True if the player can be profiled in the season.
+        """
+        return self.player_index(season).has_stats(player_id, self._resolve_season(season))
+
+    def _index(self, season):
+        if season not in self._indexes:
+            self._indexes[season] = PlayerIndex(
+                self._player_info,
+                {position: load_processed_snapshot(position, season, columns=profile_columns(position)) for position in PROFILE_CLASSES}
+            )
+        return self._indexes[season]
+
+    def _resolve_season(self, season):
+        if season is not None:
+            return season
+        seasons = processed_seasons()
+        if not seasons:
+            raise KeyError("No processed seasons available")
+        return seasons[-1]
+
+    def profile(self, player_id, season=None):
+        """
+        Get a player's lollipop data.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            season (int): Season to profile. Default is None (the latest processed season).
+
+        Returns:
+            dict: JSON-ready categories, values, title and subtitle.
+        """
+        self._check_version()
+        season = self._resolve_season(season)
+        key = (player_id, season)
+        cached = self.profiles.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            categories, values, title, subtitle = self._index(season).profile(player_id, season).get_lollipop_data()
+        result = {
+            'player_id': player_id,
+            'season': season,
+            'categories': categories,
+            'values': {
+                category: [None if math.isnan(value) else float(value) for value in category_values]
+                for category, category_values in values.items()
+            },
+            'title': title,
+            'subtitle': subtitle
+        }
+        self.profiles.put(key, result)
+        return result
+
+    def chart(self, player_id, season=None):
+        """
+        Get a player's lollipop chart as PNG bytes.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            season (int): Season to profile. Default is None (the latest processed season).
+
+        Returns:
+            bytes: The rendered PNG.
+        """
+        self._check_version()
+        season = self._resolve_season(season)
+        key = (player_id, season)
+        cached = self.charts.get(key)
+        if cached is not None:
+            return cached
+
+        data = self.profile(player_id, season)
+        buffer = io.BytesIO()
+        with self._lock:
+            template = get_template(data['categories'])
+            template.update(data['values'], data['title'], data['subtitle'])
+            template.save(buffer, 'png')
+        image = buffer.getvalue()
+        self.charts.put(key, image)
+        return image
+
+class ProfileRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes `/profile/<gsis_id>` and `/chart/<gsis_id>.png` to the ProfileService.
+    """
+    service = None  # Set by `serve`
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        season = parse_qs(url.query).get('season', [None])[0]
+        try:
+            season = int(season) if season is not None else None
+            if url.path.startswith('/profile/'):
+                body = json.dumps(self.service.profile(url.path[len('/profile/'):], season)).encode()
+                self._respond(200, 'application/json', body)
+            elif url.path.startswith('/chart/') and url.path.endswith('.png'):
+                self._respond(200, 'image/png', self.service.chart(url.path[len('/chart/'):-len('.png')], season))
+            else:
+                self._error(404, f"Unknown route: {url.path}")
+        except (KeyError, IndexError) as e:
+            self._error(404, str(e.args[0]) if e.args else "Not found")
+        except ValueError as e:
+            self._error(400, str(e))
+
+    def _respond(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._respond(status, 'application/json', json.dumps({'error': message}).encode())
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Run the profile service until interrupted.
+
+    Args:
+        host (str): Interface to bind. Default is '127.0.0.1'.
+        port (int): Port to listen on. Default is 8000.
+        cache_size (int): Maximum cached profiles and charts. Default is 512.
+    """
+    ProfileRequestHandler.service = ProfileService(cache_size)
+    server = ThreadingHTTPServer((host, port), ProfileRequestHandler)
+    logging.info(f"Serving profiles on http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve player profiles and lollipop charts over HTTP.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="interface to bind")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help="maximum cached profiles and charts")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.cache_size)
@@ -0,0 +1,162 @@
+import cmd
+import os
+import shlex
+import logging
+from name_index import DEFAULT_LIMIT, NameIndex, normalize_name
+from server import ProfileService
+from profiles import format_profile
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Default directory for charts rendered in a session
+OUTPUT_DIR = './output/session/'
+
+class ProfileSession(cmd.Cmd):
+    """
+    Interactive shell that looks players up by name and prints or renders their profiles.
+
+    Player info, the name index and the latest season's stats are loaded once
+    when the session starts; profiles and charts are cached by the underlying
+    ProfileService, so repeat lookups skip straight to the cached result.
+    """
+    intro = "Fantasy Football Savant session. Type 'help' for commands, 'quit' to leave."
+    prompt = 'savant> '
+
+    def __init__(self, service=None, output_dir=OUTPUT_DIR):
+        """
+        Args:
+            service (ProfileService): Service to read profiles from. Default is None (load a new one).
+            output_dir (str): Directory charts are saved in when no path is given. Default is './output/session/'.
+        """
+        super().__init__()
+        self.service = service or ProfileService()
+        self.output_dir = output_dir
+        self.names = NameIndex(self.service.player_info)
+        self.service.warm()
+
+    @staticmethod
+    def _parse(line):
+        # Positional words form the query; key=value words are options (pos=QB team=KC season=2023 out=chart.png)
+        words, options = [], {}
+        for word in shlex.split(line):
+            key, sep, value = word.partition('=')
+            if sep and key in ('pos', 'team', 'season', 'out'):
+                options[key] = value
+            else:
+                words.append(word)
+        if 'season' in options:
+            options['season'] = int(options['season'])
+        return ' '.join(words), options
+
+    def resolve(self, query, position=None, team=None, season=None):
+        """
+        Resolve a gsis_id or player name to a single gsis_id.
+
+        When several players match, exact names win over partial ones, and among
+        those, the only one with stats in the season wins.
+
+        Args:
+            query (str): A gsis_id or full or partial name.
+            position (str): Only consider players at this position. Default is None.
+            team (str): Only consider players on this team. Default is None.
+            season (int): Season being looked up. Default is None (the latest processed season).
+
+        Returns:
+            str: The player's gsis_id.
+        """
+        if query in self.service.player_index(season):
+            return query
+        matches = self.names.search(query, position, team, limit=None)
+        matches = matches[matches['gsis_id'].notna()]
+        if matches.empty:
+            raise KeyError(f"No profiled player matches '{query}'")
+        if len(matches) == 1:
+            return matches['gsis_id'].iloc[0]
+
+        query = normalize_name(query)
+        exact = [player_id for player_id, name in zip(matches['gsis_id'], matches['name']) if normalize_name(name) == query]
+        if len(exact) == 1:
+            return exact[0]
+        with_stats = [player_id for player_id in exact or matches['gsis_id'] if self.service.has_stats(player_id, season)]
+        if len(with_stats) == 1:
+            return with_stats[0]
+        raise ValueError(
+            f"'{query}' matches several players; narrow it down with pos=, team= or a gsis_id:\n"
+            + self._format_matches(self._rank(matches, season).head(DEFAULT_LIMIT))
+        )
+
+    def _rank(self, matches, season=None):
+        # Players who can be profiled in the season come first, otherwise in match order
+        with_stats = [self.service.has_stats(player_id, season) for player_id in matches['gsis_id']]
+        return matches.iloc[sorted(range(len(matches)), key=lambda i: not with_stats[i])]
+
+    @staticmethod
+    def _format_matches(matches):
+        return '\n'.join(
+            f"  {row.gsis_id if isinstance(row.gsis_id, str) else '-':<12}{row.name:<28}"
+            f"{row.position if isinstance(row.position, str) else '':<4}{row.team if isinstance(row.team, str) else ''}"
+            for row in matches.itertuples()
+        )
+
+    def _run(self, action, line):
+        # A failed lookup prints its reason and keeps the session going
+        try:
+            action(*self._parse(line))
+        except (KeyError, IndexError) as e:
+            print(e.args[0] if e.args else e)
+        except ValueError as e:
+            print(e)
+
+    def do_find(self, line):
+        """find <name> [pos=QB] [team=KC] [season=2024]: list players whose names match, those with stats first."""
+        def find(query, options):
+            matches = self.names.search(query, options.get('pos'), options.get('team'), limit=None)
+            matches = self._rank(matches, options.get('season')).head(DEFAULT_LIMIT)
+            print(self._format_matches(matches) if not matches.empty else f"No player matches '{query}'")
+        self._run(find, line)
+
+    def do_profile(self, line):
+        """profile <name or gsis_id> [pos=QB] [team=KC] [season=2024]: print a player's profile metrics."""
+        def profile(query, options):
+            player_id = self.resolve(query, options.get('pos'), options.get('team'), options.get('season'))
+            data = self.service.profile(player_id, options.get('season'))
+            print(format_profile(data['categories'], data['values'], data['title'], data['subtitle']))
+        self._run(profile, line)
+
+    def do_render(self, line):
+        """render <name or gsis_id> [pos=QB] [team=KC] [season=2024] [out=chart.png]: save a player's chart."""
+        def render(query, options):
+            player_id = self.resolve(query, options.get('pos'), options.get('team'), options.get('season'))
+            image = self.service.chart(player_id, options.get('season'))
+            output_path = options.get('out') or os.path.join(
+                self.output_dir, f"{player_id}_{options.get('season') or self.service.latest_season()}.png"
+            )
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            with open(output_path, 'wb') as f:
+                f.write(image)
+            print(f"Saved {output_path}")
+        self._run(render, line)
+
+    def do_quit(self, line):
+        """quit: leave the session."""
+        return True
+
+    do_exit = do_quit
+
+    def do_EOF(self, line):
+        print()
+        return True
+
+    def emptyline(self):
+        pass  # Do not repeat the last command on an empty line
+
+def run_session(output_dir=OUTPUT_DIR):
+    """
+    Start an interactive session and run it until the user quits.
+
+    Args:
+        output_dir (str): Directory charts are saved in when no path is given. Default is './output/session/'.
+    """
+    logging.getLogger().setLevel(logging.WARNING)  # Keep per-lookup logging out of the shell
+    ProfileSession(output_dir=output_dir).cmdloop()
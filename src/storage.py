@@ -0,0 +1,200 @@
+import json
+import numpy as np
+import pandas as pd
+import os
+import logging
+from instrumentation import span
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Storage defaults
+DEFAULT_FORMAT = 'parquet'       # 'parquet' for columnar storage, 'csv' for exports
+DEFAULT_COMPRESSION = 'snappy'   # Parquet codec, or None for uncompressed files
+PARQUET_ENGINE = 'fastparquet'
+
+FILE_EXTENSIONS = {
+    'parquet': '.parquet',
+    'csv': '.csv'
+}
+
+def table_path(path, file_format=DEFAULT_FORMAT):
+    """
+    Build the on-disk path for a table stored in the given format.
+
+    Args:
+        path (str): Path to the table, with or without a file extension.
+        file_format (str): Storage format, 'parquet' or 'csv'.
+
+    Returns:
+        str: Path ending in the extension for the format.
+    """
+    if file_format not in FILE_EXTENSIONS:
+        raise ValueError(f"Unsupported file format: {file_format}")
+    stem, _ = os.path.splitext(path)
+    return f"{stem}{FILE_EXTENSIONS[file_format]}"
+
+def find_table(path):
+    """
+    Locate a stored table, preferring Parquet over CSV when no extension is given.
+
+    Args:
+        path (str): Path to the table, with or without a file extension.
+
+    Returns:
+        str or None: Path to the existing file, or None if no file is found.
+    """
+    if os.path.splitext(path)[1] in FILE_EXTENSIONS.values():
+        return path if os.path.exists(path) else None
+
+    for file_format in FILE_EXTENSIONS:
+        candidate = table_path(path, file_format)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def save_table(data, path, file_format=DEFAULT_FORMAT, compression=DEFAULT_COMPRESSION):
+    """
+    Save a DataFrame as a typed Parquet file or as a CSV export.
+
+    Args:
+        data (pd.DataFrame): Data to save.
+        path (str): Path to the table; the extension is set from the format.
+        file_format (str): Storage format, 'parquet' or 'csv'. Default is 'parquet'.
+        compression (str): Parquet compression codec (e.g., 'snappy', 'zstd') or None.
+
+    Returns:
+        str: Path the table was written to.
+    """
+    output_path = table_path(path, file_format)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    with span(f'storage.save_{file_format}', rows_in=len(data)):
+        if file_format == 'parquet':
+            data.to_parquet(output_path, engine=PARQUET_ENGINE, compression=compression, index=False)
+        else:
+            data.to_csv(output_path, index=False)
+
+    logging.info(f"Saved {len(data)} rows to {output_path}.")
+    return output_path
+
+def load_table(path, columns=None):
+    """
+    Load a stored table, reading only the requested columns.
+
+    Args:
+        path (str): Path to the table, with or without a file extension.
+        columns (list): Columns to read. Default is None (all columns).
+
+    Returns:
+        pd.DataFrame: Loaded data, or an empty DataFrame if no file is found.
+    """
+    source_path = find_table(path)
+    if source_path is None:
+        logging.error(f"File not found: {path}")
+        return pd.DataFrame()
+
+    logging.info(f"Loading data from {source_path}...")
+    with span('storage.load') as stage:
+        if source_path.endswith(FILE_EXTENSIONS['parquet']):
+            data = pd.read_parquet(source_path, engine=PARQUET_ENGINE, columns=columns)
+        else:
+            data = pd.read_csv(source_path, usecols=columns)
+            data = data if columns is None else data[columns]
+        stage.rows_out = len(data)
+    return data
+
+def snapshot_paths(path):
+    """
+    Build the paths of a table's numeric snapshot.
+
+    Args:
+        path (str): Path to the table, with or without a file extension.
+
+    Returns:
+        tuple: (matrix path ending in '.npy', metadata path ending in '.json')
+    """
+    stem, _ = os.path.splitext(path)
+    return f"{stem}.npy", f"{stem}.json"
+
+def save_snapshot(data, path, key_columns=('player_id', 'season')):
+    """
+    Save a table's numeric columns as one contiguous float64 matrix plus JSON metadata.
+
+    The matrix is stored column-major, so every column is a contiguous run of the
+    file and can be viewed without copying once the file is memory-mapped. The
+    key columns that identify rows are kept in the metadata with their own types.
+    Files are replaced atomically, so a reader never maps a half-written snapshot.
+
+    Args:
+        data (pd.DataFrame): Table to snapshot.
+        path (str): Path to the table; the snapshot is written next to it.
+        key_columns (tuple): Columns identifying each row. Default is ('player_id', 'season').
+
+    Returns:
+        str: Path the matrix was written to.
+    """
+    matrix_path, metadata_path = snapshot_paths(path)
+    key_columns = [column for column in key_columns if column in data.columns]
+    columns = [column for column in data.select_dtypes(include=[np.number, 'bool']).columns if column not in key_columns]
+    os.makedirs(os.path.dirname(matrix_path) or '.', exist_ok=True)
+
+    with span('storage.save_snapshot', rows_in=len(data)):
+        matrix = np.asfortranarray(data[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        with open(f'{matrix_path}.tmp', 'wb') as f:
+            np.save(f, matrix)
+        metadata = {
+            'columns': columns,
+            'keys': {column: data[column].astype(object).where(data[column].notna(), None).tolist() for column in key_columns}
+        }
+        with open(f'{metadata_path}.tmp', 'w') as f:
+            json.dump(metadata, f, default=lambda value: value.item())
+        os.replace(f'{metadata_path}.tmp', metadata_path)
+        os.replace(f'{matrix_path}.tmp', matrix_path)
+
+    logging.info(f"Saved a {matrix.shape[0]}x{matrix.shape[1]} snapshot to {matrix_path}.")
+    return matrix_path
+
+def load_snapshot(path, columns=None):
+    """
+    Memory-map a table's numeric snapshot as a read-only DataFrame without copying.
+
+    Every numeric column of the result is a float64 view of the mapped file, so
+    processes loading the same snapshot share its pages instead of each holding
+    a copy. Only the key columns are built in memory.
+
+    Args:
+        path (str): Path to the table, with or without a file extension.
+        columns (list): Columns to include, key columns among them. Default is None (all columns).
+
+    Returns:
+        pd.DataFrame or None: The requested columns, or None if there is no usable
+            snapshot or it lacks a requested column.
+    """
+    matrix_path, metadata_path = snapshot_paths(path)
+    if not os.path.exists(matrix_path) or not os.path.exists(metadata_path):
+        return None
+
+    with span('storage.load_snapshot') as stage:
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+        keys = metadata['keys']
+        matrix = np.load(matrix_path, mmap_mode='r')
+        if matrix.shape != (len(next(iter(keys.values()), [])), len(metadata['columns'])):
+            logging.warning(f"Snapshot {matrix_path} does not match its metadata; ignoring it.")
+            return None
+
+        column_numbers = {column: i for i, column in enumerate(metadata['columns'])}
+        columns = list(keys) + metadata['columns'] if columns is None else list(columns)
+        missing = [column for column in columns if column not in keys and column not in column_numbers]
+        if missing:
+            logging.info(f"Snapshot {matrix_path} lacks columns {missing}.")
+            return None
+
+        # Built from plain arrays with copy=False, each 1-D column view stays backed by the mapping
+        snapshot = pd.DataFrame({
+            column: pd.Series(keys[column]).to_numpy() if column in keys else matrix[:, column_numbers[column]]
+            for column in columns
+        }, copy=False)
+        stage.rows_out = len(snapshot)
+    return snapshot
@@ -0,0 +1,474 @@
+import bisect
+import itertools
+import json
+import logging
+import numpy as np
+import pandas as pd
+from preprocess_data import (
+    PLAYER_INFO_COLUMNS, filter_player_info, merge_data, processed_path, applied_weeks_path, load_processed,
+    save_processed, write_manifest, ensure_directory_exists
+)
+from metric_registry import qualifications, percentile_stats, derived_columns, derive_metrics
+from storage import DEFAULT_FORMAT, DEFAULT_COMPRESSION, find_table
+from instrumentation import span
+from schema import optimize_dtypes
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Seasonal columns that are plain sums of the weekly rows, so a week's rows can be added to them.
+# The team share columns (tgt_sh, dom, ...) need team totals and are left as they were.
+WEEKLY_TOTAL_COLUMNS = [
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions', 'sacks', 'sack_yards',
+    'sack_fumbles', 'sack_fumbles_lost', 'passing_air_yards', 'passing_yards_after_catch', 'passing_first_downs',
+    'passing_epa', 'passing_2pt_conversions', 'pacr', 'dakota', 'carries', 'rushing_yards', 'rushing_tds',
+    'rushing_fumbles', 'rushing_fumbles_lost', 'rushing_first_downs', 'rushing_epa', 'rushing_2pt_conversions',
+    'receptions', 'targets', 'receiving_yards', 'receiving_tds', 'receiving_fumbles', 'receiving_fumbles_lost',
+    'receiving_air_yards', 'receiving_yards_after_catch', 'receiving_first_downs', 'receiving_epa',
+    'receiving_2pt_conversions', 'racr', 'target_share', 'air_yards_share', 'wopr_x', 'special_teams_tds',
+    'fantasy_points', 'fantasy_points_ppr'
+]
+
+# Weekly columns whose seasonal counterpart has a different name
+WEEKLY_COLUMN_RENAMES = {'wopr': 'wopr_x'}
+
+# Columns of a season built from weekly data alone, before it was ever fully preprocessed;
+# each position also gets its derived metric columns
+SEASON_COLUMNS = PLAYER_INFO_COLUMNS + ['player_id', 'season', 'season_type'] + WEEKLY_TOTAL_COLUMNS + ['games']
+
+# Values per block of a qualifying distribution's blocked sorted list
+DISTRIBUTION_BLOCK_SIZE = 256
+
+class QualifyingDistribution:
+    """
+    Sorted values of one stat over a position's qualifying players.
+
+    Values are kept in a blocked sorted list: short sorted blocks and each block's
+    maximum. Moving a player's value costs a binary search over the block maxima
+    and an insert into one short block, rather than shifting the whole
+    distribution, and ranking a score costs O(log n), with ties averaged exactly as
+    `metrics_utils.rank_percentiles` does.
+    """
+    def __init__(self, values=(), block_size=DISTRIBUTION_BLOCK_SIZE):
+        """
+        Args:
+            values (array-like): Initial values; NaNs are ignored.
+            block_size (int): Values per block; a block is split once it holds twice as many.
+                Default is DISTRIBUTION_BLOCK_SIZE.
+        """
+        values = np.sort(np.asarray(values, dtype=np.float64))
+        values = values[:np.count_nonzero(~np.isnan(values))]  # NaNs sort last
+        self._block_size = block_size
+        self._blocks = [values[start:start + block_size].tolist() for start in range(0, len(values), block_size)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(values)
+        self._offsets = None  # Values before each block, rebuilt lazily after a change
+
+    def __len__(self):
+        return self._len
+
+    def add(self, value):
+        if value != value:
+            return
+        self._len += 1
+        self._offsets = None
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            return
+
+        i = min(bisect.bisect_left(self._maxes, value), len(self._blocks) - 1)
+        block = self._blocks[i]
+        bisect.insort(block, value)
+        self._maxes[i] = block[-1]
+        if len(block) > 2 * self._block_size:
+            self._blocks[i:i + 1] = [block[:self._block_size], block[self._block_size:]]
+            self._maxes[i:i + 1] = [block[self._block_size - 1], block[-1]]
+
+    def remove(self, value):
+        if value != value:
+            return
+        i = bisect.bisect_left(self._maxes, value)
+        block = self._blocks[i] if i < len(self._blocks) else []
+        j = bisect.bisect_left(block, value)
+        if j == len(block) or block[j] != value:
+            raise ValueError(f"{value} is not in the distribution")
+
+        del block[j]
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+        self._len -= 1
+        self._offsets = None
+
+    def _count(self, score, search):
+        # Values below the score (bisect_left) or at or below it (bisect_right)
+        i = search(self._maxes, score)
+        if i == len(self._blocks):
+            return self._len
+        if self._offsets is None:
+            self._offsets = [0, *itertools.accumulate(map(len, self._blocks))]
+        return self._offsets[i] + search(self._blocks[i], score)
+
+    def rank_count(self, score):
+        """
+        Count the values below a score plus those at or below it, plus one if it ties a value.
+
+        Args:
+            score (float): The score to rank (not NaN).
+
+        Returns:
+            int: The rank count; the percentile is this count times 50 / len(distribution).
+        """
+        left = self._count(score, bisect.bisect_left)
+        right = self._count(score, bisect.bisect_right)
+        return left + right + (left < right)
+
+    def percentile(self, score):
+        """
+        Rank one score against the distribution.
+
+        Args:
+            score (float): The score to rank.
+
+        Returns:
+            float: Percentile of the score (NaN for a NaN score or an empty distribution).
+        """
+        if score != score or not self._len:
+            return np.nan
+        return self.rank_count(score) * (50.0 / self._len)
+
+    def percentiles(self, scores):
+        """
+        Rank several scores against the distribution, each with its own binary searches.
+
+        Args:
+            scores (array-like): The scores to rank.
+
+        Returns:
+            np.ndarray: Percentile for each score (NaN where the score is NaN).
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if not self._len:
+            return np.full(scores.shape, np.nan)
+        counts = np.fromiter(
+            (self.rank_count(score) if score == score else 0 for score in scores.tolist()), dtype=np.float64, count=scores.size
+        )
+        percentiles = counts * (50.0 / self._len)
+        percentiles[np.isnan(scores)] = np.nan
+        return percentiles
+
+class PositionTotals:
+    """
+    A position's season totals and qualifying distributions, updated in place as weeks arrive.
+
+    Applying a week only touches the rows of players who played in it: their totals
+    and derived metrics are updated, and their old and new values are moved in each
+    stat's distribution, with players who crossed the qualifying threshold added to
+    or removed from it. Each move also records the range of scores whose rank it
+    shifts, so refreshing percentiles only re-ranks the rows in those ranges.
+    """
+    def __init__(self, position, data):
+        """
+        Args:
+            position (str): The position (e.g., 'QB').
+            data (pd.DataFrame): The position's processed data for one season.
+        """
+        self.position = position
+        self.stats = percentile_stats[position]
+        self.qualifying_stat = qualifications[position]['stat']
+        self.min_attempts = qualifications[position]['min_attempts']
+        self.data = data.reset_index(drop=True)
+        self._rows = {player_id: row for row, player_id in enumerate(self.data['player_id'])}
+
+        qualifying = self.data[self.data[self.qualifying_stat] >= self.min_attempts]
+        self.distributions = {stat: QualifyingDistribution(qualifying[stat].to_numpy(dtype=np.float64)) for stat in self.stats}
+
+        # Pending changes since the percentiles were last refreshed: per stat, the (low, high)
+        # score ranges whose rank counts moved and the pool size the stored percentiles were
+        # ranked against, plus the rows whose own values changed
+        self._shifted = {stat: [] for stat in self.stats}
+        self._ranked_sizes = {stat: len(distribution) for stat, distribution in self.distributions.items()}
+        self._moved_rows = []
+
+    def __contains__(self, player_id):
+        return player_id in self._rows
+
+    def add_players(self, rows):
+        """
+        Add players who have no totals yet, with every weekly total set to zero.
+
+        Args:
+            rows (pd.DataFrame): Merged player info rows for the new players.
+        """
+        if rows.empty:
+            return
+        rows = rows.copy()
+        for column in WEEKLY_TOTAL_COLUMNS + ['games']:
+            if column in self.data.columns:
+                rows[column] = 0
+        rows = derive_metrics(rows, self.position)
+
+        start = len(self.data)
+        rows = rows[self.data.columns.intersection(rows.columns)]
+        self.data = optimize_dtypes(rows.reset_index(drop=True) if self.data.empty else pd.concat([self.data, rows], ignore_index=True))
+        for offset, player_id in enumerate(rows['player_id']):
+            self._rows[player_id] = start + offset
+        self._moved_rows.append(np.arange(start, len(self.data)))
+
+    def apply(self, deltas):
+        """
+        Add weekly stat deltas to the totals of the players who played.
+
+        Args:
+            deltas (pd.DataFrame): Summed weekly stats indexed by player_id, for players in this table.
+
+        Returns:
+            int: Number of players whose totals changed.
+        """
+        if deltas.empty:
+            return 0
+        rows = np.fromiter((self._rows[player_id] for player_id in deltas.index), dtype=np.intp, count=len(deltas))
+        tracked = self.stats + [self.qualifying_stat]
+        before = self.data.iloc[rows][tracked].to_numpy(dtype=np.float64)
+
+        for column in deltas.columns.intersection(self.data.columns):
+            if pd.api.types.is_integer_dtype(self.data[column]) and not pd.api.types.is_integer_dtype(deltas[column]):
+                # Fractional deltas would be truncated by an integer total (e.g., one zero-filled for a new player)
+                self.data[column] = self.data[column].astype(np.float64)
+            totals = self.data[column].iloc[rows].to_numpy() + deltas[column].to_numpy()
+            self.data.iloc[rows, self.data.columns.get_loc(column)] = totals.astype(self.data[column].dtype, copy=False)
+
+        derived = derive_metrics(self.data.iloc[rows], self.position)
+        for column in derived_columns(self.position):
+            self.data.iloc[rows, self.data.columns.get_loc(column)] = derived[column].to_numpy()
+        after = self.data.iloc[rows][tracked].to_numpy(dtype=np.float64)
+
+        # Move each player's value, entering or leaving the distribution on a threshold crossing.
+        # Adding or removing a value shifts the rank counts of every score at or above it, so
+        # moving a value only shifts the scores between its old and new value.
+        qualified_before = before[:, -1] >= self.min_attempts
+        qualified_after = after[:, -1] >= self.min_attempts
+        for i, stat in enumerate(self.stats):
+            distribution = self.distributions[stat]
+            shifted = self._shifted[stat]
+            for old, new, was_qualified, is_qualified in zip(
+                before[:, i].tolist(), after[:, i].tolist(), qualified_before.tolist(), qualified_after.tolist()
+            ):
+                if was_qualified and is_qualified and old == new:
+                    continue
+                if was_qualified:
+                    distribution.remove(old)
+                if is_qualified:
+                    distribution.add(new)
+
+                # NaNs are never in the distribution, so they shift nothing
+                moved = [value for value, qualified in ((old, was_qualified), (new, is_qualified)) if qualified and value == value]
+                if len(moved) == 2:
+                    shifted.append((min(moved), max(moved)))
+                elif moved:
+                    shifted.append((moved[0], np.inf))
+        self._moved_rows.append(rows)
+        return len(rows)
+
+    def percentile(self, player_id, stat):
+        """
+        Rank one player's current total against the current distribution.
+
+        Args:
+            player_id (str): The player's gsis_id.
+            stat (str): One of the position's percentile stats.
+
+        Returns:
+            float: The player's percentile.
+        """
+        return self.distributions[stat].percentile(float(self.data[stat].iat[self._rows[player_id]]))
+
+    def refresh_percentiles(self):
+        """
+        Bring the `<stat>_percentile` columns up to date with the current distributions.
+
+        Only rows whose rank count changed are re-ranked against the distributions:
+        those with a score in a range shifted by a move, and the players whose own
+        values changed. When a stat's pool grew or shrank, every other row keeps its
+        rank count and only has its percentile rescaled to the new pool size.
+
+        Returns:
+            np.ndarray: Positions of the rows whose values or percentiles changed, in ascending order.
+        """
+        changed = np.zeros(len(self.data), dtype=bool)
+        moved = np.concatenate(self._moved_rows) if self._moved_rows else np.empty(0, dtype=np.intp)
+        changed[moved] = True
+
+        for stat in self.stats:
+            column = f'{stat}_percentile'
+            distribution = self.distributions[stat]
+            scores = self.data[stat].to_numpy(dtype=np.float64)
+            percentiles = (
+                self.data[column].to_numpy(dtype=np.float64, copy=True) if column in self.data.columns
+                else np.full(len(self.data), np.nan)
+            )
+
+            rerank = np.zeros(len(self.data), dtype=bool)
+            rerank[moved] = True
+            rerank |= in_ranges(scores, self._shifted[stat])
+            ranked_size = self._ranked_sizes[stat]
+            if len(distribution) != ranked_size:
+                if ranked_size and len(distribution):
+                    # Stored percentiles are rank counts times 50 / size, so the counts come back exactly
+                    counts = np.rint(percentiles[~rerank] * (ranked_size / 50.0))
+                    percentiles[~rerank] = counts * (50.0 / len(distribution))
+                else:
+                    rerank[:] = True
+                changed |= ~np.isnan(scores) | rerank
+            percentiles[rerank] = distribution.percentiles(scores[rerank])
+            changed |= rerank
+
+            if column in self.data.columns:
+                self.data[column] = percentiles
+            else:
+                self.data = self.data.assign(**{column: percentiles})
+            self._shifted[stat] = []
+            self._ranked_sizes[stat] = len(distribution)
+
+        self._moved_rows = []
+        return np.flatnonzero(changed)
+
+def in_ranges(values, ranges):
+    """
+    Flag the values that fall inside any of a set of closed ranges.
+
+    Args:
+        values (np.ndarray): Values to test.
+        ranges (list): (low, high) pairs, in any order and possibly overlapping.
+
+    Returns:
+        np.ndarray: Boolean mask, True where a value lies in some range (never for NaN).
+    """
+    if not ranges:
+        return np.zeros(len(values), dtype=bool)
+    # Merge the ranges so each value is found with one binary search
+    lows, highs = [], []
+    for low, high in sorted(ranges):
+        if lows and low <= highs[-1]:
+            highs[-1] = max(highs[-1], high)
+        else:
+            lows.append(low)
+            highs.append(high)
+    i = np.searchsorted(np.array(lows), values, side='right') - 1
+    return (i >= 0) & (values <= np.array(highs)[np.maximum(i, 0)])
+
+def applied_weeks(season):
+    """
+    List the weeks already applied to a season by weekly ingestion.
+
+    Args:
+        season (int): The season (e.g., 2024).
+
+    Returns:
+        list: Applied weeks, in ascending order.
+    """
+    try:
+        with open(applied_weeks_path(season)) as f:
+            return json.load(f)['weeks']
+    except FileNotFoundError:
+        return []
+
+def weekly_deltas(weekly_data):
+    """
+    Sum a batch of weekly rows into per-player season total deltas.
+
+    Args:
+        weekly_data (pd.DataFrame): Weekly player stats, one row per player and week.
+
+    Returns:
+        pd.DataFrame: Deltas of the weekly total columns and 'games', indexed by player_id.
+    """
+    weekly_data = weekly_data.rename(columns=WEEKLY_COLUMN_RENAMES)
+    columns = [column for column in WEEKLY_TOTAL_COLUMNS if column in weekly_data.columns]
+    grouped = weekly_data.groupby('player_id', observed=True, sort=False)
+    deltas = grouped[columns].sum()
+    deltas['games'] = grouped.size()
+    return deltas
+
+def ingest_weeks(season, weekly_data, player_info, season_type='REG', file_format=DEFAULT_FORMAT,
+                 compression=DEFAULT_COMPRESSION, store=None):
+    """
+    Apply one or more weeks of stats to a season's processed data.
+
+    Only the players who played in the weeks are updated, and only the rows whose
+    rank changed are re-ranked against the incrementally maintained qualifying
+    distributions. The store, if given, only rewrites the changed rows.
+    Weeks already applied since the season was last fully preprocessed are rejected.
+
+    Args:
+        season (int): The season the weeks belong to (e.g., 2024).
+        weekly_data (pd.DataFrame): Weekly player stats for the weeks to apply.
+        player_info (pd.DataFrame): Player information data, used to place new players.
+        season_type (str): Season type, e.g., 'REG' for regular season. Default is 'REG'.
+        file_format (str): Storage format, 'parquet' or 'csv' for an export. Default is 'parquet'.
+        compression (str): Parquet compression codec or None. Default is 'snappy'.
+        store (PlayerStore): SQLite store to keep in step with the processed tables. Default is None.
+
+    Returns:
+        list: The weeks that were applied.
+    """
+    if weekly_data.empty or player_info.empty:
+        logging.error("Weekly data or player info is empty; keeping existing processed data.")
+        return []
+
+    weeks = sorted(int(week) for week in weekly_data['week'].unique())
+    already_applied = set(applied_weeks(season)) & set(weeks)
+    if already_applied:
+        raise ValueError(f"Weeks already applied to {season}: {sorted(already_applied)}")
+
+    with span('ingest.deltas', rows_in=len(weekly_data)) as stage:
+        deltas = weekly_deltas(weekly_data)
+        stage.rows_out = len(deltas)
+
+    filtered_player_info = filter_player_info(player_info)
+    new_player_info = merge_data(
+        pd.DataFrame({'player_id': deltas.index, 'season': season, 'season_type': season_type}), filtered_player_info
+    )
+
+    ensure_directory_exists(processed_path('QB', season))
+    for position in qualifications:
+        with span('ingest.apply', rows_in=len(deltas)) as stage:
+            # A season without processed data starts from empty totals
+            if find_table(processed_path(position, season)):
+                data = load_processed(position, [season])
+            else:
+                data = pd.DataFrame(columns=SEASON_COLUMNS + derived_columns(position))
+            totals = PositionTotals(position, data)
+            totals.add_players(new_player_info[
+                (new_player_info['position'] == position) & ~new_player_info['player_id'].map(totals.__contains__)
+            ])
+            changed = totals.apply(deltas[deltas.index.map(totals.__contains__)])
+            stage.rows_out = changed
+
+        with span('ingest.percentiles', rows_in=len(totals.data)) as stage:
+            changed_rows = totals.refresh_percentiles()
+            stage.rows_out = len(changed_rows)
+        if not len(changed_rows):
+            logging.info(f"No {season} {position} players changed in weeks {weeks}.")
+            continue
+
+        # Parquet partitions cannot be patched in place, but the store only rewrites the changed rows
+        output_path = save_processed(totals.data, position, season, file_format, compression)
+        if store is not None:
+            if season in store.seasons(position):
+                store.update(totals.data.iloc[changed_rows], position, season)
+            else:
+                store.save(totals.data, position, season)
+        logging.info(
+            f"Applied weeks {weeks} to {changed} {season} {position} players, changing {len(changed_rows)} rows; "
+            f"saved to {output_path}."
+        )
+
+    all_weeks = sorted(set(applied_weeks(season)) | set(weeks))
+    with open(applied_weeks_path(season), 'w') as f:
+        json.dump({'weeks': all_weeks}, f)
+    write_manifest([season])
+    return weeks
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Pipeline modules import each other by name, so put src/ on the path, and
+# benchmarks/ for the synthetic data generator
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import percentileofscore
+import metrics_utils
+from metrics_utils import (
+    rank_percentiles, rank_percentiles_by_column, calculate_percentiles_from_qualifying, bootstrap_percentile_bands,
+    calculate_percentile_bands_from_qualifying
+)
+
+def scipy_percentiles(distribution, scores):
+    return np.array([
+        np.nan if np.isnan(score) else percentileofscore(distribution, score, kind='rank') for score in scores
+    ])
+
+@pytest.mark.parametrize('seed', range(5))
+def test_rank_percentiles_matches_scipy(seed):
+    rng = np.random.default_rng(seed)
+    distribution = rng.normal(size=rng.integers(1, 200))
+    scores = np.concatenate([rng.normal(size=50), distribution[:10], [-np.inf, np.inf]])
+    np.testing.assert_allclose(rank_percentiles(distribution, scores), scipy_percentiles(distribution, scores))
+
+def test_rank_percentiles_ties():
+    # Integer stats (e.g., touchdowns) tie heavily, including scores outside the distribution
+    distribution = np.array([0, 0, 0, 1, 1, 2, 3, 3, 3, 3, 7], dtype=float)
+    scores = np.array([-1, 0, 0.5, 1, 2, 3, 4, 7, 8], dtype=float)
+    np.testing.assert_allclose(rank_percentiles(distribution, scores), scipy_percentiles(distribution, scores))
+
+def test_rank_percentiles_nan_scores():
+    distribution = np.array([1.0, 2.0, 3.0])
+    percentiles = rank_percentiles(distribution, np.array([np.nan, 2.0, np.nan]))
+    assert np.isnan(percentiles[[0, 2]]).all()
+    assert percentiles[1] == percentileofscore(distribution, 2.0, kind='rank')
+
+def test_rank_percentiles_by_column_matches_single_columns():
+    rng = np.random.default_rng(0)
+    distributions = rng.integers(0, 10, size=(40, 3)).astype(float)
+    scores = rng.integers(-2, 12, size=(25, 3)).astype(float)
+    scores[3, 1] = np.nan
+    expected = np.column_stack([scipy_percentiles(distributions[:, i], scores[:, i]) for i in range(3)])
+    np.testing.assert_allclose(rank_percentiles_by_column(distributions, scores), expected)
+
+def test_qualifying_percentiles_rank_against_qualifiers_only():
+    data = pd.DataFrame({
+        'attempts': [200, 150, 10, 300, 5],
+        'passing_yards': [3000.0, np.nan, 9000.0, 4000.0, 100.0]
+    })
+    percentiles = calculate_percentiles_from_qualifying(data, ['passing_yards'], 'attempts', 135)['passing_yards']
+
+    # NaN qualifiers are left out of the distribution, and non-qualifiers are ranked but never part of it
+    pool = [3000.0, 4000.0]
+    expected = [percentileofscore(pool, value, kind='rank') if not np.isnan(value) else np.nan for value in data['passing_yards']]
+    np.testing.assert_allclose(percentiles.to_numpy(), expected)
+    assert percentiles.index.equals(data.index)
+
+def test_qualifying_percentiles_without_qualifiers_raise():
+    data = pd.DataFrame({'attempts': [1, 2], 'passing_yards': [10.0, 20.0]})
+    with pytest.raises(ValueError):
+        calculate_percentiles_from_qualifying(data, ['passing_yards'], 'attempts', 135)
+
+def naive_bootstrap_bands(distributions, scores, n_resamples, confidence, seed):
+    """Resample each distribution one resample at a time, drawing the same indices as the batched version."""
+    rng = np.random.default_rng(seed)
+    low = np.empty(scores.shape)
+    high = np.empty(scores.shape)
+    for column, distribution in enumerate(distributions):
+        sorted_distribution = np.sort(distribution)
+        indices = rng.integers(0, len(distribution), size=(n_resamples, len(distribution)))
+        resampled = np.array([scipy_percentiles(sorted_distribution[draw], scores[:, column]) for draw in indices])
+        low[:, column], high[:, column] = np.quantile(resampled, [(1 - confidence) / 2, (1 + confidence) / 2], axis=0)
+    return low, high
+
+@pytest.mark.parametrize('confidence', [0.5, 0.9])
+@pytest.mark.parametrize('block', [metrics_utils.BOOTSTRAP_BLOCK, 200])
+def test_bootstrap_bands_match_naive_resampling(confidence, block, monkeypatch):
+    # A 200-value block draws only a few resamples of each pool at a time, so the blocked path runs
+    monkeypatch.setattr(metrics_utils, 'BOOTSTRAP_BLOCK', block)
+    rng = np.random.default_rng(0)
+    # Columns of different sizes, one with heavy ties as integer stats have
+    distributions = [rng.normal(size=30), rng.integers(0, 5, size=12).astype(float)]
+    scores = np.column_stack([
+        np.concatenate([rng.normal(size=8), distributions[0][:4]]),
+        rng.integers(-1, 7, size=12).astype(float)
+    ])
+    scores[2, 0] = np.nan
+
+    low, high = bootstrap_percentile_bands(distributions, scores, n_resamples=300, confidence=confidence, seed=7)
+    expected_low, expected_high = naive_bootstrap_bands(distributions, scores, 300, confidence, seed=7)
+    np.testing.assert_allclose(low, expected_low)
+    np.testing.assert_allclose(high, expected_high)
+    assert np.isnan(low[2, 0]) and np.isnan(high[2, 0])
+
+def test_bootstrap_bands_are_reproducible_for_a_seed():
+    rng = np.random.default_rng(1)
+    data = pd.DataFrame({'targets': rng.integers(0, 150, size=200), 'receiving_yards': rng.gamma(2.0, 300.0, size=200)})
+    low, high = calculate_percentile_bands_from_qualifying(data, ['receiving_yards'], 'targets', 45, n_resamples=500, seed=3)
+    again_low, again_high = calculate_percentile_bands_from_qualifying(data, ['receiving_yards'], 'targets', 45, n_resamples=500, seed=3)
+
+    pd.testing.assert_frame_equal(low, again_low)
+    pd.testing.assert_frame_equal(high, again_high)
+    assert low.index.equals(data.index) and (low <= high).all().all()
+
+def test_bootstrap_bands_reject_invalid_confidence():
+    with pytest.raises(ValueError):
+        bootstrap_percentile_bands([np.array([1.0, 2.0])], np.array([[1.0]]), confidence=1.0)
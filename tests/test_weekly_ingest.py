@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+import preprocess_data
+from metric_registry import qualifications, percentile_stats, compile_metrics
+from metrics_utils import rank_percentiles
+from player_store import PlayerStore
+from synthetic_data import generate_dataset
+from weekly_ingest import QualifyingDistribution, PositionTotals, ingest_weeks, weekly_deltas
+
+SEASON = 2024
+
+# Weekly stats drawn for every player in a test week
+WEEK_STATS = ['attempts', 'completions', 'passing_yards', 'passing_tds', 'interceptions', 'carries', 'rushing_yards',
+              'rushing_tds', 'targets', 'receptions', 'receiving_yards', 'receiving_tds', 'receiving_epa',
+              'rushing_epa', 'air_yards_share', 'fantasy_points_ppr']
+
+@pytest.fixture
+def processed(tmp_path, monkeypatch):
+    """Preprocess one synthetic season into a temporary directory."""
+    monkeypatch.setattr(preprocess_data, 'PROCESSED_DATA_DIR', f'{tmp_path}/processed/')
+    seasonal_data, player_info = generate_dataset(seed=0)
+    seasonal_data = seasonal_data[seasonal_data['season'] == SEASON]
+    preprocess_data.preprocess_and_save(seasonal_data, player_info)
+    return player_info
+
+def near_threshold_week(data, position, week, rng):
+    """
+    Draw a week of stats for a position's players, pushing players just under the
+    qualifying threshold over it and pulling players just over it back under.
+    """
+    stat = qualifications[position]['stat']
+    min_attempts = qualifications[position]['min_attempts']
+    rows = data.sample(frac=0.6, random_state=int(rng.integers(1 << 31)))
+    week_data = pd.DataFrame({'player_id': rows['player_id'].to_numpy(), 'season': SEASON, 'week': week})
+    for column in WEEK_STATS:
+        week_data[column] = rng.integers(0, 6, size=len(rows)).astype(float)
+
+    # Stat corrections can be negative, which is how a player drops below the threshold
+    gap = min_attempts - rows[stat].to_numpy(dtype=np.float64)
+    crossing_up = (gap > 0) & (gap <= 12)
+    crossing_down = (gap <= 0) & (gap > -12)
+    week_data.loc[crossing_up, stat] = gap[crossing_up] + rng.integers(0, 3, size=crossing_up.sum())
+    week_data.loc[crossing_down, stat] = gap[crossing_down] - rng.integers(1, 3, size=crossing_down.sum())
+    return week_data
+
+def assert_matches_full_recompute(data, position):
+    expected = compile_metrics(data, position)
+    columns = [f'{stat}_percentile' for stat in percentile_stats[position]]
+    pd.testing.assert_frame_equal(data[columns], expected[columns], check_exact=False, rtol=1e-12)
+
+@pytest.mark.parametrize('block_size', [2, 256])
+def test_distribution_matches_rank_percentiles(block_size):
+    rng = np.random.default_rng(0)
+    values = list(rng.integers(0, 20, size=50).astype(float))
+    distribution = QualifyingDistribution(np.array(values), block_size=block_size)
+    for _ in range(200):
+        if values and rng.random() < 0.5:
+            value = values.pop(int(rng.integers(len(values))))
+            distribution.remove(value)
+        else:
+            value = float(rng.integers(0, 20))
+            values.append(value)
+            distribution.add(value)
+    scores = np.arange(-1, 22, 0.5)
+    assert len(distribution) == len(values)
+    np.testing.assert_allclose(distribution.percentiles(scores), rank_percentiles(values, scores))
+
+def test_distribution_remove_missing_value_raises():
+    distribution = QualifyingDistribution(np.array([1.0, 2.0]))
+    with pytest.raises(ValueError):
+        distribution.remove(3.0)
+
+@pytest.mark.parametrize('position', list(qualifications))
+def test_position_totals_match_full_recompute_over_weeks(processed, position):
+    rng = np.random.default_rng(1)
+    totals = PositionTotals(position, preprocess_data.load_processed(position, [SEASON]))
+    stat = qualifications[position]['stat']
+    min_attempts = qualifications[position]['min_attempts']
+
+    crossed_up = crossed_down = 0
+    for week in range(1, 6):
+        qualified_before = totals.data.set_index('player_id')[stat] >= min_attempts
+        deltas = weekly_deltas(near_threshold_week(totals.data, position, week, rng))
+        totals.apply(deltas)
+        changed_rows = totals.refresh_percentiles()
+
+        qualified_after = totals.data.set_index('player_id')[stat] >= min_attempts
+        crossed_up += (qualified_after & ~qualified_before).sum()
+        crossed_down += (qualified_before & ~qualified_after).sum()
+        assert_matches_full_recompute(totals.data, position)
+        assert set(totals.data['player_id'].iloc[changed_rows]) >= set(deltas.index)
+    assert crossed_up and crossed_down
+
+def test_ingest_weeks_matches_full_recompute(processed):
+    rng = np.random.default_rng(2)
+    before = {position: preprocess_data.load_processed(position, [SEASON]) for position in qualifications}
+    week_data = pd.concat(
+        [near_threshold_week(data, position, 9, rng) for position, data in before.items()], ignore_index=True
+    )
+    # A player who has not played this season yet gets a new row
+    new_player = processed[(processed['position'] == 'WR') & ~processed['gsis_id'].isin(before['WR']['player_id'])].iloc[0]
+    new_week = pd.DataFrame({'player_id': [new_player['gsis_id']], 'season': SEASON, 'week': 9, 'targets': [50.0]})
+    week_data = pd.concat([week_data, new_week], ignore_index=True)
+
+    assert ingest_weeks(SEASON, week_data, processed) == [9]
+
+    deltas = weekly_deltas(week_data)
+    for position, data in before.items():
+        after = preprocess_data.load_processed(position, [SEASON])
+        assert_matches_full_recompute(after, position)
+
+        # Totals are the processed totals plus the week, for players who played and players who did not
+        stat = qualifications[position]['stat']
+        totals = data.set_index('player_id')[stat]
+        expected = totals + deltas[stat].reindex(totals.index, fill_value=0)
+        actual = after.set_index('player_id')[stat]
+        pd.testing.assert_series_equal(actual.loc[expected.index], expected, check_dtype=False)
+    assert new_player['gsis_id'] in set(preprocess_data.load_processed('WR', [SEASON])['player_id'])
+
+    with pytest.raises(ValueError):
+        ingest_weeks(SEASON, week_data, processed)
+
+def test_ingest_weeks_updates_store_rows(processed, tmp_path):
+    rng = np.random.default_rng(3)
+    with PlayerStore(str(tmp_path / 'players.db')) as store:
+        preprocess_data.populate_store(store)
+        week_data = pd.concat([
+            near_threshold_week(preprocess_data.load_processed(position, [SEASON]), position, 10, rng)
+            for position in qualifications
+        ], ignore_index=True)
+        ingest_weeks(SEASON, week_data, processed, store=store)
+
+        for position in qualifications:
+            files = preprocess_data.load_processed(position, [SEASON])
+            stored = store.load(position, [SEASON])
+            pd.testing.assert_frame_equal(stored, files, check_dtype=False, check_categorical=False)